@@ -0,0 +1,39 @@
+"""Add pets.profile_media_id (denormalized profile picture pointer)
+
+Revision ID: g1b4c_pet_profile_media
+Revises: f0a3b_activity_state_logs
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "g1b4c_pet_profile_media"
+down_revision: Union[str, None] = "f0a3b_activity_state_logs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("pets", sa.Column("profile_media_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "pets_profile_media_id_fkey", "pets", "media_files", ["profile_media_id"], ["id"], ondelete="SET NULL"
+    )
+
+    # Backfill: the profile picture used to be the pet's latest uploaded image
+    op.execute(
+        sa.text(
+            "UPDATE pets SET profile_media_id = latest.media_id "
+            "FROM (SELECT pet_id, max(id) AS media_id FROM media_files "
+            "WHERE pet_id IS NOT NULL AND file_type = 'image' GROUP BY pet_id) AS latest "
+            "WHERE pets.id = latest.pet_id"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("pets_profile_media_id_fkey", "pets", type_="foreignkey")
+    op.drop_column("pets", "profile_media_id")
@@ -0,0 +1,39 @@
+"""Add composite (pet_id, time DESC) indexes for log tables and media_files
+
+Revision ID: h2c5d_log_time_indexes
+Revises: g1b4c_pet_profile_media
+Create Date: 2026-10-17
+
+Built with CREATE INDEX CONCURRENTLY so large tables stay writable; that cannot run inside a
+transaction, hence the autocommit block.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "h2c5d_log_time_indexes"
+down_revision: Union[str, None] = "g1b4c_pet_profile_media"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_sleep_logs_pet_id_started_at", "sleep_logs", ["pet_id", sa.text("started_at DESC")]),
+    ("ix_eating_logs_pet_id_occurred_at", "eating_logs", ["pet_id", sa.text("occurred_at DESC")]),
+    ("ix_activity_state_logs_pet_id_start_time", "activity_state_logs", ["pet_id", sa.text("start_time DESC")]),
+    ("ix_media_files_pet_id_file_type_id", "media_files", ["pet_id", "file_type", sa.text("id DESC")]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,62 @@
+"""Add pet_daily_stats rollup table (per-pet, per-day sleep/meals/active totals)
+
+Revision ID: i3d6e_pet_daily_stats
+Revises: h2c5d_log_time_indexes
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "i3d6e_pet_daily_stats"
+down_revision: Union[str, None] = "h2c5d_log_time_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pet_daily_stats",
+        sa.Column("pet_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("sleep_minutes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("meals_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("active_minutes", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["pet_id"], ["pets.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("pet_id", "day"),
+    )
+
+    # Backfill from raw logs; same rules as CRUDPetDailyStats.rebuild
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO pet_daily_stats (pet_id, day, sleep_minutes, meals_count, active_minutes)
+            SELECT pet_id, day, sum(sleep_minutes), sum(meals_count), sum(active_minutes)
+            FROM (
+                SELECT pet_id, started_at::date AS day, coalesce(duration_minutes, 0) AS sleep_minutes,
+                       0 AS meals_count, 0 AS active_minutes
+                FROM sleep_logs
+                UNION ALL
+                SELECT pet_id, occurred_at::date, 0, 1, 0 FROM eating_logs
+                UNION ALL
+                SELECT pet_id, d::date, 0, 0,
+                       floor(extract(epoch FROM least(end_time, d + interval '1 day') - greatest(start_time, d)) / 60)
+                FROM (
+                    SELECT pet_id, active, start_time,
+                           lead(start_time) OVER (PARTITION BY pet_id ORDER BY start_time, id) AS end_time
+                    FROM activity_state_logs
+                ) AS intervals
+                CROSS JOIN LATERAL generate_series(date_trunc('day', start_time), end_time, interval '1 day') AS d
+                WHERE active AND end_time IS NOT NULL
+            ) AS contributions
+            GROUP BY pet_id, day
+            """
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("pet_daily_stats")
@@ -0,0 +1,74 @@
+"""Add (sort key, id) indexes for keyset pagination; replace the log time indexes
+
+Revision ID: j4e7f_keyset_pagination_indexes
+Revises: i3d6e_pet_daily_stats
+Create Date: 2026-10-17
+
+The log lists now order by (time, id) so cursors are stable; the (pet_id, time DESC) indexes from
+h2c5d are superseded by (pet_id, time DESC, id DESC). Built with CREATE INDEX CONCURRENTLY, hence
+the autocommit block.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "j4e7f_keyset_pagination_indexes"
+down_revision: Union[str, None] = "i3d6e_pet_daily_stats"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+INDEXES = [
+    ("ix_sleep_logs_pet_id_started_at_id", "sleep_logs", ["pet_id", sa.text("started_at DESC"), sa.text("id DESC")]),
+    (
+        "ix_eating_logs_pet_id_occurred_at_id",
+        "eating_logs",
+        ["pet_id", sa.text("occurred_at DESC"), sa.text("id DESC")],
+    ),
+    (
+        "ix_activity_state_logs_pet_id_start_time_id",
+        "activity_state_logs",
+        ["pet_id", sa.text("start_time DESC"), sa.text("id DESC")],
+    ),
+    ("ix_community_posts_created_at_id", "community_posts", [sa.text("created_at DESC"), sa.text("id DESC")]),
+    ("ix_vet_visits_pet_id_visit_date_id", "vet_visits", ["pet_id", sa.text("visit_date DESC"), sa.text("id DESC")]),
+]
+
+# Medical records are the only created_at-ordered media_files list; partial so image lookups
+# keep using ix_media_files_pet_id_file_type_id
+DOCUMENTS_INDEX = "ix_media_files_pet_id_documents_created_at_id"
+
+# Superseded by the (..., id DESC) variants above
+SUPERSEDED = [
+    ("ix_sleep_logs_pet_id_started_at", "sleep_logs", ["pet_id", sa.text("started_at DESC")]),
+    ("ix_eating_logs_pet_id_occurred_at", "eating_logs", ["pet_id", sa.text("occurred_at DESC")]),
+    ("ix_activity_state_logs_pet_id_start_time", "activity_state_logs", ["pet_id", sa.text("start_time DESC")]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index(
+            DOCUMENTS_INDEX,
+            "media_files",
+            ["pet_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_where=sa.text("file_type = 'document'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table, _ in SUPERSEDED:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in SUPERSEDED:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index(DOCUMENTS_INDEX, table_name="media_files", postgresql_concurrently=True, if_exists=True)
+        for name, table, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
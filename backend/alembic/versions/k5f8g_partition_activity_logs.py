@@ -0,0 +1,122 @@
+"""Partition activity_state_logs by month of start_time; add activity_hourly_stats
+
+Revision ID: k5f8g_partition_activity_logs
+Revises: j4e7f_keyset_pagination_indexes
+Create Date: 2026-10-17
+
+The table is recreated as a RANGE-partitioned table: one partition per month from the oldest
+transition to PARTITIONS_AHEAD months after the current one, plus a default partition (see
+app/db/partitions.py). The primary key becomes (id, start_time), as PostgreSQL requires the
+partition key in it; ids keep their sequence. The standalone id and pet_id indexes are dropped,
+(pet_id, start_time DESC, id DESC) serves both pet lookups and the pets foreign key.
+activity_hourly_stats receives the hourly rollup of transitions that expire.
+"""
+from datetime import date, datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "k5f8g_partition_activity_logs"
+down_revision: Union[str, None] = "j4e7f_keyset_pagination_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 3
+COLUMNS = "id, pet_id, active, start_time, created_at, updated_at"
+
+
+def _add_months(month: date, n: int) -> date:
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_table(name: str, partitioned: bool) -> None:
+    op.create_table(
+        name,
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('activity_state_logs_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.Column("pet_id", sa.Integer(), nullable=False),
+        sa.Column("active", sa.Boolean(), nullable=False),
+        sa.Column("start_time", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["pet_id"], ["pets.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id", "start_time") if partitioned else sa.PrimaryKeyConstraint("id"),
+        **({"postgresql_partition_by": "RANGE (start_time)"} if partitioned else {}),
+    )
+
+
+def _swap_in(new: str) -> None:
+    """Copy rows from activity_state_logs into new, drop the old table and rename new to it."""
+    op.execute("ALTER SEQUENCE activity_state_logs_id_seq OWNED BY NONE")
+    op.execute(f"INSERT INTO {new} ({COLUMNS}) SELECT {COLUMNS} FROM activity_state_logs")
+    op.drop_table("activity_state_logs")
+    op.rename_table(new, "activity_state_logs")
+    op.execute("ALTER SEQUENCE activity_state_logs_id_seq OWNED BY activity_state_logs.id")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text("SELECT min(start_time) FROM activity_state_logs")).scalar()
+    today = datetime.utcnow().date()
+    first = min(oldest.date(), today) if oldest else today
+    month, last = date(first.year, first.month, 1), _add_months(date(today.year, today.month, 1), PARTITIONS_AHEAD)
+
+    _create_table("activity_state_logs_partitioned", partitioned=True)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE activity_state_logs_p{month.year:04d}_{month.month:02d} "
+            f"PARTITION OF activity_state_logs_partitioned FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')"
+        )
+        month = _add_months(month, 1)
+    op.execute("CREATE TABLE activity_state_logs_default PARTITION OF activity_state_logs_partitioned DEFAULT")
+    _swap_in("activity_state_logs_partitioned")
+    op.execute(
+        "ALTER TABLE activity_state_logs RENAME CONSTRAINT activity_state_logs_partitioned_pkey "
+        "TO activity_state_logs_pkey"
+    )
+    op.execute(
+        "ALTER TABLE activity_state_logs RENAME CONSTRAINT activity_state_logs_partitioned_pet_id_fkey "
+        "TO activity_state_logs_pet_id_fkey"
+    )
+    op.create_index(
+        "ix_activity_state_logs_pet_id_start_time_id",
+        "activity_state_logs",
+        ["pet_id", sa.text("start_time DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+
+    op.create_table(
+        "activity_hourly_stats",
+        sa.Column("pet_id", sa.Integer(), nullable=False),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("active_seconds", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("transitions", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["pet_id"], ["pets.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("pet_id", "hour"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("activity_hourly_stats")
+    _create_table("activity_state_logs_plain", partitioned=False)
+    _swap_in("activity_state_logs_plain")
+    op.execute("ALTER TABLE activity_state_logs RENAME CONSTRAINT activity_state_logs_plain_pkey TO activity_state_logs_pkey")
+    op.execute(
+        "ALTER TABLE activity_state_logs RENAME CONSTRAINT activity_state_logs_plain_pet_id_fkey "
+        "TO activity_state_logs_pet_id_fkey"
+    )
+    op.create_index("ix_activity_state_logs_id", "activity_state_logs", ["id"], unique=False)
+    op.create_index("ix_activity_state_logs_pet_id", "activity_state_logs", ["pet_id"], unique=False)
+    op.create_index(
+        "ix_activity_state_logs_pet_id_start_time_id",
+        "activity_state_logs",
+        ["pet_id", sa.text("start_time DESC"), sa.text("id DESC")],
+        unique=False,
+    )
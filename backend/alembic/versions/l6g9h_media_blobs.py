@@ -0,0 +1,50 @@
+"""Add media_blobs (content-addressed, reference-counted files) and media_files.content_sha256
+
+Revision ID: l6g9h_media_blobs
+Revises: k5f8g_partition_activity_logs
+Create Date: 2026-10-17
+
+Media files with the same content now share one stored blob, so media_files.storage_key is no
+longer unique. Existing files keep their own keys (content_sha256 NULL). Downgrading fails while
+two media files share a key.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "l6g9h_media_blobs"
+down_revision: Union[str, None] = "k5f8g_partition_activity_logs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_blobs",
+        sa.Column("sha256", sa.String(length=64), nullable=False),
+        sa.Column("storage_key", sa.String(length=512), nullable=False),
+        sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+        sa.Column("ref_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("sha256"),
+        sa.UniqueConstraint("storage_key"),
+    )
+    op.add_column("media_files", sa.Column("content_sha256", sa.String(length=64), nullable=True))
+    op.create_foreign_key(
+        "media_files_content_sha256_fkey", "media_files", "media_blobs", ["content_sha256"], ["sha256"]
+    )
+    op.create_index("ix_media_files_content_sha256", "media_files", ["content_sha256"])
+    op.drop_constraint("media_files_storage_key_key", "media_files", type_="unique")
+    op.create_index("ix_media_files_storage_key", "media_files", ["storage_key"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_media_files_storage_key", table_name="media_files")
+    op.create_unique_constraint("media_files_storage_key_key", "media_files", ["storage_key"])
+    op.drop_index("ix_media_files_content_sha256", table_name="media_files")
+    op.drop_constraint("media_files_content_sha256_fkey", "media_files", type_="foreignkey")
+    op.drop_column("media_files", "content_sha256")
+    op.drop_table("media_blobs")
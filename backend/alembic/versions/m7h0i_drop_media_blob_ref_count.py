@@ -0,0 +1,31 @@
+"""Drop media_blobs.ref_count
+
+Revision ID: m7h0i_drop_media_blob_ref_count
+Revises: l6g9h_media_blobs
+Create Date: 2026-10-17
+
+Cascaded media_files deletes never decremented the count, so it drifted above zero and those
+blobs were never swept. A blob is now unreferenced when no media_files row points at it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "m7h0i_drop_media_blob_ref_count"
+down_revision: Union[str, None] = "l6g9h_media_blobs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_column("media_blobs", "ref_count")
+
+
+def downgrade() -> None:
+    op.add_column("media_blobs", sa.Column("ref_count", sa.Integer(), server_default="0", nullable=False))
+    op.execute(
+        "UPDATE media_blobs b SET ref_count = "
+        "(SELECT count(*) FROM media_files f WHERE f.content_sha256 = b.sha256)"
+    )
@@ -0,0 +1,39 @@
+"""Drop the log tables' redundant id and pet_id indexes
+
+Revision ID: n8i1j_drop_redundant_log_indexes
+Revises: m7h0i_drop_media_blob_ref_count
+Create Date: 2026-10-17
+
+ix_*_id duplicates the primary key and ix_*_pet_id is a prefix of the (pet_id, time DESC, id DESC)
+index from j4e7f, which also serves pet_id lookups (FK cascades). Every bulk-ingested row paid for
+both. Dropped (and rebuilt on downgrade) CONCURRENTLY, hence the autocommit block.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "n8i1j_drop_redundant_log_indexes"
+down_revision: Union[str, None] = "m7h0i_drop_media_blob_ref_count"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+REDUNDANT = [
+    ("ix_sleep_logs_id", "sleep_logs", ["id"]),
+    ("ix_sleep_logs_pet_id", "sleep_logs", ["pet_id"]),
+    ("ix_eating_logs_id", "eating_logs", ["id"]),
+    ("ix_eating_logs_pet_id", "eating_logs", ["pet_id"]),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in REDUNDANT:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
@@ -0,0 +1,41 @@
+"""Make media_files.storage_key unique among files stored under their own key
+
+Revision ID: o9j2k_unique_direct_upload_keys
+Revises: n8i1j_drop_redundant_log_indexes
+Create Date: 2026-10-17
+
+Two concurrent completions of the same direct upload could both register it. Rows that share a
+content-addressed blob share its key, so the index is partial (content_sha256 IS NULL). Built with
+CREATE INDEX CONCURRENTLY, hence the autocommit block; it fails if duplicates were registered
+already, which must then be merged first.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "o9j2k_unique_direct_upload_keys"
+down_revision: Union[str, None] = "n8i1j_drop_redundant_log_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_media_files_direct_storage_key"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX,
+            "media_files",
+            ["storage_key"],
+            unique=True,
+            postgresql_where=sa.text("content_sha256 IS NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(INDEX, table_name="media_files", postgresql_concurrently=True, if_exists=True)
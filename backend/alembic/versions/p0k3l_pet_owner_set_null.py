@@ -0,0 +1,38 @@
+"""Keep a deleted user's pets: pets.owner_id ON DELETE SET NULL
+
+Revision ID: p0k3l_pet_owner_set_null
+Revises: o9j2k_unique_direct_upload_keys
+Create Date: 2026-10-17
+
+With ON DELETE CASCADE, deleting a user deleted every pet they owned, including pets shared with
+other users through user_pets, with all their logs and media. The pets now lose their owner
+instead, as they did when the ORM nulled owner_id itself. The new constraint is added NOT VALID
+and validated separately, so pets is not locked against writes while existing rows are checked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "p0k3l_pet_owner_set_null"
+down_revision: Union[str, None] = "o9j2k_unique_direct_upload_keys"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINT = "pets_owner_id_fkey"
+
+
+def _replace(ondelete: str) -> None:
+    op.drop_constraint(CONSTRAINT, "pets", type_="foreignkey")
+    op.create_foreign_key(
+        CONSTRAINT, "pets", "users", ["owner_id"], ["id"], ondelete=ondelete, postgresql_not_valid=True
+    )
+    op.execute(f"ALTER TABLE pets VALIDATE CONSTRAINT {CONSTRAINT}")
+
+
+def upgrade() -> None:
+    _replace("SET NULL")
+
+
+def downgrade() -> None:
+    _replace("CASCADE")
@@ -2,8 +2,8 @@
 
 from fastapi import APIRouter, HTTPException, status
 
-from app.core.dependencies import CurrentUser, DbSession
-from app.core.security import create_access_token, verify_password
+from app.core.dependencies import DbSession, ReadCurrentUser
+from app.core.security import create_access_token
 from app.crud.user import user_crud
 from app.schemas.auth import LoginRequest, TokenResponse
 from app.schemas.user import UserResponse
@@ -18,7 +18,10 @@ async def login(db: DbSession, body: LoginRequest) -> TokenResponse:
     Use the token in the Authorization header: `Bearer <access_token>`.
     """
     user = await user_crud.get_by_email(db, email=body.email)
-    if not user or not verify_password(body.password, user.hashed_password):
+    # End the read transaction so the pooled connection is not held during the ~250 ms bcrypt
+    # check; a login burst would otherwise exhaust the pool
+    await db.commit()
+    if not user or not await user_crud.check_password(db, user=user, password=body.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -29,6 +32,6 @@ async def login(db: DbSession, body: LoginRequest) -> TokenResponse:
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: CurrentUser) -> UserResponse:
+async def get_me(current_user: ReadCurrentUser) -> UserResponse:
     """Return the currently authenticated user. Requires Bearer token."""
     return current_user
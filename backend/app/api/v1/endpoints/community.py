@@ -1,55 +1,60 @@
 """Community feed endpoints: list, create, get, update, delete posts."""
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 
-from app.core.dependencies import CurrentUser, DbSession
+from app.core.dependencies import CurrentPrincipal, DbSession, ReadDbSession
+from app.core.pagination import CURSOR_QUERY, decode_cursor, paginated
+from app.core.serialization import dumper, json_response, row
 from app.crud.community_post import community_post_crud
 from app.models.community_post import CommunityPost
 from app.schemas.community import CommunityPostCreate, CommunityPostResponse, CommunityPostUpdate
+from app.schemas.pagination import CursorPage
 
 router = APIRouter(prefix="/community", tags=["community"])
 
+# Feed rows already carry user_name and pet_name (see community_post_crud.get_multi)
+_post_rows = dumper(CommunityPostResponse)
 
-def _post_to_response(post: CommunityPost) -> CommunityPostResponse:
+
+def _post_to_response(post: CommunityPost) -> dict:
     """Build response with user_name and pet_name from relationships."""
-    return CommunityPostResponse(
-        id=post.id,
-        user_id=post.user_id,
-        content=post.content,
-        title=post.title,
-        pet_id=post.pet_id,
+    return row(
+        CommunityPostResponse,
+        post,
         user_name=post.user.name if post.user else None,
         pet_name=post.pet.name if post.pet else None,
-        created_at=post.created_at,
-        updated_at=post.updated_at,
     )
 
 
-@router.get("/posts", response_model=list[CommunityPostResponse])
+@router.get("/posts", response_model=list[CommunityPostResponse] | CursorPage[CommunityPostResponse])
 async def list_posts(
-    db: DbSession,
+    db: ReadDbSession,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-) -> list[CommunityPostResponse]:
+    cursor: str | None = CURSOR_QUERY,
+) -> Response:
     """List community posts newest first. Optional auth."""
-    posts = await community_post_crud.get_multi(db, skip=skip, limit=limit)
-    return [_post_to_response(p) for p in posts]
+    posts = await community_post_crud.get_multi(
+        db, after=decode_cursor(cursor), skip=skip if cursor is None else 0, limit=limit
+    )
+    return json_response(paginated(posts, cursor=cursor, limit=limit, key_attr="created_at", dump=_post_rows))
 
 
 @router.post("/posts", response_model=CommunityPostResponse, status_code=201)
-async def create_post(db: DbSession, current_user: CurrentUser, body: CommunityPostCreate) -> CommunityPostResponse:
+async def create_post(db: DbSession, principal: CurrentPrincipal, body: CommunityPostCreate) -> Response:
     """Create a post. Requires Bearer token."""
-    post = await community_post_crud.create(db, obj_in=body, user_id=current_user.id)
-    return _post_to_response(post)
+    post = await community_post_crud.create(db, obj_in=body, user_id=principal.user_id)
+    return json_response(_post_to_response(post), status_code=201)
 
 
 @router.get("/posts/{post_id}", response_model=CommunityPostResponse)
-async def get_post(db: DbSession, post_id: int) -> CommunityPostResponse:
+async def get_post(db: ReadDbSession, post_id: int) -> Response:
     """Get a single post by id."""
     post = await community_post_crud.get(db, id=post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    return _post_to_response(post)
+    return json_response(_post_to_response(post))
 
 
 @router.patch("/posts/{post_id}", response_model=CommunityPostResponse)
@@ -57,24 +62,24 @@ async def update_post(
     db: DbSession,
     post_id: int,
     body: CommunityPostUpdate,
-    current_user: CurrentUser,
-) -> CommunityPostResponse:
+    principal: CurrentPrincipal,
+) -> Response:
     """Update own post. Requires Bearer token."""
     post = await community_post_crud.get(db, id=post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    if post.user_id != current_user.id:
+    if post.user_id != principal.user_id:
         raise HTTPException(status_code=403, detail="Not allowed to update this post")
     post = await community_post_crud.update(db, db_obj=post, obj_in=body)
-    return _post_to_response(post)
+    return json_response(_post_to_response(post))
 
 
 @router.delete("/posts/{post_id}", status_code=204)
-async def delete_post(db: DbSession, post_id: int, current_user: CurrentUser) -> None:
+async def delete_post(db: DbSession, post_id: int, principal: CurrentPrincipal) -> None:
     """Delete own post. Requires Bearer token."""
     post = await community_post_crud.get(db, id=post_id)
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
-    if post.user_id != current_user.id:
+    if post.user_id != principal.user_id:
         raise HTTPException(status_code=403, detail="Not allowed to delete this post")
     await community_post_crud.delete(db, id=post_id)
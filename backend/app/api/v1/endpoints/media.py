@@ -1,18 +1,28 @@
 """Media upload - images, audio, video. Files saved in file storage only; Postgres stores metadata (storage_key) only."""
 
 import asyncio
+import shutil
 import tempfile
+from datetime import timedelta
 from pathlib import Path
 
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import FileResponse, Response
 from moviepy import VideoFileClip
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
 
 from app.config import get_settings
-from app.core.dependencies import DbSession
+from app.core.dependencies import DbSession, ReadDbSession
+from app.core.security import create_scoped_token, decode_scoped_token
+from app.core.uploads import multipart_file_body, receive_upload, verify_stored
+from app.crud.pet import pet_crud
 from app.models.media_file import MediaFile
+from app.schemas.media import DirectUploadComplete, DirectUploadCreate, DirectUploadResponse, DownloadUrlResponse
 from app.services.storage import get_storage
+from app.services.storage.base import run_io
 
 router = APIRouter(prefix="/media", tags=["media"])
 
@@ -23,91 +33,220 @@ ALLOWED = {
     "document": {"application/pdf"},
 }
 MAX_SIZE = 100 * 1024 * 1024  # 100 MB
+# Direct uploads: larger files are sent as a multipart upload in parts of this size
+DIRECT_PART_SIZE = 16 * 1024 * 1024
+UPLOAD_TOKEN_AUDIENCE = "media-upload"
+# Completion can come long after the last presigned URL was used, so the token outlives the URLs
+UPLOAD_TOKEN_TTL = timedelta(days=1)
 
 
-@router.post("/upload")
-async def upload_media(
-    db: DbSession,
-    file: UploadFile = File(...),
-    file_type: str = Query("image", description="image | audio | video | document (PDF)"),
-    owner_id: int = Query(1, description="Owner user id (from auth when available)"),
-    pet_id: int | None = Query(None, description="Optional pet id to associate"),
-) -> dict:
-    """
-    Upload a file. Content is saved in file storage (local or DigitalOcean Spaces); only metadata is stored in Postgres.
-    Returns media_file id, storage_key, and optional url.
-    """
+def _check_type(file_type: str, content_type: str) -> None:
     if file_type not in ALLOWED:
         raise HTTPException(status_code=400, detail="file_type must be image, audio, or video")
-    content_type = file.content_type or ""
     if content_type not in ALLOWED[file_type]:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid type for {file_type}. Allowed: {', '.join(ALLOWED[file_type])}",
         )
-    body = await file.read()
-    if len(body) > MAX_SIZE:
-        raise HTTPException(status_code=400, detail="File too large")
 
-    # Save file to storage only (never to Postgres)
-    storage = get_storage()
-    key = storage.key_for(file_type, owner_id, file.filename or "file")
-    storage.save(key, body, content_type=content_type)
-    url = storage.get_url(key)
 
-    # Store metadata in Postgres (storage_key reference only)
+async def _register(
+    db: AsyncSession,
+    *,
+    key: str,
+    size: int,
+    file_type: str,
+    content_type: str,
+    owner_id: int,
+    pet_id: int | None,
+    sha256: str | None = None,
+) -> dict:
+    """
+    Store metadata for a file now in storage (storage_key reference only) and describe it. A file
+    under its own key (no sha256) is registered once: if it already is, that media file is described.
+    """
     settings = get_settings()
-    media = MediaFile(
+    stmt = pg_insert(MediaFile).values(
         owner_id=owner_id,
         pet_id=pet_id,
         file_type=file_type,
         mime_type=content_type,
         storage_key=key,
         storage_backend=settings.storage_backend,
-        file_size_bytes=len(body),
+        file_size_bytes=size,
+        content_sha256=sha256,
     )
-    db.add(media)
-    await db.flush()
-    await db.refresh(media)
+    if sha256 is None:
+        stmt = stmt.on_conflict_do_nothing(
+            index_elements=[MediaFile.storage_key], index_where=MediaFile.content_sha256.is_(None)
+        )
+    media = (await db.execute(stmt.returning(MediaFile))).scalar_one_or_none()
+    if media is None:
+        existing = select(MediaFile).where(MediaFile.storage_key == key, MediaFile.content_sha256.is_(None))
+        return _describe((await db.execute(existing)).scalar_one())
+    if pet_id is not None and file_type == "image":
+        # Latest image uploaded for a pet becomes its profile picture
+        await pet_crud.set_profile_media(db, pet_id=pet_id, media_id=media.id)
+    return _describe(media)
+
 
+def _describe(media: MediaFile) -> dict:
     return {
         "id": media.id,
-        "storage_key": key,
-        "url": url,
-        "size": len(body),
-        "content_type": content_type,
-        "storage_backend": settings.storage_backend,
+        "storage_key": media.storage_key,
+        "url": get_storage().get_url(media.storage_key),
+        "size": media.file_size_bytes,
+        "content_type": media.mime_type,
+        "storage_backend": media.storage_backend,
     }
 
 
-def _extract_last_n_seconds_wav(video_bytes: bytes, seconds: float) -> bytes:
+@router.post("/upload", openapi_extra=multipart_file_body())
+async def upload_media(
+    db: DbSession,
+    request: Request,
+    file_type: str = Query("image", description="image | audio | video | document (PDF)"),
+    owner_id: int = Query(1, description="Owner user id (from auth when available)"),
+    pet_id: int | None = Query(None, description="Optional pet id to associate"),
+) -> dict:
+    """
+    Upload a file. Content is saved in file storage (local or DigitalOcean Spaces); only metadata is stored in Postgres.
+    Returns media_file id, storage_key, and optional url. The file is streamed to storage as it arrives.
     """
-    Extract the last n seconds of audio from video bytes as WAV (blocking).
+    if file_type not in ALLOWED:
+        raise HTTPException(status_code=400, detail="file_type must be image, audio, or video")
+    file = await receive_upload(request)
+    _check_type(file_type, file.content_type)
+
+    # Save file to storage only (never to Postgres); identical content shares one stored blob
+    stored = await file.save(db, get_storage(), max_size=MAX_SIZE, too_large="File too large")
+    return await _register(
+        db,
+        key=stored.key,
+        size=stored.size,
+        file_type=file_type,
+        content_type=file.content_type,
+        owner_id=owner_id,
+        pet_id=pet_id,
+        sha256=stored.sha256,
+    )
+
+
+@router.post("/uploads", response_model=DirectUploadResponse, status_code=201)
+async def create_direct_upload(body: DirectUploadCreate) -> DirectUploadResponse:
+    """
+    Start an upload that goes straight to storage (DigitalOcean Spaces) with presigned URLs, so the
+    file never passes through the API. Files up to DIRECT_PART_SIZE get one PUT URL, larger ones a
+    multipart upload with a URL per part. Finish with POST /media/uploads/complete, which registers
+    the media file. Unfinished multipart uploads are left to the bucket's lifecycle rules.
+    """
+    _check_type(body.file_type, body.content_type)
+    if body.size > MAX_SIZE:
+        raise HTTPException(status_code=413, detail="File too large")
+    storage = get_storage()
+    expires_in = get_settings().storage_presign_expire_seconds
+    key = storage.key_for(body.file_type, body.owner_id, body.filename)
+    claims = {
+        "sub": str(body.owner_id),
+        "key": key,
+        "file_type": body.file_type,
+        "content_type": body.content_type,
+        "pet_id": body.pet_id,
+    }
+    url: str | None = None
+    part_urls: list[str] = []
+    if body.size <= DIRECT_PART_SIZE:
+        url = await run_io(storage.presign_upload, key, body.content_type, expires_in)
+    else:
+        part_count = -(-body.size // DIRECT_PART_SIZE)
+        multipart = await run_io(storage.presign_multipart_upload, key, body.content_type, part_count, expires_in)
+        if multipart is not None:
+            claims["upload_id"], part_urls = multipart
+    if url is None and not part_urls:
+        raise HTTPException(status_code=501, detail="Direct uploads need DigitalOcean Spaces storage")
+    return DirectUploadResponse(
+        token=create_scoped_token(UPLOAD_TOKEN_AUDIENCE, claims, UPLOAD_TOKEN_TTL),
+        storage_key=key,
+        expires_in=expires_in,
+        headers={"Content-Type": body.content_type} if url else {},
+        url=url,
+        part_size=DIRECT_PART_SIZE if part_urls else None,
+        part_urls=part_urls,
+    )
+
+
+@router.post("/uploads/complete")
+async def complete_direct_upload(db: DbSession, body: DirectUploadComplete) -> dict:
+    """
+    Completion callback for a direct upload: assembles a multipart upload from its parts' ETags,
+    checks the stored file (size limit, content type from its first bytes; a file that fails is
+    deleted) and registers it like POST /media/upload. Idempotent: completing again returns the
+    same media file, also when completions race.
+    """
+    upload = decode_scoped_token(body.token, UPLOAD_TOKEN_AUDIENCE)
+    if upload is None:
+        raise HTTPException(status_code=400, detail="Invalid or expired upload token")
+    key = upload["key"]
+    existing = (await db.execute(select(MediaFile).where(MediaFile.storage_key == key))).scalar_one_or_none()
+    if existing is not None:
+        return _describe(existing)
+    storage = get_storage()
+    try:
+        if "upload_id" in upload:
+            if not body.etags:
+                raise HTTPException(status_code=400, detail="etags are required to complete a multipart upload")
+            if not await run_io(storage.complete_multipart_upload, key, upload["upload_id"], body.etags):
+                raise HTTPException(status_code=501, detail="Direct uploads need DigitalOcean Spaces storage")
+        size = await verify_stored(
+            storage, key, upload["content_type"], max_size=MAX_SIZE, too_large="File too large"
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=409, detail="Nothing has been uploaded for this token yet") from None
+    return await _register(
+        db,
+        key=key,
+        size=size,
+        file_type=upload["file_type"],
+        content_type=upload["content_type"],
+        owner_id=int(upload["sub"]),
+        pet_id=upload["pet_id"],
+    )
+
+
+@router.get("/{media_id}/download-url", response_model=DownloadUrlResponse)
+async def get_download_url(media_id: int, db: ReadDbSession) -> DownloadUrlResponse:
+    """Presigned URL to GET the file straight from storage (DigitalOcean Spaces), valid for expires_in seconds."""
+    media = await db.get(MediaFile, media_id)
+    if not media:
+        raise HTTPException(status_code=404, detail="Media file not found")
+    expires_in = get_settings().storage_presign_expire_seconds
+    url = await run_io(get_storage().presign_download, media.storage_key, expires_in)
+    if url is None:
+        raise HTTPException(status_code=501, detail="Download URLs need DigitalOcean Spaces storage")
+    return DownloadUrlResponse(url=url, expires_in=expires_in)
+
+
+def _extract_last_n_seconds_wav(video_path: Path, seconds: float, wav_path: Path) -> None:
+    """
+    Write the last n seconds of the video's audio to wav_path as WAV (blocking).
     Uses MoviePy (imageio-ffmpeg); no system ffmpeg required.
     """
-    suffix = ".mp4"
-    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as f:
-        video_path = f.name
-        f.write(video_bytes)
-        f.flush()
-    wav_path = video_path + ".wav"
     clip = None
     sub = None
     try:
-        clip = VideoFileClip(video_path)
+        clip = VideoFileClip(str(video_path))
         if clip.audio is None:
             raise RuntimeError("Video has no audio track")
         duration = clip.duration
         start = max(0.0, duration - seconds)
         sub = clip.subclip(start, duration)
         sub.audio.write_audiofile(
-            wav_path,
+            str(wav_path),
             fps=44100,
             nbytes=2,
             codec="pcm_s16le",
             logger=None,
         )
-        return Path(wav_path).read_bytes()
     finally:
         if sub is not None:
             try:
@@ -119,19 +258,19 @@ def _extract_last_n_seconds_wav(video_bytes: bytes, seconds: float) -> bytes:
                 clip.close()
             except Exception:
                 pass
-        Path(video_path).unlink(missing_ok=True)
-        Path(wav_path).unlink(missing_ok=True)
 
 
 @router.get("/{media_id}/audio-tail", response_class=Response)
 async def get_video_audio_tail(
     media_id: int,
-    db: DbSession,
+    db: ReadDbSession,
     seconds: float = Query(5.0, ge=0.1, le=300.0, description="Last N seconds of audio to extract (0.1–300)"),
 ) -> Response:
     """
     Get the last N seconds of audio from a stored video as a WAV file.
     The media file must be file_type=video (e.g. mp4, webm). Uses MoviePy (no system ffmpeg required).
+    A local video is read in place and a Spaces one downloaded to a temp file in chunks; the WAV is
+    streamed from disk (with Range support), so neither is ever held in memory.
     """
     result = await db.execute(
         select(MediaFile).where(MediaFile.id == media_id, MediaFile.file_type == "video")
@@ -140,23 +279,31 @@ async def get_video_audio_tail(
     if not media:
         raise HTTPException(status_code=404, detail="Video not found or not a video file")
     storage = get_storage()
+    workdir = Path(await asyncio.to_thread(tempfile.mkdtemp, prefix="audio-tail-"))
     try:
-        video_bytes = storage.read(media.storage_key)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Video file not found in storage") from None
-    try:
-        wav_bytes = await asyncio.to_thread(
-            _extract_last_n_seconds_wav, video_bytes, seconds
-        )
-    except RuntimeError as e:
-        raise HTTPException(status_code=500, detail=str(e)) from e
-    if not wav_bytes:
-        raise HTTPException(
-            status_code=422,
-            detail="Could not extract audio from video (format or duration issue).",
-        )
-    return Response(
-        content=wav_bytes,
+        try:
+            video_path = await storage.alocal_path(media.storage_key)
+            if video_path is None:
+                video_path = workdir / f"video{Path(media.storage_key).suffix or '.mp4'}"
+                await storage.adownload(media.storage_key, video_path)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="Video file not found in storage") from None
+        wav_path = workdir / "tail.wav"
+        try:
+            await asyncio.to_thread(_extract_last_n_seconds_wav, video_path, seconds, wav_path)
+        except RuntimeError as e:
+            raise HTTPException(status_code=500, detail=str(e)) from e
+        if not await asyncio.to_thread(lambda: wav_path.is_file() and wav_path.stat().st_size > 0):
+            raise HTTPException(
+                status_code=422,
+                detail="Could not extract audio from video (format or duration issue).",
+            )
+    except BaseException:
+        await asyncio.to_thread(shutil.rmtree, workdir, True)
+        raise
+    return FileResponse(
+        wav_path,
         media_type="audio/wav",
         headers={"Content-Disposition": f'attachment; filename="audio_tail_{media_id}_{int(seconds)}s.wav"'},
+        background=BackgroundTask(shutil.rmtree, workdir, True),
     )
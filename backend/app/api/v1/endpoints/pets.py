@@ -1,34 +1,70 @@
 """Pets API endpoints."""
 
+import asyncio
+from collections import defaultdict
 from datetime import date, datetime, timedelta, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence
 
 import httpx
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response, StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.vet_visit import VetVisit
 
 from app.config import get_settings
-from app.core.dependencies import DbSession
+from app.core.dependencies import (
+    DbSession,
+    ExistingPetId,
+    PrimaryReadDbSession,
+    ReadDbSession,
+    ReadExistingPetId,
+)
+from app.core.downloads import stored_file_response
+from app.core.http_cache import IMMUTABLE, REVALIDATE, conditional, etag_matches, make_etag, not_modified
+from app.core.live_events import RESYNC, live_events
+from app.core.pagination import CURSOR_QUERY, decode_cursor, paginated
+from app.core.serialization import dumper, json_response, row
+from app.core.uploads import multipart_file_body, receive_upload
+from app.core.response_cache import pet_tag, response_cache, user_tag, vet_tag
 from app.crud.activity_state_log import activity_state_log_crud
 from app.crud.eating_log import eating_log_crud
 from app.crud.pet import pet_crud
+from app.crud.pet_daily_stats import pet_daily_stats_crud
 from app.crud.sleep_log import sleep_log_crud
+from app.crud.user import user_crud
+from app.db.session import read_session_maker
 from app.models.media_file import MediaFile
-from app.models.user import User
+from app.models.pet import Pet
 from app.schemas.habits import (
+    ActivityStateLogBulkItem,
     ActivityStateLogCreate,
     ActivityStateLogResponse,
+    BulkItemError,
+    BulkLogRequest,
+    BulkLogResponse,
+    EatingLogBulkItem,
     EatingLogCreate,
     EatingLogResponse,
+    SleepLogBulkItem,
     SleepLogCreate,
     SleepLogResponse,
 )
+from app.schemas.pagination import CursorPage
 from app.schemas.pet import PetCreate, PetResponse, PetUpdate
-from app.schemas.stats import ActivityStatsResponse, CalendarDayStats, CalendarEventsResponse, DayActivityStats, UpcomingEventItem
+from app.schemas.stats import (
+    ActivityStateSeriesResponse,
+    ActivityStatsResponse,
+    CalendarDayStats,
+    CalendarEventsResponse,
+    DayActivityStats,
+    UpcomingEventItem,
+)
 from app.services.qr_code import generate_qr_png
 from app.services.storage import get_storage
 
@@ -37,142 +73,158 @@ router = APIRouter(prefix="/pets", tags=["pets"])
 ALLOWED_IMAGE = {"image/jpeg", "image/png", "image/webp", "image/gif"}
 PROFILE_PHOTO_MAX_SIZE = 10 * 1024 * 1024  # 10 MB
 
+_sleep_log_rows = dumper(SleepLogResponse)
+_eating_log_rows = dumper(EatingLogResponse)
+_activity_state_log_rows = dumper(ActivityStateLogResponse)
 
-async def _get_pet_profile_photo_url(db: DbSession, pet_id: int) -> Optional[str]:
-    """Return the API URL for the pet's profile picture (same-origin, works like medical records)."""
-    media = await _get_pet_profile_photo_media(db, pet_id)
-    if not media:
-        return None
+
+def _profile_picture_url(pet_id: int, media_id: int) -> str:
+    """
+    Return the API URL for the pet's profile picture (same-origin, works like medical records).
+    Versioned by media id, so the URL changes with the picture and can be cached as immutable.
+    """
     base = get_settings().api_base_url.rstrip("/")
-    return f"{base}/api/v1/pets/{pet_id}/profile-picture"
+    return f"{base}/api/v1/pets/{pet_id}/profile-picture?v={media_id}"
 
 
-async def _get_pet_profile_photo_media(db: DbSession, pet_id: int) -> Optional[MediaFile]:
-    """Return the latest MediaFile (image) for the pet, or None."""
-    result = await db.execute(
-        select(MediaFile)
-        .where(MediaFile.pet_id == pet_id, MediaFile.file_type == "image")
-        .order_by(MediaFile.id.desc())
-        .limit(1)
-    )
-    return result.scalar_one_or_none()
+def _pet_response(pet: Pet, media_id: int | None) -> dict:
+    return row(PetResponse, pet, profile_photo_url=_profile_picture_url(pet.id, media_id) if media_id else None)
+
+
+async def pet_responses(db: AsyncSession, pets: Sequence[Pet]) -> list[dict]:
+    """PetResponse data with profile_photo_url for a page of pets; at most one extra query for the whole page."""
+    media_ids = await pet_crud.get_profile_media_ids(db, pets=pets)
+    return [_pet_response(pet, media_ids.get(pet.id)) for pet in pets]
+
+
+async def _get_pet_profile_photo_media(db: DbSession, pet: Pet) -> Optional[MediaFile]:
+    """Return the pet's profile picture MediaFile (stored pointer, else latest image), or None."""
+    media_id = (await pet_crud.get_profile_media_ids(db, pets=[pet])).get(pet.id)
+    if media_id is None:
+        return None
+    return await db.get(MediaFile, media_id)
 
 
 @router.get("", response_model=list[PetResponse])
 async def list_pets(
-    db: DbSession,
+    db: ReadDbSession,
     skip: int = 0,
     limit: int = 100,
-) -> list[PetResponse]:
+) -> Response:
     """List pets with pagination."""
     pets = await pet_crud.get_multi(db, skip=skip, limit=limit)
-    out = []
-    for pet in pets:
-        data = PetResponse.model_validate(pet).model_dump()
-        data["profile_photo_url"] = await _get_pet_profile_photo_url(db, pet.id)
-        out.append(data)
-    return out
+    return json_response(await pet_responses(db, pets))
 
 
 @router.get("/{pet_id}", response_model=PetResponse)
-async def get_pet(db: DbSession, pet_id: int) -> PetResponse:
-    """Get a single pet by id."""
-    pet = await pet_crud.get(db, id=pet_id)
+async def get_pet(db: ReadDbSession, request: Request, pet_id: int) -> Response:
+    """Get a single pet by id. The ETag follows updated_at and the profile picture; If-None-Match gets a 304."""
+    pet = await pet_crud.get_lean(db, pet_id)
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
-    data = PetResponse.model_validate(pet).model_dump()
-    data["profile_photo_url"] = await _get_pet_profile_photo_url(db, pet_id)
-    return data
+    media_id = (await pet_crud.get_profile_media_ids(db, pets=[pet])).get(pet.id)
+    etag = make_etag("pet", pet.id, pet.updated_at.isoformat(), media_id)
+    if etag_matches(request, etag):
+        return not_modified(etag, REVALIDATE)
+    return json_response(_pet_response(pet, media_id), headers={"ETag": etag, "Cache-Control": REVALIDATE})
 
 
 @router.post("", response_model=PetResponse, status_code=201)
-async def create_pet(db: DbSession, body: PetCreate) -> PetResponse:
+async def create_pet(db: DbSession, body: PetCreate) -> Response:
     """Create a new pet. If owner_id is set, that user is linked to the pet (and sees it in their pets list)."""
     pet = await pet_crud.create(db, obj_in=body)
-    if pet.owner_id:
-        user = await db.get(User, pet.owner_id)
-        if user:
-            user.linked_pets.append(pet)
-            await db.flush()
-    data = PetResponse.model_validate(pet).model_dump()
-    data["profile_photo_url"] = await _get_pet_profile_photo_url(db, pet.id)
-    return data
+    if pet.owner_id and await user_crud.link_pet(db, user_id=pet.owner_id, pet_id=pet.id):
+        await response_cache.invalidate(db, user_tag(pet.owner_id))
+    return json_response(_pet_response(pet, None), status_code=201)  # a new pet has no pictures yet
 
 
 @router.patch("/{pet_id}", response_model=PetResponse)
-async def update_pet(db: DbSession, pet_id: int, body: PetUpdate) -> PetResponse:
+async def update_pet(db: DbSession, pet_id: int, body: PetUpdate) -> Response:
     """Update a pet."""
-    pet = await pet_crud.get(db, id=pet_id)
+    pet = await pet_crud.get_lean(db, pet_id)
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
     updated = await pet_crud.update(db, db_obj=pet, obj_in=body)
-    data = PetResponse.model_validate(updated).model_dump()
-    data["profile_photo_url"] = await _get_pet_profile_photo_url(db, pet_id)
-    return data
+    return json_response((await pet_responses(db, [updated]))[0])
 
 
 @router.get("/{pet_id}/profile-picture", response_class=Response)
-async def get_pet_profile_picture(db: DbSession, pet_id: int) -> Response:
+async def get_pet_profile_picture(
+    db: ReadDbSession,
+    request: Request,
+    pet_id: int,
+    v: Optional[int] = Query(None, description="Profile picture media id, as in profile_photo_url"),
+) -> Response:
     """
     Return the pet's current profile picture (latest uploaded image).
     Use this URL as img src when storage does not provide a public URL (e.g. local dev).
+    The ETag is derived from the storage key; when v names the current picture the response is
+    immutable, otherwise clients revalidate (304 while the picture is unchanged).
     """
-    pet = await pet_crud.get(db, id=pet_id)
+    pet = await pet_crud.get_lean(db, pet_id)
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
-    media = await _get_pet_profile_photo_media(db, pet_id)
+    media = await _get_pet_profile_photo_media(db, pet)
     if not media:
         raise HTTPException(status_code=404, detail="No profile picture set for this pet")
-    storage = get_storage()
+    etag = make_etag(media.storage_key)
+    cache_control = IMMUTABLE if v == media.id else REVALIDATE
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
     try:
-        body = storage.read(media.storage_key)
+        return await stored_file_response(
+            request,
+            media.storage_key,
+            media_type=media.mime_type,
+            headers={"ETag": etag, "Cache-Control": cache_control},
+            size=media.file_size_bytes,
+        )
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Profile picture file not found") from None
-    return Response(content=body, media_type=media.mime_type)
 
 
-@router.post("/{pet_id}/profile-picture")
+@router.post("/{pet_id}/profile-picture", openapi_extra=multipart_file_body())
 async def upload_pet_profile_picture(
     db: DbSession,
+    request: Request,
     pet_id: int,
-    file: UploadFile = File(...),
 ) -> dict:
     """
     Upload a profile picture for the pet. Accepts image/jpeg, image/png, image/webp, image/gif.
     Returns url (from storage if available) and profile_picture_url (API endpoint to display the image).
     """
-    pet = await pet_crud.get(db, id=pet_id)
+    pet = await pet_crud.get_lean(db, pet_id)
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
-    content_type = (file.content_type or "").strip().lower()
+    file = await receive_upload(request)
+    content_type = file.content_type
     if content_type not in ALLOWED_IMAGE:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid type. Allowed: image/jpeg, image/png, image/webp, image/gif",
         )
-    body = await file.read()
-    if len(body) > PROFILE_PHOTO_MAX_SIZE:
-        raise HTTPException(status_code=400, detail="File too large (max 10 MB)")
     owner_id = pet.owner_id or 1
     storage = get_storage()
-    key = storage.key_for("image", owner_id, file.filename or "profile.jpg")
-    storage.save(key, body, content_type=content_type)
-    url = storage.get_url(key)
+    stored = await file.save(
+        db, storage, max_size=PROFILE_PHOTO_MAX_SIZE, too_large="File too large (max 10 MB)"
+    )
+    url = storage.get_url(stored.key)
     settings = get_settings()
     media = MediaFile(
         owner_id=owner_id,
         pet_id=pet_id,
         file_type="image",
         mime_type=content_type,
-        storage_key=key,
+        storage_key=stored.key,
         storage_backend=settings.storage_backend,
-        file_size_bytes=len(body),
+        file_size_bytes=stored.size,
+        content_sha256=stored.sha256,
     )
     db.add(media)
     await db.flush()
-    base = get_settings().api_base_url.rstrip("/")
-    profile_picture_url = f"{base}/api/v1/pets/{pet_id}/profile-picture"
-    return {"url": url, "profile_picture_url": profile_picture_url, "media_id": media.id}
+    pet.profile_media_id = media.id
+    await db.flush()
+    return {"url": url, "profile_picture_url": _profile_picture_url(pet_id, media.id), "media_id": media.id}
 
 
 @router.delete("/{pet_id}", status_code=204)
@@ -193,44 +245,33 @@ async def add_pet_to_account(
     Add this pet to a user's account (e.g. after scanning the pet's share QR or opening a share link).
     The pet will appear in GET /api/v1/users/{user_id}/pets. Idempotent: if already linked, returns 200 with the pet.
     """
-    pet = await pet_crud.get(db, id=pet_id)
+    pet = await pet_crud.get_lean(db, pet_id)
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
-    user = await db.get(User, user_id)
-    if not user:
+    if await user_crud.link_pet(db, user_id=user_id, pet_id=pet_id):
+        await response_cache.invalidate(db, user_tag(user_id))
+    elif await user_crud.get(db, id=user_id) is None:
         raise HTTPException(status_code=404, detail="User not found")
-    if pet in user.linked_pets:
-        return pet  # already linked
-    user.linked_pets.append(pet)
-    await db.flush()
-    await db.refresh(pet)
     return pet
 
 
 @router.get("/{pet_id}/qr-code/share", response_class=Response)
-async def get_pet_qr_code_share(db: DbSession, pet_id: int) -> Response:
+async def get_pet_qr_code_share(db: ReadDbSession, pet_id: int) -> Response:
     """
     Generate a QR code that links to the share page where another user can add this pet to their account.
     Scan the QR or open the link, then call POST /api/v1/pets/{pet_id}/add-to-account with your user_id.
     """
-    pet = await pet_crud.get(db, id=pet_id)
+    pet = await pet_crud.get_lean(db, pet_id)
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
     settings = get_settings()
     base = (settings.api_base_url or "http://localhost:8000").rstrip("/")
     share_url = f"{base}/share/pet/{pet_id}"
     logo_bytes: Optional[bytes] = None
-    result = await db.execute(
-        select(MediaFile)
-        .where(MediaFile.pet_id == pet_id, MediaFile.file_type == "image")
-        .order_by(MediaFile.id.desc())
-        .limit(1)
-    )
-    media = result.scalar_one_or_none()
+    media = await _get_pet_profile_photo_media(db, pet)
     if media:
         try:
-            storage = get_storage()
-            logo_bytes = storage.read(media.storage_key)
+            logo_bytes = await get_storage().aread(media.storage_key)
         except Exception:
             pass
     png_bytes = generate_qr_png(share_url, logo_bytes=logo_bytes)
@@ -238,12 +279,12 @@ async def get_pet_qr_code_share(db: DbSession, pet_id: int) -> Response:
 
 
 @router.get("/{pet_id}/qr-code", response_class=Response)
-async def get_pet_qr_code(db: DbSession, pet_id: int) -> Response:
+async def get_pet_qr_code(db: ReadDbSession, pet_id: int) -> Response:
     """
     Generate a QR code that links to this pet's profile.
     The center logo is the pet's profile picture if they have one, otherwise a paw icon.
     """
-    pet = await pet_crud.get(db, id=pet_id)
+    pet = await pet_crud.get_lean(db, pet_id)
     if not pet:
         raise HTTPException(status_code=404, detail="Pet not found")
 
@@ -252,17 +293,10 @@ async def get_pet_qr_code(db: DbSession, pet_id: int) -> Response:
     profile_url = f"{base}/pet/{pet_id}"
 
     logo_bytes: Optional[bytes] = None
-    result = await db.execute(
-        select(MediaFile)
-        .where(MediaFile.pet_id == pet_id, MediaFile.file_type == "image")
-        .order_by(MediaFile.id.desc())
-        .limit(1)
-    )
-    media = result.scalar_one_or_none()
+    media = await _get_pet_profile_photo_media(db, pet)
     if media:
         try:
-            storage = get_storage()
-            logo_bytes = storage.read(media.storage_key)
+            logo_bytes = await get_storage().aread(media.storage_key)
         except Exception:
             pass
 
@@ -293,34 +327,40 @@ async def get_pet_qr_code(db: DbSession, pet_id: int) -> Response:
 
 @router.get("/{pet_id}/stats/activity", response_model=ActivityStatsResponse)
 async def get_activity_stats(
-    db: DbSession,
+    db: PrimaryReadDbSession,
+    request: Request,
     pet_id: int,
     days: int = Query(7, ge=1, le=90, description="Number of days to include"),
-) -> ActivityStatsResponse:
-    """Activity stats per day (sleep minutes, meals count) for the last N days. For dashboard charts."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
-    tz = timezone.utc
+) -> Response:
+    """
+    Activity stats per day (sleep minutes, meals count, active minutes) for the last N days. For dashboard charts.
+    Served from the response cache until the pet's next log or pet write; If-None-Match with the
+    body's ETag gets a 304.
+    """
     today = date.today()
-    since_dt = datetime(today.year, today.month, today.day, tzinfo=tz) - timedelta(days=days)
-    until_dt = datetime(today.year, today.month, today.day, 23, 59, 59, 999999, tzinfo=tz)
-    sleep_logs = await sleep_log_crud.get_multi(db, pet_id=pet_id, since=since_dt, until=until_dt, limit=500)
-    eating_logs = await eating_log_crud.get_multi(db, pet_id=pet_id, since=since_dt, until=until_dt, limit=500)
-    by_date: dict[date, tuple[int, int]] = {}
-    for d in (today - timedelta(days=i) for i in range(days)):
-        by_date[d] = (0, 0)
-    for log in sleep_logs:
-        d = log.started_at.date() if hasattr(log.started_at, "date") else log.started_at
-        if d in by_date:
-            mins = log.duration_minutes or 0
-            by_date[d] = (by_date[d][0] + mins, by_date[d][1])
-    for log in eating_logs:
-        d = log.occurred_at.date() if hasattr(log.occurred_at, "date") else log.occurred_at
-        if d in by_date:
-            by_date[d] = (by_date[d][0], by_date[d][1] + 1)
-    day_list = [DayActivityStats(day=d, sleep_minutes=by_date[d][0], meals_count=by_date[d][1]) for d in sorted(by_date, reverse=True)]
-    return ActivityStatsResponse(pet_id=pet_id, days=day_list)
+
+    async def build() -> tuple[ActivityStatsResponse, list[str]]:
+        if not await pet_crud.exists(db, pet_id):
+            raise HTTPException(status_code=404, detail="Pet not found")
+        rows = await pet_daily_stats_crud.get_range(db, pet_id=pet_id, start=today - timedelta(days=days - 1), end=today)
+        by_date = {row.day: row for row in rows}
+        day_list = []
+        for d in (today - timedelta(days=i) for i in range(days)):
+            row = by_date.get(d)
+            day_list.append(
+                DayActivityStats(
+                    day=d,
+                    sleep_minutes=row.sleep_minutes,
+                    meals_count=row.meals_count,
+                    active_minutes=row.active_minutes,
+                )
+                if row
+                else DayActivityStats(day=d)
+            )
+        return ActivityStatsResponse(pet_id=pet_id, days=day_list), [pet_tag(pet_id)]
+
+    cached = await response_cache.get_or_build("pet_activity_stats", f"{pet_id}:{today}:{days}", build)
+    return conditional(request, cached)
 
 
 # --- Calendar ---
@@ -328,155 +368,330 @@ async def get_activity_stats(
 
 @router.get("/{pet_id}/calendar/events", response_model=CalendarEventsResponse)
 async def get_calendar_events(
-    db: DbSession,
+    db: PrimaryReadDbSession,
+    request: Request,
     pet_id: int,
     start: date = Query(..., description="Start date (YYYY-MM-DD)"),
     end: date = Query(..., description="End date (YYYY-MM-DD)"),
     include_activity: bool = Query(True, description="Include daily sleep/meals stats"),
-) -> CalendarEventsResponse:
-    """Vet visits and optional daily activity for this pet in the given date range."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
+) -> Response:
+    """
+    Vet visits and optional daily activity for this pet in the given date range.
+    Served from the response cache until the next write to the pet, its logs, visits or their vets;
+    If-None-Match with the body's ETag gets a 304.
+    """
     if start > end:
         raise HTTPException(status_code=400, detail="start must be <= end")
-    # Vet visits in range
-    result = await db.execute(
-        select(VetVisit)
-        .options(selectinload(VetVisit.pet), selectinload(VetVisit.vet))
-        .where(VetVisit.pet_id == pet_id, VetVisit.visit_date >= start, VetVisit.visit_date <= end)
-        .order_by(VetVisit.visit_date.asc())
-    )
-    visits = list(result.scalars().unique().all())
-    vet_visits = [
-        UpcomingEventItem(
-            visit_id=v.id,
-            pet_id=v.pet_id,
-            pet_name=v.pet.name,
-            visit_date=v.visit_date,
-            visit_reason=v.visit_reason,
-            vet_name=v.vet.name if v.vet else None,
-            vet_clinic=v.vet.clinic_name if v.vet else None,
+
+    async def build() -> tuple[CalendarEventsResponse, list[str]]:
+        if not await pet_crud.exists(db, pet_id):
+            raise HTTPException(status_code=404, detail="Pet not found")
+        # Vet visits in range
+        result = await db.execute(
+            select(VetVisit)
+            .options(selectinload(VetVisit.pet), selectinload(VetVisit.vet))
+            .where(VetVisit.pet_id == pet_id, VetVisit.visit_date >= start, VetVisit.visit_date <= end)
+            .order_by(VetVisit.visit_date.asc())
         )
-        for v in visits
-    ]
-    daily_stats: list[CalendarDayStats] = []
-    if include_activity:
-        tz = timezone.utc
-        since_dt = datetime(start.year, start.month, start.day, tzinfo=tz)
-        until_dt = datetime(end.year, end.month, end.day, 23, 59, 59, 999999, tzinfo=tz)
-        sleep_logs = await sleep_log_crud.get_multi(db, pet_id=pet_id, since=since_dt, until=until_dt, limit=2000)
-        eating_logs = await eating_log_crud.get_multi(db, pet_id=pet_id, since=since_dt, until=until_dt, limit=2000)
-        by_date: dict[date, tuple[int, int]] = {}
-        d = start
-        while d <= end:
-            by_date[d] = (0, 0)
-            d += timedelta(days=1)
-        for log in sleep_logs:
-            d = log.started_at.date() if hasattr(log.started_at, "date") else log.started_at
-            if d in by_date:
-                mins = log.duration_minutes or 0
-                by_date[d] = (by_date[d][0] + mins, by_date[d][1])
-        for log in eating_logs:
-            d = log.occurred_at.date() if hasattr(log.occurred_at, "date") else log.occurred_at
-            if d in by_date:
-                by_date[d] = (by_date[d][0], by_date[d][1] + 1)
-        daily_stats = [
-            CalendarDayStats(pet_id=pet_id, day=d, sleep_minutes=by_date[d][0], meals_count=by_date[d][1])
-            for d in sorted(by_date)
+        visits = list(result.scalars().unique().all())
+        vet_visits = [
+            UpcomingEventItem(
+                visit_id=v.id,
+                pet_id=v.pet_id,
+                pet_name=v.pet.name,
+                visit_date=v.visit_date,
+                visit_reason=v.visit_reason,
+                vet_name=v.vet.name if v.vet else None,
+                vet_clinic=v.vet.clinic_name if v.vet else None,
+            )
+            for v in visits
         ]
-    return CalendarEventsResponse(vet_visits=vet_visits, daily_stats=daily_stats)
+        daily_stats: list[CalendarDayStats] = []
+        if include_activity:
+            rows = await pet_daily_stats_crud.get_range(db, pet_id=pet_id, start=start, end=end)
+            by_date = {row.day: row for row in rows}
+            d = start
+            while d <= end:
+                row = by_date.get(d)
+                daily_stats.append(
+                    CalendarDayStats(
+                        pet_id=pet_id,
+                        day=d,
+                        sleep_minutes=row.sleep_minutes,
+                        meals_count=row.meals_count,
+                        active_minutes=row.active_minutes,
+                    )
+                    if row
+                    else CalendarDayStats(pet_id=pet_id, day=d)
+                )
+                d += timedelta(days=1)
+        tags = [pet_tag(pet_id), *(vet_tag(v.vet_id) for v in visits if v.vet_id is not None)]
+        return CalendarEventsResponse(vet_visits=vet_visits, daily_stats=daily_stats), tags
+
+    cached = await response_cache.get_or_build(
+        "pet_calendar_events", f"{pet_id}:{start}:{end}:{int(include_activity)}", build
+    )
+    return conditional(request, cached)
 
 
 # --- Sleep habits ---
 
 
-@router.get("/{pet_id}/sleep-logs", response_model=list[SleepLogResponse])
+@router.get("/{pet_id}/sleep-logs", response_model=list[SleepLogResponse] | CursorPage[SleepLogResponse])
 async def list_sleep_logs(
-    db: DbSession,
-    pet_id: int,
+    db: ReadDbSession,
+    pet_id: ReadExistingPetId,
     since: Optional[datetime] = Query(None, description="Filter logs on or after this time"),
     until: Optional[datetime] = Query(None, description="Filter logs on or before this time"),
     skip: int = 0,
     limit: int = 100,
-) -> list[SleepLogResponse]:
-    """List sleep logs for a pet (e.g. dog)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
-    logs = await sleep_log_crud.get_multi(db, pet_id=pet_id, since=since, until=until, skip=skip, limit=limit)
-    return list(logs)
+    cursor: Optional[str] = CURSOR_QUERY,
+) -> Response:
+    """List sleep logs for a pet (e.g. dog), newest first."""
+    logs = await sleep_log_crud.get_multi(
+        db,
+        pet_id=pet_id,
+        since=since,
+        until=until,
+        after=decode_cursor(cursor),
+        skip=skip if cursor is None else 0,
+        limit=limit,
+    )
+    return json_response(
+        paginated(logs, cursor=cursor, limit=limit, key_attr="started_at", dump=_sleep_log_rows)
+    )
 
 
 @router.post("/{pet_id}/sleep-logs", response_model=SleepLogResponse, status_code=201)
-async def create_sleep_log(db: DbSession, pet_id: int, body: SleepLogCreate) -> SleepLogResponse:
+async def create_sleep_log(db: DbSession, pet_id: ExistingPetId, body: SleepLogCreate) -> SleepLogResponse:
     """Log a sleep session for a pet (e.g. when dog went to sleep / woke up)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     return await sleep_log_crud.create(db, pet_id=pet_id, obj_in=body)
 
 
 # --- Eating habits ---
 
 
-@router.get("/{pet_id}/eating-logs", response_model=list[EatingLogResponse])
+@router.get("/{pet_id}/eating-logs", response_model=list[EatingLogResponse] | CursorPage[EatingLogResponse])
 async def list_eating_logs(
-    db: DbSession,
-    pet_id: int,
+    db: ReadDbSession,
+    pet_id: ReadExistingPetId,
     since: Optional[datetime] = Query(None, description="Filter logs on or after this time"),
     until: Optional[datetime] = Query(None, description="Filter logs on or before this time"),
     meal_type: Optional[str] = Query(None, description="Filter by meal_type: breakfast, lunch, dinner, snack"),
     skip: int = 0,
     limit: int = 100,
-) -> list[EatingLogResponse]:
-    """List eating logs for a pet (e.g. dog)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
+    cursor: Optional[str] = CURSOR_QUERY,
+) -> Response:
+    """List eating logs for a pet (e.g. dog), newest first."""
     logs = await eating_log_crud.get_multi(
-        db, pet_id=pet_id, since=since, until=until, meal_type=meal_type, skip=skip, limit=limit
+        db,
+        pet_id=pet_id,
+        since=since,
+        until=until,
+        meal_type=meal_type,
+        after=decode_cursor(cursor),
+        skip=skip if cursor is None else 0,
+        limit=limit,
+    )
+    return json_response(
+        paginated(logs, cursor=cursor, limit=limit, key_attr="occurred_at", dump=_eating_log_rows)
     )
-    return list(logs)
 
 
 @router.post("/{pet_id}/eating-logs", response_model=EatingLogResponse, status_code=201)
-async def create_eating_log(db: DbSession, pet_id: int, body: EatingLogCreate) -> EatingLogResponse:
+async def create_eating_log(db: DbSession, pet_id: ExistingPetId, body: EatingLogCreate) -> EatingLogResponse:
     """Log an eating event for a pet (e.g. when dog ate and what meal)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     return await eating_log_crud.create(db, pet_id=pet_id, obj_in=body)
 
 
 # --- Activity state (active / resting) for live stats chart ---
 
 
-@router.get("/{pet_id}/activity-state-logs", response_model=list[ActivityStateLogResponse])
+def _as_utc(dt: datetime) -> datetime:
+    """Timezone-aware dt; naive times are taken as UTC, like stored ones."""
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+@router.get(
+    "/{pet_id}/activity-state-logs",
+    response_model=list[ActivityStateLogResponse] | CursorPage[ActivityStateLogResponse],
+)
 async def list_activity_state_logs(
-    db: DbSession,
-    pet_id: int,
+    db: ReadDbSession,
+    pet_id: ReadExistingPetId,
     since: Optional[datetime] = Query(None, description="Filter logs on or after this time (for live chart)"),
     until: Optional[datetime] = Query(None, description="Filter logs on or before this time"),
     skip: int = 0,
     limit: int = Query(500, ge=1, le=2000),
-) -> list[ActivityStateLogResponse]:
-    """List activity state changes for a pet. Use for stats live chart (poll with since/until)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
+    cursor: Optional[str] = CURSOR_QUERY,
+) -> Response:
+    """
+    List activity state changes for a pet. Use for the stats live chart: load the window with
+    since/until, then follow GET /pets/{pet_id}/events instead of polling.
+    """
     logs = await activity_state_log_crud.get_multi(
-        db, pet_id=pet_id, since=since, until=until, skip=skip, limit=limit
+        db,
+        pet_id=pet_id,
+        since=since,
+        until=until,
+        after=decode_cursor(cursor),
+        skip=skip if cursor is None else 0,
+        limit=limit,
+    )
+    return json_response(
+        paginated(logs, cursor=cursor, limit=limit, key_attr="start_time", dump=_activity_state_log_rows)
     )
-    return list(logs)
+
+
+@router.get("/{pet_id}/activity-state/series", response_model=ActivityStateSeriesResponse)
+async def get_activity_state_series(
+    db: ReadDbSession,
+    pet_id: ReadExistingPetId,
+    since: Optional[datetime] = Query(None, description="Window start (default: one hour before until)"),
+    until: Optional[datetime] = Query(None, description="Window end (default: now)"),
+    points: int = Query(120, ge=1, le=500, description="Number of buckets in the window"),
+) -> Response:
+    """
+    Activity state downsampled server-side for the live chart: the fraction of time spent active in
+    each of `points` equal buckets. The payload size depends on points only, not on the window or
+    the number of transitions in it, so a 30-day chart costs the same to send as a 1-hour one.
+    """
+    until = _as_utc(until) if until else datetime.now(timezone.utc)
+    since = _as_utc(since) if since else until - timedelta(hours=1)
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    active = await activity_state_log_crud.get_series(db, pet_id=pet_id, since=since, until=until, points=points)
+    series = ActivityStateSeriesResponse(
+        pet_id=pet_id,
+        since=since,
+        until=until,
+        bucket_seconds=(until - since).total_seconds() / points,
+        active=[None if a is None else round(a, 3) for a in active],
+    )
+    return json_response(series.model_dump(mode="json"))
 
 
 @router.post("/{pet_id}/activity-state-logs", response_model=ActivityStateLogResponse, status_code=201)
 async def create_activity_state_log(
-    db: DbSession, pet_id: int, body: ActivityStateLogCreate
+    db: DbSession, pet_id: ExistingPetId, body: ActivityStateLogCreate
 ) -> ActivityStateLogResponse:
     """Log an activity state change (active vs resting). Call when pet transitions to/from active."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     return await activity_state_log_crud.create(db, pet_id=pet_id, obj_in=body)
+
+
+# --- Live events (pushed instead of polling the log lists) ---
+
+
+@router.get("/{pet_id}/events", response_class=StreamingResponse)
+async def stream_pet_events(pet_id: int) -> StreamingResponse:
+    """
+    Server-Sent Events stream of the pet's new activity-state, sleep and eating logs, as they are
+    committed (event names and payloads: app/core/live_events.py). Replaces polling the list
+    endpoints: an open stream costs no queries until something is logged. After a `resync` event
+    the stream ends; reload with the list endpoints, then reconnect.
+    """
+    # Short session: a dependency-provided one would stay checked out for the life of the stream
+    async with read_session_maker() as db:
+        if not await pet_crud.exists(db, pet_id):
+            raise HTTPException(status_code=404, detail="Pet not found")
+    await live_events.listen()
+    keepalive = get_settings().live_events_keepalive_seconds
+
+    async def frames() -> AsyncIterator[bytes]:
+        async with live_events.subscribe(pet_id) as queue:
+            yield b": subscribed\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), keepalive)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+                    continue
+                yield frame
+                if frame is RESYNC:
+                    return
+
+    return StreamingResponse(
+        frames(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+# --- Bulk ingestion (camera / device sources, several pets per request) ---
+
+
+# The bulk endpoints read the body themselves, to validate it straight from JSON in one pass
+BULK_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": BulkLogRequest.model_json_schema()}},
+    }
+}
+
+
+@lru_cache
+def _bulk_adapter(item_schema: type) -> TypeAdapter:
+    return TypeAdapter(list[item_schema])
+
+
+def _validate_bulk_items(body: bytes, item_schema: type) -> tuple[Sequence[int], list[dict[str, Any]], dict[int, str]]:
+    """
+    Validate the request body and all its items in one pass, into plain dicts. If some items are
+    invalid, report them per index and validate the remaining items again; anything else wrong with
+    the body is a 422 as usual. Returns (indexes of the valid items, those items, {index: error}).
+    """
+    try:
+        items = BulkLogRequest[item_schema].model_validate_json(body).items
+        return range(len(items)), items, {}
+    except ValidationError as e:
+        errors = e.errors()
+    if any(len(err["loc"]) < 2 or err["loc"][0] != "items" for err in errors):
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in errors])
+    details: dict[int, list[str]] = defaultdict(list)
+    for err in errors:
+        _, index, *loc = err["loc"]
+        field = ".".join(str(p) for p in loc)
+        details[int(index)].append(f"{field}: {err['msg']}" if field else err["msg"])
+    raw = BulkLogRequest.model_validate_json(body).items
+    good = [i for i in range(len(raw)) if i not in details]
+    parsed = _bulk_adapter(item_schema).validate_python([raw[i] for i in good])
+    return good, parsed, {i: "; ".join(msgs) for i, msgs in details.items()}
+
+
+async def _ingest_bulk(
+    db: AsyncSession,
+    request: Request,
+    item_schema: type,
+    create_many: Callable[..., Awaitable[int]],
+) -> BulkLogResponse:
+    """Validate all items, check all pets in one query, insert the valid ones with one COPY."""
+    indexes, parsed, invalid = _validate_bulk_items(await request.body(), item_schema)
+    pet_ids = {item["pet_id"] for item in parsed}
+    existing = await pet_crud.get_existing_ids(db, ids=pet_ids) if parsed else set()
+    valid = parsed
+    if existing != pet_ids:
+        valid = []
+        for index, item in zip(indexes, parsed):
+            if item["pet_id"] in existing:
+                valid.append(item)
+            else:
+                invalid[index] = "Pet not found"
+    inserted = await create_many(db, items=valid)
+    errors = [BulkItemError(index=index, detail=detail) for index, detail in sorted(invalid.items())]
+    return BulkLogResponse(inserted=inserted, errors=errors)
+
+
+@router.post("/sleep-logs/bulk", response_model=BulkLogResponse, openapi_extra=BULK_BODY)
+async def bulk_create_sleep_logs(db: DbSession, request: Request) -> BulkLogResponse:
+    """Ingest many sleep logs (SleepLogBulkItem) for any pets. Invalid items are reported per index."""
+    return await _ingest_bulk(db, request, SleepLogBulkItem, sleep_log_crud.create_many)
+
+
+@router.post("/eating-logs/bulk", response_model=BulkLogResponse, openapi_extra=BULK_BODY)
+async def bulk_create_eating_logs(db: DbSession, request: Request) -> BulkLogResponse:
+    """Ingest many eating logs (EatingLogBulkItem) for any pets. Invalid items are reported per index."""
+    return await _ingest_bulk(db, request, EatingLogBulkItem, eating_log_crud.create_many)
+
+
+@router.post("/activity-state-logs/bulk", response_model=BulkLogResponse, openapi_extra=BULK_BODY)
+async def bulk_create_activity_state_logs(db: DbSession, request: Request) -> BulkLogResponse:
+    """Ingest many activity state changes (ActivityStateLogBulkItem). Invalid items are reported per index."""
+    return await _ingest_bulk(db, request, ActivityStateLogBulkItem, activity_state_log_crud.create_many)
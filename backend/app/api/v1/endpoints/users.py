@@ -1,19 +1,28 @@
 """Users API endpoints."""
 
-from datetime import date, datetime, timedelta, timezone
+from datetime import date, timedelta
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import Response
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from app.config import get_settings
-from app.core.dependencies import CurrentUser, DbSession
-from app.models.media_file import MediaFile
-from app.services.storage import get_storage
-from app.crud.eating_log import eating_log_crud
-from app.crud.sleep_log import sleep_log_crud
+from app.api.v1.endpoints.pets import pet_responses
+from app.core.dependencies import (
+    CurrentPrincipal,
+    CurrentUser,
+    DbSession,
+    PrimaryReadDbSession,
+    ReadCurrentUser,
+    ReadCurrentUserWithPets,
+    ReadDbSession,
+)
+from app.core.http_cache import conditional
+from app.core.principal_cache import Principal
+from app.core.response_cache import pet_tag, response_cache, user_tag, vet_tag
+from app.core.serialization import dumper, json_response
+from app.crud.pet_daily_stats import pet_daily_stats_crud
 from app.crud.user import user_crud
-from app.models.user import User
 from app.models.vet_visit import VetVisit
 from app.schemas.pet import PetResponse
 from app.schemas.stats import (
@@ -26,37 +35,29 @@ from app.schemas.user import UserCreate, UserResponse, UserUpdate
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+_user_rows = dumper(UserResponse)
+_pet_rows = dumper(PetResponse)
+
+
+def _principal_tags(principal: Principal, visits: list[VetVisit]) -> list[str]:
+    """Cache tags for a response built from the principal's pets and these visits."""
+    return [
+        user_tag(principal.user_id),
+        *(pet_tag(pid) for pid in principal.pet_ids),
+        *(vet_tag(v.vet_id) for v in visits if v.vet_id is not None),
+    ]
+
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_profile(current_user: CurrentUser) -> UserResponse:
+async def get_current_user_profile(current_user: ReadCurrentUser) -> UserResponse:
     """Get the authenticated user's profile. Requires Bearer token. Alias for GET /auth/me."""
     return current_user
 
 
-async def _pet_profile_photo_url(db: DbSession, pet_id: int) -> str | None:
-    """Return API URL for the pet's profile picture (same-origin, works like medical records)."""
-    result = await db.execute(
-        select(MediaFile)
-        .where(MediaFile.pet_id == pet_id, MediaFile.file_type == "image")
-        .order_by(MediaFile.id.desc())
-        .limit(1)
-    )
-    media = result.scalar_one_or_none()
-    if not media:
-        return None
-    base = get_settings().api_base_url.rstrip("/")
-    return f"{base}/api/v1/pets/{pet_id}/profile-picture"
-
-
 @router.get("/me/pets", response_model=list[PetResponse])
-async def list_my_pets(db: DbSession, current_user: CurrentUser) -> list[PetResponse]:
+async def list_my_pets(db: ReadDbSession, current_user: ReadCurrentUserWithPets) -> Response:
     """List all pets for the authenticated user. Requires Bearer token. Includes profile_photo_url."""
-    out = []
-    for pet in current_user.linked_pets:
-        data = PetResponse.model_validate(pet).model_dump()
-        data["profile_photo_url"] = await _pet_profile_photo_url(db, pet.id)
-        out.append(data)
-    return out
+    return json_response(await pet_responses(db, current_user.linked_pets))
 
 
 @router.patch("/me", response_model=UserResponse)
@@ -71,117 +72,130 @@ async def update_me(db: DbSession, current_user: CurrentUser, body: UserUpdate)
 
 @router.get("/me/upcoming-events", response_model=UpcomingEventsResponse)
 async def list_my_upcoming_events(
-    db: DbSession,
-    current_user: CurrentUser,
+    db: PrimaryReadDbSession,
+    request: Request,
+    principal: CurrentPrincipal,
     limit: int = Query(50, ge=1, le=100),
-) -> UpcomingEventsResponse:
-    """Upcoming vet visits for all of the current user's pets (visit_date >= today). Ordered by date ascending."""
-    pet_ids = [p.id for p in current_user.linked_pets]
+) -> UpcomingEventsResponse | Response:
+    """
+    Upcoming vet visits for all of the current user's pets (visit_date >= today). Ordered by date ascending.
+    Served from the response cache until the next write to these pets, their visits or vets;
+    If-None-Match with the body's ETag gets a 304.
+    """
+    pet_ids = list(principal.pet_ids)
     if not pet_ids:
         return UpcomingEventsResponse(events=[])
     today = date.today()
-    result = await db.execute(
-        select(VetVisit)
-        .options(selectinload(VetVisit.pet), selectinload(VetVisit.vet))
-        .where(VetVisit.pet_id.in_(pet_ids), VetVisit.visit_date >= today)
-        .order_by(VetVisit.visit_date.asc())
-        .limit(limit)
-    )
-    visits = list(result.scalars().unique().all())
-    events = [
-        UpcomingEventItem(
-            visit_id=v.id,
-            pet_id=v.pet_id,
-            pet_name=v.pet.name,
-            visit_date=v.visit_date,
-            visit_reason=v.visit_reason,
-            vet_name=v.vet.name if v.vet else None,
-            vet_clinic=v.vet.clinic_name if v.vet else None,
+
+    async def build() -> tuple[UpcomingEventsResponse, list[str]]:
+        result = await db.execute(
+            select(VetVisit)
+            .options(selectinload(VetVisit.pet), selectinload(VetVisit.vet))
+            .where(VetVisit.pet_id.in_(pet_ids), VetVisit.visit_date >= today)
+            .order_by(VetVisit.visit_date.asc())
+            .limit(limit)
         )
-        for v in visits
-    ]
-    return UpcomingEventsResponse(events=events)
+        visits = list(result.scalars().unique().all())
+        events = [
+            UpcomingEventItem(
+                visit_id=v.id,
+                pet_id=v.pet_id,
+                pet_name=v.pet.name,
+                visit_date=v.visit_date,
+                visit_reason=v.visit_reason,
+                vet_name=v.vet.name if v.vet else None,
+                vet_clinic=v.vet.clinic_name if v.vet else None,
+            )
+            for v in visits
+        ]
+        return UpcomingEventsResponse(events=events), _principal_tags(principal, visits)
+
+    cached = await response_cache.get_or_build("user_upcoming_events", f"{principal.user_id}:{today}:{limit}", build)
+    return conditional(request, cached)
 
 
 @router.get("/me/calendar/events", response_model=CalendarEventsResponse)
 async def list_my_calendar_events(
-    db: DbSession,
-    current_user: CurrentUser,
+    db: PrimaryReadDbSession,
+    request: Request,
+    principal: CurrentPrincipal,
     start: date = Query(..., description="Start date (YYYY-MM-DD)"),
     end: date = Query(..., description="End date (YYYY-MM-DD)"),
     include_activity: bool = Query(True, description="Include daily sleep/meals per pet"),
-) -> CalendarEventsResponse:
-    """Vet visits and optional daily activity for all of the current user's pets in the date range."""
-    pet_ids = [p.id for p in current_user.linked_pets]
+) -> CalendarEventsResponse | Response:
+    """
+    Vet visits and optional daily activity for all of the current user's pets in the date range.
+    Served from the response cache until the next write to these pets, their logs, visits or vets;
+    If-None-Match with the body's ETag gets a 304.
+    """
+    pet_ids = list(principal.pet_ids)
     if not pet_ids:
         return CalendarEventsResponse(vet_visits=[], daily_stats=[])
     if start > end:
         raise HTTPException(status_code=400, detail="start must be <= end")
-    # Vet visits in range for any of user's pets
-    result = await db.execute(
-        select(VetVisit)
-        .options(selectinload(VetVisit.pet), selectinload(VetVisit.vet))
-        .where(VetVisit.pet_id.in_(pet_ids), VetVisit.visit_date >= start, VetVisit.visit_date <= end)
-        .order_by(VetVisit.visit_date.asc())
-    )
-    visits = list(result.scalars().unique().all())
-    vet_visits = [
-        UpcomingEventItem(
-            visit_id=v.id,
-            pet_id=v.pet_id,
-            pet_name=v.pet.name,
-            visit_date=v.visit_date,
-            visit_reason=v.visit_reason,
-            vet_name=v.vet.name if v.vet else None,
-            vet_clinic=v.vet.clinic_name if v.vet else None,
+
+    async def build() -> tuple[CalendarEventsResponse, list[str]]:
+        # Vet visits in range for any of user's pets
+        result = await db.execute(
+            select(VetVisit)
+            .options(selectinload(VetVisit.pet), selectinload(VetVisit.vet))
+            .where(VetVisit.pet_id.in_(pet_ids), VetVisit.visit_date >= start, VetVisit.visit_date <= end)
+            .order_by(VetVisit.visit_date.asc())
         )
-        for v in visits
-    ]
-    daily_stats: list[CalendarDayStats] = []
-    if include_activity:
-        tz = timezone.utc
-        since_dt = datetime(start.year, start.month, start.day, tzinfo=tz)
-        until_dt = datetime(end.year, end.month, end.day, 23, 59, 59, 999999, tzinfo=tz)
-        by_pet_date: dict[tuple[int, date], tuple[int, int]] = {}
-        for pid in pet_ids:
-            d = start
-            while d <= end:
-                by_pet_date[(pid, d)] = (0, 0)
-                d += timedelta(days=1)
-        for pid in pet_ids:
-            sleep_logs = await sleep_log_crud.get_multi(db, pet_id=pid, since=since_dt, until=until_dt, limit=1000)
-            eating_logs = await eating_log_crud.get_multi(db, pet_id=pid, since=since_dt, until=until_dt, limit=1000)
-            for log in sleep_logs:
-                d = log.started_at.date() if hasattr(log.started_at, "date") else log.started_at
-                key = (pid, d)
-                if key in by_pet_date:
-                    mins = log.duration_minutes or 0
-                    by_pet_date[key] = (by_pet_date[key][0] + mins, by_pet_date[key][1])
-            for log in eating_logs:
-                d = log.occurred_at.date() if hasattr(log.occurred_at, "date") else log.occurred_at
-                key = (pid, d)
-                if key in by_pet_date:
-                    by_pet_date[key] = (by_pet_date[key][0], by_pet_date[key][1] + 1)
-        daily_stats = [
-            CalendarDayStats(pet_id=pid, day=d, sleep_minutes=sleep, meals_count=meals)
-            for (pid, d), (sleep, meals) in sorted(by_pet_date.items(), key=lambda x: (x[0][0], x[0][1]))
+        visits = list(result.scalars().unique().all())
+        vet_visits = [
+            UpcomingEventItem(
+                visit_id=v.id,
+                pet_id=v.pet_id,
+                pet_name=v.pet.name,
+                visit_date=v.visit_date,
+                visit_reason=v.visit_reason,
+                vet_name=v.vet.name if v.vet else None,
+                vet_clinic=v.vet.clinic_name if v.vet else None,
+            )
+            for v in visits
         ]
-    return CalendarEventsResponse(vet_visits=vet_visits, daily_stats=daily_stats)
+        daily_stats: list[CalendarDayStats] = []
+        if include_activity:
+            rows = await pet_daily_stats_crud.get_range_for_pets(db, pet_ids=pet_ids, start=start, end=end)
+            by_pet_date = {(row.pet_id, row.day): row for row in rows}
+            for pid in sorted(pet_ids):
+                d = start
+                while d <= end:
+                    row = by_pet_date.get((pid, d))
+                    daily_stats.append(
+                        CalendarDayStats(
+                            pet_id=pid,
+                            day=d,
+                            sleep_minutes=row.sleep_minutes,
+                            meals_count=row.meals_count,
+                            active_minutes=row.active_minutes,
+                        )
+                        if row
+                        else CalendarDayStats(pet_id=pid, day=d)
+                    )
+                    d += timedelta(days=1)
+        return CalendarEventsResponse(vet_visits=vet_visits, daily_stats=daily_stats), _principal_tags(principal, visits)
+
+    cached = await response_cache.get_or_build(
+        "user_calendar_events", f"{principal.user_id}:{start}:{end}:{int(include_activity)}", build
+    )
+    return conditional(request, cached)
 
 
 @router.get("", response_model=list[UserResponse])
 async def list_users(
-    db: DbSession,
+    db: ReadDbSession,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
-) -> list[UserResponse]:
+) -> Response:
     """List users with pagination."""
     users = await user_crud.get_multi(db, skip=skip, limit=limit)
-    return list(users)
+    return json_response(_user_rows(users))
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(db: DbSession, user_id: int) -> UserResponse:
+async def get_user(db: ReadDbSession, user_id: int) -> UserResponse:
     """Get a user by id."""
     user = await user_crud.get(db, id=user_id)
     if not user:
@@ -220,9 +234,9 @@ async def delete_user(db: DbSession, user_id: int) -> None:
 
 
 @router.get("/{user_id}/pets", response_model=list[PetResponse])
-async def list_user_pets(db: DbSession, user_id: int) -> list[PetResponse]:
+async def list_user_pets(db: ReadDbSession, user_id: int) -> Response:
     """List all pets linked to this user (owned + shared via QR/link). A user can have 0 or more pets."""
-    user = await db.get(User, user_id)
+    user = await user_crud.get(db, id=user_id, profile="linked_pets")
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return list(user.linked_pets)
+    return json_response(_pet_rows(user.linked_pets))
@@ -2,17 +2,24 @@
 
 from datetime import date
 
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi.responses import Response
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
-from app.core.dependencies import DbSession
-from app.crud.pet import pet_crud
+from app.core.dependencies import DbSession, ExistingPetId, ReadDbSession, ReadExistingPetId
+from app.core.downloads import stored_file_response
+from app.core.http_cache import IMMUTABLE, etag_matches, make_etag, not_modified
+from app.core.pagination import CURSOR_QUERY, decode_cursor, paginated
+from app.core.serialization import dumper, json_response, row
+from app.core.uploads import multipart_file_body, receive_upload
+from app.core.response_cache import pet_tag, response_cache, vet_tag
 from app.models.media_file import MediaFile
 from app.models.vet import Vet
 from app.models.vet_visit import VetVisit
 from app.schemas.medical_record import MedicalRecordResponse
+from app.schemas.pagination import CursorPage
 from app.schemas.vet import VetCreate, VetResponse, VetUpdate
 from app.schemas.vet_visit import VetVisitCreate, VetVisitResponse, VetVisitUpdate
 from app.services.storage import get_storage
@@ -39,6 +46,15 @@ def _medical_record_file_url(pet_id: int, record_id: int) -> str:
     return f"{base}{prefix}/pets/{pet_id}/veterinary/medical-records/{record_id}/file"
 
 
+def _medical_record(pet_id: int, media: MediaFile) -> dict:
+    """MedicalRecordResponse data for a document MediaFile."""
+    return row(MedicalRecordResponse, media, url=_medical_record_file_url(pet_id, media.id))
+
+
+_vet_rows = dumper(VetResponse)
+_vet_visit_rows = dumper(VetVisitResponse)
+
+
 def _extension_for_mime(mime_type: str) -> str:
     """Return a safe file extension for Content-Disposition."""
     m = (mime_type or "").strip().lower()
@@ -60,34 +76,28 @@ def _extension_for_mime(mime_type: str) -> str:
 
 @router.get("/vets", response_model=list[VetResponse])
 async def list_vets(
-    db: DbSession,
-    pet_id: int,
+    db: ReadDbSession,
+    pet_id: ReadExistingPetId,
     owner_id: int | None = Query(None, description="Filter by owner (user) id"),
     skip: int = 0,
     limit: int = 100,
-) -> list[VetResponse]:
+) -> Response:
     """List vets. Optionally filter by owner_id (vets added by that user)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     q = select(Vet)
     if owner_id is not None:
         q = q.where(Vet.owner_id == owner_id)
     q = q.offset(skip).limit(limit)
     result = await db.execute(q)
-    return list(result.scalars().all())
+    return json_response(_vet_rows(result.scalars().all()))
 
 
 @router.post("/vets", response_model=VetResponse, status_code=201)
 async def create_vet(
     db: DbSession,
-    pet_id: int,
+    pet_id: ExistingPetId,
     body: VetCreate,
 ) -> VetResponse:
     """Add a vet (veterinarian or clinic)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     vet = Vet(
         name=body.name,
         clinic_name=body.clinic_name,
@@ -97,16 +107,12 @@ async def create_vet(
     )
     db.add(vet)
     await db.flush()
-    await db.refresh(vet)
     return vet
 
 
 @router.get("/vets/{vet_id}", response_model=VetResponse)
-async def get_vet(db: DbSession, pet_id: int, vet_id: int) -> VetResponse:
+async def get_vet(db: ReadDbSession, pet_id: ReadExistingPetId, vet_id: int) -> VetResponse:
     """Get a vet by id."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     vet = await db.get(Vet, vet_id)
     if not vet:
         raise HTTPException(status_code=404, detail="Vet not found")
@@ -114,11 +120,8 @@ async def get_vet(db: DbSession, pet_id: int, vet_id: int) -> VetResponse:
 
 
 @router.patch("/vets/{vet_id}", response_model=VetResponse)
-async def update_vet(db: DbSession, pet_id: int, vet_id: int, body: VetUpdate) -> VetResponse:
+async def update_vet(db: DbSession, pet_id: ExistingPetId, vet_id: int, body: VetUpdate) -> VetResponse:
     """Update a vet."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     vet = await db.get(Vet, vet_id)
     if not vet:
         raise HTTPException(status_code=404, detail="Vet not found")
@@ -126,53 +129,51 @@ async def update_vet(db: DbSession, pet_id: int, vet_id: int, body: VetUpdate) -
     for field, value in data.items():
         setattr(vet, field, value)
     await db.flush()
-    await db.refresh(vet)
+    await response_cache.invalidate(db, vet_tag(vet_id))
     return vet
 
 
 @router.delete("/vets/{vet_id}", status_code=204)
-async def delete_vet(db: DbSession, pet_id: int, vet_id: int) -> None:
+async def delete_vet(db: DbSession, pet_id: ExistingPetId, vet_id: int) -> None:
     """Delete a vet. Vet visits that referenced this vet will have vet_id set to NULL."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     vet = await db.get(Vet, vet_id)
     if not vet:
         raise HTTPException(status_code=404, detail="Vet not found")
     await db.delete(vet)
     await db.flush()
+    await response_cache.invalidate(db, vet_tag(vet_id))
 
 
 # --- Vet visits ---
 
 
-@router.get("/visits", response_model=list[VetVisitResponse])
+@router.get("/visits", response_model=list[VetVisitResponse] | CursorPage[VetVisitResponse])
 async def list_vet_visits(
-    db: DbSession,
-    pet_id: int,
+    db: ReadDbSession,
+    pet_id: ReadExistingPetId,
     skip: int = 0,
     limit: int = 100,
-) -> list[VetVisitResponse]:
+    cursor: str | None = CURSOR_QUERY,
+) -> Response:
     """List vet visit history for this pet. Ordered by visit_date descending."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
-    result = await db.execute(
-        select(VetVisit).where(VetVisit.pet_id == pet_id).order_by(VetVisit.visit_date.desc()).offset(skip).limit(limit)
+    q = select(VetVisit).where(VetVisit.pet_id == pet_id)
+    after = decode_cursor(cursor)
+    if after is not None:
+        q = q.where(tuple_(VetVisit.visit_date, VetVisit.id) < tuple_(*after))
+    q = q.order_by(VetVisit.visit_date.desc(), VetVisit.id.desc()).offset(skip if cursor is None else 0).limit(limit)
+    result = await db.execute(q)
+    return json_response(
+        paginated(result.scalars().all(), cursor=cursor, limit=limit, key_attr="visit_date", dump=_vet_visit_rows)
     )
-    return list(result.scalars().all())
 
 
 @router.get("/visits/upcoming", response_model=list[VetVisitResponse])
 async def list_upcoming_visits(
-    db: DbSession,
-    pet_id: int,
+    db: ReadDbSession,
+    pet_id: ReadExistingPetId,
     limit: int = Query(20, ge=1, le=100),
-) -> list[VetVisitResponse]:
+) -> Response:
     """Upcoming vet visits for this pet (visit_date >= today). Ordered by visit_date ascending."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     today = date.today()
     result = await db.execute(
         select(VetVisit)
@@ -180,19 +181,16 @@ async def list_upcoming_visits(
         .order_by(VetVisit.visit_date.asc())
         .limit(limit)
     )
-    return list(result.scalars().all())
+    return json_response(_vet_visit_rows(result.scalars().all()))
 
 
 @router.post("/visits", response_model=VetVisitResponse, status_code=201)
 async def create_vet_visit(
     db: DbSession,
-    pet_id: int,
+    pet_id: ExistingPetId,
     body: VetVisitCreate,
 ) -> VetVisitResponse:
     """Add a vet visit (concerns, activity, visit reason, date)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     if body.vet_id is not None:
         vet = await db.get(Vet, body.vet_id)
         if not vet:
@@ -207,16 +205,13 @@ async def create_vet_visit(
     )
     db.add(visit)
     await db.flush()
-    await db.refresh(visit)
+    await response_cache.invalidate(db, pet_tag(pet_id))
     return visit
 
 
 @router.get("/visits/{visit_id}", response_model=VetVisitResponse)
-async def get_vet_visit(db: DbSession, pet_id: int, visit_id: int) -> VetVisitResponse:
+async def get_vet_visit(db: ReadDbSession, pet_id: ReadExistingPetId, visit_id: int) -> VetVisitResponse:
     """Get a vet visit by id."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     result = await db.execute(
         select(VetVisit).where(VetVisit.id == visit_id, VetVisit.pet_id == pet_id)
     )
@@ -229,14 +224,11 @@ async def get_vet_visit(db: DbSession, pet_id: int, visit_id: int) -> VetVisitRe
 @router.patch("/visits/{visit_id}", response_model=VetVisitResponse)
 async def update_vet_visit(
     db: DbSession,
-    pet_id: int,
+    pet_id: ExistingPetId,
     visit_id: int,
     body: VetVisitUpdate,
 ) -> VetVisitResponse:
     """Update a vet visit."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     result = await db.execute(
         select(VetVisit).where(VetVisit.id == visit_id, VetVisit.pet_id == pet_id)
     )
@@ -247,16 +239,13 @@ async def update_vet_visit(
     for field, value in data.items():
         setattr(visit, field, value)
     await db.flush()
-    await db.refresh(visit)
+    await response_cache.invalidate(db, pet_tag(pet_id))
     return visit
 
 
 @router.delete("/visits/{visit_id}", status_code=204)
-async def delete_vet_visit(db: DbSession, pet_id: int, visit_id: int) -> None:
+async def delete_vet_visit(db: DbSession, pet_id: ExistingPetId, visit_id: int) -> None:
     """Delete a vet visit. Linked medical records will have vet_visit_id set to NULL."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     result = await db.execute(
         select(VetVisit).where(VetVisit.id == visit_id, VetVisit.pet_id == pet_id)
     )
@@ -265,48 +254,44 @@ async def delete_vet_visit(db: DbSession, pet_id: int, visit_id: int) -> None:
         raise HTTPException(status_code=404, detail="Vet visit not found")
     await db.delete(visit)
     await db.flush()
+    await response_cache.invalidate(db, pet_tag(pet_id))
 
 
 # --- Medical records (docs) ---
 
 
-@router.get("/medical-records", response_model=list[MedicalRecordResponse])
+@router.get("/medical-records", response_model=list[MedicalRecordResponse] | CursorPage[MedicalRecordResponse])
 async def list_medical_records(
-    db: DbSession,
-    pet_id: int,
+    db: ReadDbSession,
+    pet_id: ReadExistingPetId,
     visit_id: int | None = Query(None, description="Filter by vet visit id"),
     skip: int = 0,
     limit: int = 50,
-) -> list[MedicalRecordResponse]:
+    cursor: str | None = CURSOR_QUERY,
+) -> Response:
     """List medical record PDFs for this pet. Optionally filter by vet visit. Ordered by newest first."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     q = select(MediaFile).where(MediaFile.pet_id == pet_id, MediaFile.file_type == "document")
     if visit_id is not None:
         q = q.where(MediaFile.vet_visit_id == visit_id)
-    q = q.order_by(MediaFile.created_at.desc()).offset(skip).limit(limit)
+    after = decode_cursor(cursor)
+    if after is not None:
+        q = q.where(tuple_(MediaFile.created_at, MediaFile.id) < tuple_(*after))
+    q = q.order_by(MediaFile.created_at.desc(), MediaFile.id.desc()).offset(skip if cursor is None else 0).limit(limit)
     result = await db.execute(q)
     items = result.scalars().all()
-    return [
-        MedicalRecordResponse(
-            id=m.id,
-            url=_medical_record_file_url(pet_id, m.id),
-            storage_key=m.storage_key,
-            file_size_bytes=m.file_size_bytes,
-            mime_type=m.mime_type,
-            created_at=m.created_at,
-        )
-        for m in items
-    ]
+    page = paginated(
+        items,
+        cursor=cursor,
+        limit=limit,
+        key_attr="created_at",
+        dump=lambda media_files: [_medical_record(pet_id, m) for m in media_files],
+    )
+    return json_response(page)
 
 
 @router.get("/medical-records/latest", response_model=MedicalRecordResponse)
-async def get_latest_medical_record(db: DbSession, pet_id: int) -> MedicalRecordResponse:
+async def get_latest_medical_record(db: ReadDbSession, pet_id: ReadExistingPetId) -> Response:
     """Get the most recently uploaded medical record (PDF) for this pet."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     result = await db.execute(
         select(MediaFile)
         .where(MediaFile.pet_id == pet_id, MediaFile.file_type == "document")
@@ -316,22 +301,12 @@ async def get_latest_medical_record(db: DbSession, pet_id: int) -> MedicalRecord
     media = result.scalar_one_or_none()
     if not media:
         raise HTTPException(status_code=404, detail="No medical records found for this pet")
-    return MedicalRecordResponse(
-        id=media.id,
-        url=_medical_record_file_url(pet_id, media.id),
-        storage_key=media.storage_key,
-        file_size_bytes=media.file_size_bytes,
-        mime_type=media.mime_type,
-        created_at=media.created_at,
-    )
+    return json_response(_medical_record(pet_id, media))
 
 
 @router.get("/medical-records/{record_id}", response_model=MedicalRecordResponse)
-async def get_medical_record(db: DbSession, pet_id: int, record_id: int) -> MedicalRecordResponse:
+async def get_medical_record(db: ReadDbSession, pet_id: ReadExistingPetId, record_id: int) -> Response:
     """Get a single medical record (PDF) by id."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     result = await db.execute(
         select(MediaFile).where(
             MediaFile.id == record_id,
@@ -342,22 +317,19 @@ async def get_medical_record(db: DbSession, pet_id: int, record_id: int) -> Medi
     media = result.scalar_one_or_none()
     if not media:
         raise HTTPException(status_code=404, detail="Medical record not found")
-    return MedicalRecordResponse(
-        id=media.id,
-        url=_medical_record_file_url(pet_id, media.id),
-        storage_key=media.storage_key,
-        file_size_bytes=media.file_size_bytes,
-        mime_type=media.mime_type,
-        created_at=media.created_at,
-    )
+    return json_response(_medical_record(pet_id, media))
 
 
 @router.get("/medical-records/{record_id}/file", response_class=Response)
-async def get_medical_record_file(db: DbSession, pet_id: int, record_id: int) -> Response:
-    """Serve the medical record file (PDF, DOC, DOCX, JPG, PNG)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
+async def get_medical_record_file(
+    db: ReadDbSession, request: Request, pet_id: ReadExistingPetId, record_id: int
+) -> Response:
+    """
+    Serve the medical record file (PDF, DOC, DOCX, JPG, PNG).
+    A record's storage key never changes, so the file is sent as immutable with an ETag derived
+    from the key; If-None-Match gets a 304 without reading storage. Range requests get 206 with
+    just the requested bytes.
+    """
     result = await db.execute(
         select(MediaFile).where(
             MediaFile.id == record_id,
@@ -368,54 +340,60 @@ async def get_medical_record_file(db: DbSession, pet_id: int, record_id: int) ->
     media = result.scalar_one_or_none()
     if not media:
         raise HTTPException(status_code=404, detail="Medical record not found")
+    etag = make_etag(media.storage_key)
+    if etag_matches(request, etag):
+        return not_modified(etag, IMMUTABLE)
+    ext = _extension_for_mime(media.mime_type)
+    filename = f"medical-record.{ext}"
     try:
-        storage = get_storage()
-        data = storage.read(media.storage_key)
+        return await stored_file_response(
+            request,
+            media.storage_key,
+            media_type=media.mime_type,
+            headers={
+                "Content-Disposition": f"inline; filename={filename}",
+                "ETag": etag,
+                "Cache-Control": IMMUTABLE,
+            },
+            size=media.file_size_bytes,
+        )
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Medical record file not found in storage") from None
-    ext = _extension_for_mime(media.mime_type)
-    filename = f"medical-record.{ext}"
-    return Response(
-        content=data,
-        media_type=media.mime_type,
-        headers={"Content-Disposition": f"inline; filename={filename}"},
-    )
 
 
-@router.post("/medical-records", response_model=MedicalRecordResponse, status_code=201)
+@router.post(
+    "/medical-records",
+    response_model=MedicalRecordResponse,
+    status_code=201,
+    openapi_extra=multipart_file_body("Medical record: PDF, DOC, DOCX, JPG, or PNG"),
+)
 async def upload_medical_record(
     db: DbSession,
-    pet_id: int,
-    file: UploadFile = File(..., description="Medical record: PDF, DOC, DOCX, JPG, or PNG"),
+    request: Request,
+    pet_id: ExistingPetId,
     owner_id: int = Query(1, description="Owner user id (from auth when available)"),
     vet_visit_id: int | None = Query(None, description="Optional: link this document to a vet visit"),
-) -> MedicalRecordResponse:
+) -> Response:
     """Upload a medical record (PDF, DOC, DOCX, JPG, PNG). Optionally link to a vet visit."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     if vet_visit_id is not None:
         result = await db.execute(
             select(VetVisit).where(VetVisit.id == vet_visit_id, VetVisit.pet_id == pet_id)
         )
         if result.scalar_one_or_none() is None:
             raise HTTPException(status_code=404, detail="Vet visit not found")
-    content_type = (file.content_type or "").strip().lower()
+    file = await receive_upload(request)
+    content_type = file.content_type
     if content_type not in ALLOWED_MEDICAL_RECORD_TYPES:
         raise HTTPException(
             status_code=400,
             detail="Allowed types: PDF, DOC, DOCX, JPG, PNG",
         )
-    body = await file.read()
-    if len(body) > MEDICAL_RECORD_MAX_SIZE:
-        raise HTTPException(
-            status_code=400,
-            detail=f"File too large. Max size is {MEDICAL_RECORD_MAX_SIZE // (1024*1024)} MB",
-        )
-    storage = get_storage()
-    default_name = f"medical-record.{_extension_for_mime(content_type)}"
-    key = storage.key_for("document", owner_id, file.filename or default_name)
-    storage.save(key, body, content_type)
+    stored = await file.save(
+        db,
+        get_storage(),
+        max_size=MEDICAL_RECORD_MAX_SIZE,
+        too_large=f"File too large. Max size is {MEDICAL_RECORD_MAX_SIZE // (1024*1024)} MB",
+    )
     settings = get_settings()
     media = MediaFile(
         owner_id=owner_id,
@@ -423,29 +401,31 @@ async def upload_medical_record(
         vet_visit_id=vet_visit_id,
         file_type="document",
         mime_type=content_type,
-        storage_key=key,
+        storage_key=stored.key,
         storage_backend=settings.storage_backend,
-        file_size_bytes=len(body),
+        file_size_bytes=stored.size,
+        content_sha256=stored.sha256,
     )
     db.add(media)
     await db.flush()
-    await db.refresh(media)
-    return MedicalRecordResponse(
-        id=media.id,
-        url=_medical_record_file_url(pet_id, media.id),
-        storage_key=media.storage_key,
-        file_size_bytes=media.file_size_bytes,
-        mime_type=media.mime_type,
-        created_at=media.created_at,
-    )
+    return json_response(_medical_record(pet_id, media), status_code=201)
+
+
+async def _delete_record(db: AsyncSession, media: MediaFile) -> None:
+    """Delete a record; a shared blob is left to the sweep, an own file is deleted now."""
+    await db.delete(media)
+    await db.flush()
+    if media.content_sha256 is not None:
+        return
+    try:
+        await get_storage().adelete(media.storage_key)
+    except Exception:
+        pass
 
 
 @router.delete("/medical-records/latest", status_code=204)
-async def delete_latest_medical_record(db: DbSession, pet_id: int) -> None:
+async def delete_latest_medical_record(db: DbSession, pet_id: ExistingPetId) -> None:
     """Delete the most recently uploaded medical record for this pet."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     result = await db.execute(
         select(MediaFile)
         .where(MediaFile.pet_id == pet_id, MediaFile.file_type == "document")
@@ -455,21 +435,12 @@ async def delete_latest_medical_record(db: DbSession, pet_id: int) -> None:
     media = result.scalar_one_or_none()
     if not media:
         raise HTTPException(status_code=404, detail="No medical records found for this pet")
-    try:
-        storage = get_storage()
-        storage.delete(media.storage_key)
-    except Exception:
-        pass
-    await db.delete(media)
-    await db.flush()
+    await _delete_record(db, media)
 
 
 @router.delete("/medical-records/{record_id}", status_code=204)
-async def delete_medical_record(db: DbSession, pet_id: int, record_id: int) -> None:
+async def delete_medical_record(db: DbSession, pet_id: ExistingPetId, record_id: int) -> None:
     """Delete a medical record (PDF)."""
-    pet = await pet_crud.get(db, id=pet_id)
-    if not pet:
-        raise HTTPException(status_code=404, detail="Pet not found")
     result = await db.execute(
         select(MediaFile).where(
             MediaFile.id == record_id,
@@ -480,10 +451,4 @@ async def delete_medical_record(db: DbSession, pet_id: int, record_id: int) -> N
     media = result.scalar_one_or_none()
     if not media:
         raise HTTPException(status_code=404, detail="Medical record not found")
-    try:
-        storage = get_storage()
-        storage.delete(media.storage_key)
-    except Exception:
-        pass
-    await db.delete(media)
-    await db.flush()
+    await _delete_record(db, media)
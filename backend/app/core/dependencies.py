@@ -7,9 +7,13 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.core.principal_cache import Principal, principal_cache
+from app.core.response_cache import response_cache
 from app.core.security import decode_access_token
+from app.crud.loading import UserProfile
+from app.crud.pet import pet_crud
 from app.crud.user import user_crud
-from app.db.session import async_session_maker
+from app.db.session import async_session_maker, engine, primary_read_session_maker, read_engine, read_session_maker
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
@@ -21,6 +25,8 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
             await session.commit()
+            principal_cache.invalidate_committed(session)
+            await response_cache.invalidate_committed(session)
         except Exception:
             await session.rollback()
             raise
@@ -28,8 +34,42 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency that yields a read-only async DB session for GET handlers.
+
+    Runs on the read replica when DATABASE_READ_URL is set (else the primary), in a READ ONLY
+    transaction (BEGIN READ ONLY, no extra round trip) that is rolled back rather than committed.
+    Like get_db, no connection is checked out until the first query.
+    Replicas may lag the primary slightly, so do not use it to read back a write from the same client
+    request flow that must be visible immediately.
+    """
+    async with read_session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
+
+
+async def get_primary_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Like get_read_db, but always on the primary. For handlers whose result goes into the response
+    cache: an entry built from a lagging replica could hold rows older than the invalidation that
+    followed their commit, and would be served until its TTL runs out.
+    """
+    async with primary_read_session_maker() as session:
+        try:
+            yield session
+        finally:
+            await session.rollback()
+            await session.close()
+
+
 # Type alias for route injection
 DbSession = Annotated[AsyncSession, Depends(get_db)]
+ReadDbSession = Annotated[AsyncSession, Depends(get_read_db)]
+PrimaryReadDbSession = Annotated[AsyncSession, Depends(get_primary_read_db)]
 
 
 async def get_current_user_optional(
@@ -50,46 +90,128 @@ async def get_current_user_optional(
     return user
 
 
-async def get_current_user(
-    db: DbSession,
-    token: Annotated[str | None, Depends(oauth2_scheme)] = None,
-) -> User:
-    """Return current user from JWT. Raises 401 if missing or invalid. Use for protected routes."""
-    if not token or not token.strip():
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Not authenticated",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    payload = decode_access_token(token.strip())
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+async def _load_principal(db: AsyncSession, token: str, *, cache: bool = True) -> Principal:
+    """Verify the token and build the caller's principal (the demo user's when configured), then cache it."""
+    payload = decode_access_token(token)
     if not payload or "sub" not in payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Invalid or expired token")
     try:
         user_id = int(payload["sub"])
     except (ValueError, TypeError):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    user = await user_crud.get(db, id=user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise _unauthorized("Invalid token")
+    row = await user_crud.get_with_pet_ids(db, id=user_id)
+    if row is None:
+        raise _unauthorized("User not found")
     demo_id = get_settings().demo_user_id
-    if demo_id is not None and user.id != demo_id:
-        demo_user = await user_crud.get(db, id=demo_id)
-        if demo_user:
-            return demo_user
+    if demo_id is not None and user_id != demo_id:
+        row = await user_crud.get_with_pet_ids(db, id=demo_id) or row
+    user, pet_ids = row
+    # The identity map only holds clean rows weakly: keep this one alive for the request so
+    # get_current_user on the same session finds it without another query
+    db.info["principal_user"] = user
+    principal = Principal(user_id=user.id, email=user.email, pet_ids=tuple(pet_ids))
+    if cache:
+        principal_cache.set(token, principal, token_user_id=user_id, exp=payload.get("exp"))
+    return principal
+
+
+async def get_current_principal(
+    db: DbSession,
+    token: Annotated[str | None, Depends(oauth2_scheme)] = None,
+) -> Principal:
+    """
+    Return the authenticated caller (user id, email, linked pet ids). Raises 401 if missing or invalid.
+    Served from the verified-token cache without touching the DB; a miss costs one query on the
+    primary (two in demo mode). Use for protected routes that do not need the User row itself.
+    """
+    if not token or not token.strip():
+        raise _unauthorized("Not authenticated")
+    token = token.strip()
+    return principal_cache.get(token) or await _load_principal(db, token)
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+
+async def get_current_principal_read(
+    db: ReadDbSession,
+    token: Annotated[str | None, Depends(oauth2_scheme)] = None,
+) -> Principal:
+    """
+    get_current_principal on the read-only session, so a miss costs no primary session. A
+    principal read from a replica is not cached: it may predate a write whose invalidation has
+    already run.
+    """
+    if not token or not token.strip():
+        raise _unauthorized("Not authenticated")
+    token = token.strip()
+    return principal_cache.get(token) or await _load_principal(db, token, cache=read_engine is engine)
+
+
+ReadCurrentPrincipal = Annotated[Principal, Depends(get_current_principal_read)]
+
+
+async def _principal_user(db: AsyncSession, principal: Principal, profile: UserProfile) -> User:
+    """Load the principal's User row (from the identity map when present) plus the profile's collections."""
+    user = await db.get(User, principal.user_id)
+    if user is None:
+        # Deleted since the principal was cached (e.g. through another worker)
+        principal_cache.invalidate_user(principal.user_id)
+        raise _unauthorized("User not found")
+    if profile == "linked_pets":
+        await user_crud.load_linked_pets(db, user=user)
     return user
 
 
+async def get_current_user(db: DbSession, principal: CurrentPrincipal) -> User:
+    """Return current user from JWT (columns only). Raises 401 if missing or invalid. Use for protected routes."""
+    return await _principal_user(db, principal, "lean")
+
+
+async def get_current_user_with_pets(db: DbSession, principal: CurrentPrincipal) -> User:
+    """Like get_current_user, but with linked_pets loaded. Use only where the Pet rows are needed."""
+    return await _principal_user(db, principal, "linked_pets")
+
+
+async def get_current_user_read(db: ReadDbSession, principal: ReadCurrentPrincipal) -> User:
+    """get_current_user on the read-only session, so GET handlers using ReadDbSession share one connection."""
+    return await _principal_user(db, principal, "lean")
+
+
+async def get_current_user_with_pets_read(db: ReadDbSession, principal: ReadCurrentPrincipal) -> User:
+    """get_current_user_with_pets on the read-only session."""
+    return await _principal_user(db, principal, "linked_pets")
+
+
+async def _require_pet(db: AsyncSession, pet_id: int) -> int:
+    """404 unless the pet exists (primary-key check, memoized per request)."""
+    if not await pet_crud.exists(db, pet_id):
+        raise HTTPException(status_code=404, detail="Pet not found")
+    return pet_id
+
+
+async def get_existing_pet_id(db: DbSession, pet_id: int) -> int:
+    """The {pet_id} path parameter, after checking the pet exists. Use on routes that only need the id."""
+    return await _require_pet(db, pet_id)
+
+
+async def get_existing_pet_id_read(db: ReadDbSession, pet_id: int) -> int:
+    """get_existing_pet_id on the read-only session."""
+    return await _require_pet(db, pet_id)
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUserWithPets = Annotated[User, Depends(get_current_user_with_pets)]
 CurrentUserOptional = Annotated[User | None, Depends(get_current_user_optional)]
+ReadCurrentUser = Annotated[User, Depends(get_current_user_read)]
+ReadCurrentUserWithPets = Annotated[User, Depends(get_current_user_with_pets_read)]
+ExistingPetId = Annotated[int, Depends(get_existing_pet_id)]
+ReadExistingPetId = Annotated[int, Depends(get_existing_pet_id_read)]
@@ -0,0 +1,78 @@
+"""Streaming file downloads with Range support (206 Partial Content), for media and medical records.
+
+Files the storage backend keeps on disk are served with FileResponse: it answers Range (including
+If-Range and multiple ranges) itself and hands the file to the server with http.response.pathsend
+where supported (zero-copy sendfile), otherwise reads it in chunks. Remote files (Spaces) are
+streamed from a GET of just the requested bytes, so seeking in a long video transfers only the
+range asked for, and memory per download stays at one chunk whatever the file size.
+"""
+
+from fastapi import HTTPException, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from app.services.storage import get_storage
+
+
+def requested_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    The (start, end) bytes, inclusive, that a single-range Range header asks for; None to send the
+    whole file (no header, or one this does not serve: other units, several ranges, malformed).
+    Raises 416 when the range starts past the end of the file.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    try:
+        if not sep or (not first and not last):
+            return None
+        if not first:  # suffix: the last N bytes
+            start, end = max(size - int(last), 0), size - 1
+            if int(last) == 0:
+                start = size
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    if start > end:
+        return None
+    return start, end
+
+
+async def stored_file_response(
+    request: Request,
+    key: str,
+    *,
+    media_type: str,
+    headers: dict[str, str],
+    size: int | None = None,
+) -> Response:
+    """
+    Response streaming the stored file under key, honouring Range (and If-Range against the ETag in
+    headers). size, when the caller knows it (e.g. media_files.file_size_bytes), saves a remote
+    size lookup. Raises FileNotFoundError if the file is missing.
+    """
+    storage = get_storage()
+    path = await storage.alocal_path(key)
+    if path is not None:
+        return FileResponse(path, media_type=media_type, headers=headers)
+    if size is None:
+        size = await storage.asize(key)
+    byte_range = None
+    if request.headers.get("if-range") in (None, headers.get("ETag")):
+        byte_range = requested_range(request.headers.get("range"), size)
+    headers = {**headers, "Accept-Ranges": "bytes"}
+    if byte_range is None:
+        chunks = await storage.aopen_stream(key)
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(chunks, media_type=media_type, headers=headers)
+    start, end = byte_range
+    chunks = await storage.aopen_stream(key, start=start, end=end)
+    headers["Content-Length"] = str(end - start + 1)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return StreamingResponse(chunks, status_code=206, media_type=media_type, headers=headers)
@@ -0,0 +1,24 @@
+"""Bounded thread pools for blocking calls made from async code."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """
+    A dedicated thread pool running at most `workers` calls at a time. Callers beyond that wait on
+    a semaphore in the event loop, where they can be cancelled, instead of queueing in the pool
+    (a cancelled await cannot take back a call the pool has queued).
+    """
+
+    def __init__(self, workers: int, name: str) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self._slots = asyncio.Semaphore(workers)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """fn(*args) on the pool, once a slot is free."""
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
@@ -0,0 +1,52 @@
+"""HTTP conditional request helpers: strong ETags, If-None-Match -> 304 and Cache-Control.
+
+ETags are derived from what determines the representation (a row's updated_at, a storage key,
+or the body itself), so a handler can answer 304 before loading the body. Content addressed by
+an immutable key (storage keys are unique per upload) is sent with IMMUTABLE; everything else
+with REVALIDATE, so clients keep a copy but check it with If-None-Match on every use.
+"""
+
+import hashlib
+
+from fastapi import Request
+from fastapi.responses import Response
+
+# One year, never revalidated: only for URLs whose content can never change
+IMMUTABLE = "private, max-age=31536000, immutable"
+# Cache, but revalidate each time (a matching ETag costs a 304 with no body)
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Strong ETag (quoted) for the given parts, e.g. (pet.id, pet.updated_at, media_id)."""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def body_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when If-None-Match lists etag (weak comparison, as RFC 9110 specifies) or is *."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(",")]
+    return "*" in tags or etag in (t.removeprefix("W/") for t in tags)
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """304 carrying the validators a 200 would have had."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def conditional(request: Request, response: Response, *, cache_control: str = REVALIDATE) -> Response:
+    """Tag a fully built response with its body's ETag; 304 instead when the client already has it."""
+    etag = body_etag(response.body)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
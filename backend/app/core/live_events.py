@@ -0,0 +1,165 @@
+"""Live pet events pushed to open dashboards (GET /pets/{pet_id}/events, Server-Sent Events).
+
+Log CRUD create methods call `publish(db, pet_id, event, data)`, which runs pg_notify on the
+write's own connection: PostgreSQL delivers the notification when that transaction commits (and
+drops it on rollback) to every worker LISTENing on the channel, so subscribers never see rows that
+were not committed. Each worker keeps one dedicated LISTEN connection, opened when its first
+subscriber connects, and fans notifications out to in-process subscriber queues. An idle dashboard
+costs no queries: it waits on its queue, and the worker waits on one socket for all of them.
+
+Events (SSE `event:` names): activity_state, sleep_log, eating_log carry the new row shaped like
+its *Response schema; logs_imported ({"log", "count", "since", "until"}) replaces per-row events
+for bulk ingestion. Rows too large for a notification (8000 bytes; long notes) are sent with
+null data, so the client reloads them from the list endpoint.
+
+A subscriber more than LIVE_EVENTS_QUEUE_SIZE events behind, or one whose worker lost its LISTEN
+connection, receives `resync` and is disconnected instead of being buffered without bound: the
+client reloads with the list endpoints, then subscribes again.
+"""
+
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.serialization import dumps
+from app.db.session import connect_listener
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "pet_events"
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+_MAX_PAYLOAD = 7999
+
+_NOTIFY_SQL = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS TEXT[])) AS payload")
+
+# Queued for a subscriber that must reload and reconnect
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+def _payload(pet_id: int, event: str, data: Any) -> str:
+    """'<pet_id> <event> <json>': the listener routes on the prefix without parsing the JSON."""
+    payload = f"{pet_id} {event} {dumps(data).decode()}"
+    if len(payload.encode()) > _MAX_PAYLOAD:
+        payload = f"{pet_id} {event} null"
+    return payload
+
+
+def imported_events(log: str, stamps: Iterable[tuple[int, Any]]) -> list[tuple[int, str, Any]]:
+    """One logs_imported event per pet for bulk-inserted rows, given as (pet_id, time) pairs."""
+    spans: dict[int, list] = {}
+    for pet_id, t in stamps:
+        span = spans.get(pet_id)
+        if span is None:
+            spans[pet_id] = [1, t, t]
+            continue
+        span[0] += 1
+        if t < span[1]:
+            span[1] = t
+        elif t > span[2]:
+            span[2] = t
+    return [
+        (pet_id, "logs_imported", {"log": log, "count": count, "since": since, "until": until})
+        for pet_id, (count, since, until) in sorted(spans.items())
+    ]
+
+
+class LiveEvents:
+    """Per-process fan-out of pet event notifications to subscriber queues."""
+
+    def __init__(self, connect: Callable[[], Awaitable[asyncpg.Connection]], *, queue_size: int) -> None:
+        self._connect = connect
+        self.queue_size = queue_size
+        self._subscribers: dict[int, set[asyncio.Queue[bytes]]] = defaultdict(set)
+        self._conn: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+
+    async def publish(self, db: AsyncSession, pet_id: int, event: str, data: Any) -> None:
+        """Notify subscribers of pet_id once db's transaction commits."""
+        await self.publish_many(db, [(pet_id, event, data)])
+
+    async def publish_many(self, db: AsyncSession, events: Iterable[tuple[int, str, Any]]) -> None:
+        """Several (pet_id, event, data) notifications in one statement."""
+        payloads = [_payload(pet_id, event, data) for pet_id, event, data in events]
+        if payloads:
+            await db.execute(_NOTIFY_SQL, {"channel": CHANNEL, "payloads": payloads})
+
+    @asynccontextmanager
+    async def subscribe(self, pet_id: int) -> AsyncIterator[asyncio.Queue[bytes]]:
+        """Queue receiving pet_id's events as SSE frames, until the context exits."""
+        await self.listen()
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[pet_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._unsubscribe(pet_id, queue)
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def close(self) -> None:
+        """Close the LISTEN connection; current subscribers get resync."""
+        async with self._lock:
+            conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+        self._resync_all()
+
+    async def listen(self) -> None:
+        """Open this worker's LISTEN connection unless it is open already."""
+        async with self._lock:
+            if self._conn is not None and not self._conn.is_closed():
+                return
+            conn = await self._connect()
+            conn.add_termination_listener(self._on_terminate)
+            await conn.add_listener(CHANNEL, self._on_notify)
+            self._conn = conn
+
+    def _on_notify(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        pet_id, event, data = payload.split(" ", 2)
+        queues = self._subscribers.get(int(pet_id))
+        if not queues:
+            return
+        frame = f"event: {event}\ndata: {data}\n\n".encode()
+        for queue in list(queues):
+            try:
+                queue.put_nowait(frame)
+            except asyncio.QueueFull:
+                self._unsubscribe(int(pet_id), queue)
+                self._resync(queue)
+
+    def _on_terminate(self, conn: asyncpg.Connection) -> None:
+        logger.warning("Live events LISTEN connection lost; subscribers must resync")
+        if self._conn is conn:
+            self._conn = None
+        self._resync_all()
+
+    def _resync_all(self) -> None:
+        subscribers, self._subscribers = self._subscribers, defaultdict(set)
+        for queues in subscribers.values():
+            for queue in queues:
+                self._resync(queue)
+
+    @staticmethod
+    def _resync(queue: asyncio.Queue[bytes]) -> None:
+        """Make room for RESYNC if needed; the stream ends after sending it."""
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(RESYNC)
+
+    def _unsubscribe(self, pet_id: int, queue: asyncio.Queue[bytes]) -> None:
+        queues = self._subscribers.get(pet_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[pet_id]
+
+
+live_events = LiveEvents(connect_listener, queue_size=get_settings().live_events_queue_size)
@@ -0,0 +1,72 @@
+"""Keyset (cursor) pagination helpers.
+
+A cursor is an opaque URL-safe token for the sort key and id of the last row on a page, e.g.
+(created_at, id). The next page is `WHERE (sort_key, id) < (:key, :id) ORDER BY sort_key DESC,
+id DESC LIMIT n`, served by a matching composite index, so deep pages cost the same as the first
+and rows inserted meanwhile do not shift the page boundaries.
+"""
+
+import base64
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Sequence, TypeVar
+
+from fastapi import HTTPException, Query
+
+CursorKey = tuple[datetime | date, int]
+
+T = TypeVar("T")
+
+CURSOR_QUERY = Query(
+    None,
+    description="Keyset pagination: pass an empty value for the first page, then each page's next_cursor. "
+    "When set, the response is {items, next_cursor} and skip is ignored.",
+)
+
+
+def encode_cursor(key: datetime | date, id: int) -> str:
+    """Encode (sort key, id) as an opaque cursor token."""
+    raw = f"{key.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> CursorKey | None:
+    """Decode a cursor token; None when absent or empty (first page). Raises HTTPException 400 if malformed."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        key, id_str = raw.rsplit("|", 1)
+        # Date-only keys (e.g. visit_date) are encoded as YYYY-MM-DD
+        parsed: datetime | date = date.fromisoformat(key) if len(key) == 10 else datetime.fromisoformat(key)
+        if isinstance(parsed, datetime) and parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed, int(id_str)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def next_cursor(items: Sequence[Any], limit: int, key_attr: str) -> str | None:
+    """Cursor for the page after `items`, or None when the page was not full (no more rows)."""
+    if len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(getattr(last, key_attr), last.id)
+
+
+def paginated(
+    items: Sequence[T],
+    *,
+    cursor: str | None,
+    limit: int,
+    key_attr: str,
+    dump: Callable[[Sequence[T]], list] = list,
+) -> list | dict[str, Any]:
+    """
+    Response body for a list endpoint: the plain list (offset pagination, unchanged for existing
+    clients) unless the request used cursor pagination, then {items, next_cursor} (see CursorPage).
+    dump turns the items into the listed values (e.g. serialization.dumper(schema)); the cursor is
+    always taken from the original items.
+    """
+    if cursor is None:
+        return dump(items)
+    return {"items": dump(items), "next_cursor": next_cursor(items, limit, key_attr)}
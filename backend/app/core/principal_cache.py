@@ -0,0 +1,110 @@
+"""In-process cache of verified bearer tokens -> authenticated principal.
+
+A hit skips both JWT verification and the user lookup, so identifying the caller costs no DB
+query. Entries expire at the token's own `exp` or after AUTH_CACHE_TTL_SECONDS, whichever comes
+first, and the cache holds at most AUTH_CACHE_MAX_ENTRIES tokens (least recently used evicted).
+
+Writes that change a principal (user update/delete, pet linked or deleted) invalidate the affected
+entries in this process right away, and get_db invalidates them again after its commit, so a
+principal rebuilt from the old committed rows in between is dropped too. Other workers keep their
+entry until the TTL runs out, which bounds how stale a principal can get there.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+
+# (kind, id) invalidated by a session's writes; invalidated again once they are committed
+_PENDING = "principal_cache_pending"
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    """The authenticated caller: whose data the request acts on (the demo user when DEMO_USER_ID is set)."""
+
+    user_id: int
+    email: str
+    pet_ids: tuple[int, ...]
+
+
+@dataclass(slots=True)
+class _Entry:
+    principal: Principal
+    token_user_id: int  # token subject; differs from principal.user_id in demo mode
+    expires_at: float
+
+
+class PrincipalCache:
+    """Bounded TTL/LRU map of token -> Principal."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    def get(self, token: str) -> Principal | None:
+        """Cached principal for token, or None (missing or expired)."""
+        entry = self._entries.get(token)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.time():
+            del self._entries[token]
+            return None
+        self._entries.move_to_end(token)
+        return entry.principal
+
+    def set(self, token: str, principal: Principal, *, token_user_id: int, exp: float | None) -> None:
+        """Cache principal for a verified token until min(exp, now + ttl)."""
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        if exp is not None:
+            expires_at = min(expires_at, exp)
+        self._entries[token] = _Entry(principal, token_user_id, expires_at)
+        self._entries.move_to_end(token)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int, db: AsyncSession | None = None) -> None:
+        """Drop every entry that resolves to, or was issued for, user_id (again after db commits)."""
+        self._remember(db, "user", user_id)
+        self._drop(lambda e: e.principal.user_id == user_id or e.token_user_id == user_id)
+
+    def invalidate_pet(self, pet_id: int, db: AsyncSession | None = None) -> None:
+        """Drop every entry whose principal has pet_id linked (again after db commits)."""
+        self._remember(db, "pet", pet_id)
+        self._drop(lambda e: pet_id in e.principal.pet_ids)
+
+    def invalidate_committed(self, db: AsyncSession) -> None:
+        """Repeat the invalidations recorded on db; call right after its commit."""
+        for kind, id_ in db.info.pop(_PENDING, ()):
+            if kind == "user":
+                self.invalidate_user(id_)
+            else:
+                self.invalidate_pet(id_)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    @staticmethod
+    def _remember(db: AsyncSession | None, kind: str, id_: int) -> None:
+        if db is not None:
+            db.info.setdefault(_PENDING, set()).add((kind, id_))
+
+    def _drop(self, match) -> None:
+        for token in [t for t, e in self._entries.items() if match(e)]:
+            del self._entries[token]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_settings = get_settings()
+principal_cache = PrincipalCache(
+    max_entries=_settings.auth_cache_max_entries,
+    ttl_seconds=_settings.auth_cache_ttl_seconds,
+)
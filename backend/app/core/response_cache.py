@@ -0,0 +1,351 @@
+"""Response cache for the dashboard stats and calendar endpoints.
+
+Entries hold the serialized JSON body, keyed by endpoint, pet/user and query parameters, so a hit
+returns the stored bytes without a DB query or any model validation. Every entry carries tags
+(`pet:{id}`, `user:{id}`, `vet:{id}`) naming the rows it was built from; writes invalidate by tag:
+
+- log writes (through the daily stats rollup), vet visit and pet writes -> pet:{id}
+- vet update/delete -> vet:{id}
+- linking a pet to a user -> user:{id}
+
+Writes call `invalidate(db, ...)` right away, which keeps requests sharing the session consistent.
+get_db repeats the invalidation after its commit, so an entry rebuilt from the old committed rows
+in between is dropped too. Every invalidation also advances a generation counter: a miss notes the
+generation before building, and the entry is not stored if any of its tags was invalidated since,
+so a build that read the old rows cannot store them after the post-commit invalidation. Builders
+read on the primary (PrimaryReadDbSession), as a lagging replica could still return rows older than
+that invalidation.
+
+Backends (RESPONSE_CACHE_BACKEND): "memory" is a per-process LRU; "redis" shares entries between
+workers through any server speaking the Redis protocol; "off" disables caching. With the memory
+backend, writes made in another process are only picked up after RESPONSE_CACHE_TTL_SECONDS.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterable, Protocol
+
+from fastapi.responses import Response
+from pydantic import BaseModel
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError, WatchError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Tags invalidated by this session's writes; invalidated again once they are committed
+_PENDING = "response_cache_pending"
+
+# How long a tag's invalidation generation is kept in Redis; far longer than any build takes
+_VERSION_TTL = 3600
+
+Builder = Callable[[], Awaitable[tuple[BaseModel, Iterable[str]]]]
+
+
+class CacheBackend(Protocol):
+    """Storage for cached bodies with tag-based invalidation."""
+
+    name: str
+
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def generation(self) -> int: ...
+
+    async def set(self, key: str, value: bytes, *, tags: Iterable[str], ttl: int, since: int) -> None:
+        """Store value unless one of tags was invalidated after generation `since`."""
+        ...
+
+    async def invalidate(self, tags: Iterable[str]) -> None: ...
+
+    async def clear(self) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: bytes
+    tags: tuple[str, ...]
+    expires_at: float
+
+
+class MemoryBackend:
+    """Per-process LRU of at most max_entries bodies, with a tag -> keys index."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = defaultdict(set)
+        self._generation = 0
+        # tag -> generation of its last invalidation, for the max_entries most recent tags; tags
+        # forgotten from it count as invalidated at _floor
+        self._invalidated_at: OrderedDict[str, int] = OrderedDict()
+        self._floor = 0
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def set(self, key: str, value: bytes, *, tags: Iterable[str], ttl: int, since: int) -> None:
+        tags = tuple(tags)
+        if self.max_entries <= 0 or any(self._invalidated_at.get(t, self._floor) > since for t in tags):
+            return
+        self._remove(key)
+        self._entries[key] = _Entry(value, tags, time.monotonic() + ttl)
+        for tag in tags:
+            self._keys_by_tag[tag].add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        self._generation += 1
+        for tag in tags:
+            self._invalidated_at[tag] = self._generation
+            self._invalidated_at.move_to_end(tag)
+            for key in self._keys_by_tag.pop(tag, ()):
+                self._remove(key)
+        while len(self._invalidated_at) > self.max_entries:
+            self._floor = self._invalidated_at.popitem(last=False)[1]
+
+    async def clear(self) -> None:
+        self._generation += 1
+        self._floor = self._generation
+        self._invalidated_at.clear()
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    async def close(self) -> None:
+        pass
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Shared cache on a Redis-protocol server (Redis, Valkey, KeyDB, ...) through redis.asyncio's
+    connection pool; each operation is a single pipelined round trip on one pooled connection.
+
+    Bodies live at `{prefix}k:{key}` with a TTL; each tag is a set `{prefix}t:{tag}` of the keys
+    built from it. Invalidation deletes the tag sets' members and the sets.
+
+    The generation is the counter `{prefix}gen`; invalidating a tag records the new value at
+    `{prefix}v:{tag}` (clear at `{prefix}floor`), and set() stores in a WATCH/MULTI transaction on
+    those keys so an invalidation landing between the check and the write still wins.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, *, prefix: str = "respcache:", timeout: float = 1.0) -> None:
+        self.prefix = prefix
+        # A command interrupted mid-reply (timeout, cancellation) disconnects its connection, so
+        # unread replies are never handed to the next command. RESP2 (no HELLO) works with every
+        # Redis-protocol server.
+        self._client = aioredis.Redis.from_url(
+            url, protocol=2, socket_timeout=timeout, socket_connect_timeout=timeout
+        )
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(self._key(key))
+
+    async def generation(self) -> int:
+        return int(await self._client.get(self._gen_key) or 0)
+
+    async def set(self, key: str, value: bytes, *, tags: Iterable[str], ttl: int, since: int) -> None:
+        tags = tuple(tags)
+        guards = [self._floor_key, *(self._version(tag) for tag in tags)]
+        async with self._client.pipeline(transaction=True) as pipe:
+            await pipe.watch(*guards)
+            if any(int(v or 0) > since for v in await pipe.mget(guards)):
+                return
+            pipe.multi()
+            pipe.set(self._key(key), value, ex=ttl)
+            for tag in tags:
+                pipe.sadd(self._tag(tag), self._key(key))
+                # A tag set outlives its newest member; stale members are harmless (DEL of a missing key)
+                pipe.expire(self._tag(tag), ttl)
+            try:
+                await pipe.execute()
+            except WatchError:
+                pass  # invalidated while storing: drop the entry
+
+    async def invalidate(self, tags: Iterable[str]) -> None:
+        tags = tuple(tags)
+        if not tags:
+            return
+        generation = await self._client.incr(self._gen_key)
+        async with self._client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.set(self._version(tag), generation, ex=_VERSION_TTL)
+            for tag in tags:
+                pipe.smembers(self._tag(tag))
+            members = (await pipe.execute())[len(tags) :]
+        keys = {k for reply in members for k in reply}
+        await self._client.delete(*keys, *(self._tag(tag) for tag in tags))
+
+    async def clear(self) -> None:
+        await self._client.set(self._floor_key, await self._client.incr(self._gen_key))
+        counters = {self._gen_key.encode(), self._floor_key.encode()}
+        keys = [
+            key
+            async for key in self._client.scan_iter(match=f"{self.prefix}*", count=500)
+            if key not in counters
+        ]
+        for i in range(0, len(keys), 500):
+            await self._client.delete(*keys[i : i + 500])
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}k:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}t:{tag}"
+
+    def _version(self, tag: str) -> str:
+        return f"{self.prefix}v:{tag}"
+
+    @property
+    def _gen_key(self) -> str:
+        return f"{self.prefix}gen"
+
+    @property
+    def _floor_key(self) -> str:
+        return f"{self.prefix}floor"
+
+
+class ResponseCache:
+    """Cache of JSON response bodies with per-namespace hit/miss counters."""
+
+    def __init__(self, backend: CacheBackend | None, ttl_seconds: int) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._hits: dict[str, int] = defaultdict(int)
+        self._misses: dict[str, int] = defaultdict(int)
+        self._errors = 0
+
+    async def get_or_build(self, namespace: str, key: str, build: Builder) -> Response:
+        """
+        JSON response for namespace/key: the cached body, or build() -> (model, tags) serialized
+        and stored under those tags (unless one was invalidated while building). Exceptions from
+        build (e.g. a 404) are raised and not cached. build should read on the primary.
+        """
+        full_key = f"{namespace}:{key}"
+        since = None
+        if self.backend is not None:
+            body = await self._call(self.backend.get(full_key))
+            if body is not None:
+                self._hits[namespace] += 1
+                return Response(content=body, media_type="application/json")
+            # Noted before build() reads anything: invalidations after this point keep it unstored
+            since = await self._call(self.backend.generation())
+        self._misses[namespace] += 1
+        model, tags = await build()
+        body = model.model_dump_json(by_alias=True).encode()
+        if since is not None:
+            await self._call(
+                self.backend.set(full_key, body, tags=set(tags), ttl=self.ttl_seconds, since=since)
+            )
+        return Response(content=body, media_type="application/json")
+
+    async def invalidate(self, db: AsyncSession | None, *tags: str) -> None:
+        """Drop entries built from these rows now, and again after db's transaction commits."""
+        if self.backend is None or not tags:
+            return
+        if db is not None:
+            db.info.setdefault(_PENDING, set()).update(tags)
+        await self._call(self.backend.invalidate(tags))
+
+    async def invalidate_committed(self, db: AsyncSession) -> None:
+        """Repeat the invalidations recorded on db; call right after its commit."""
+        tags = db.info.pop(_PENDING, None)
+        if tags and self.backend is not None:
+            await self._call(self.backend.invalidate(tags))
+
+    async def clear(self) -> None:
+        if self.backend is not None:
+            await self._call(self.backend.clear())
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+    def stats(self) -> dict:
+        """Hits, misses and hit ratio per namespace and in total since startup."""
+        namespaces = {
+            ns: _ratio(self._hits[ns], self._misses[ns]) for ns in sorted(set(self._hits) | set(self._misses))
+        }
+        return {
+            "backend": self.backend.name if self.backend is not None else "off",
+            "entries": len(self.backend) if isinstance(self.backend, MemoryBackend) else None,
+            "errors": self._errors,
+            **_ratio(sum(self._hits.values()), sum(self._misses.values())),
+            "namespaces": namespaces,
+        }
+
+    async def _call(self, op: Awaitable):
+        """Run a backend operation; a cache outage degrades to misses instead of failing requests."""
+        try:
+            return await op
+        except (OSError, asyncio.TimeoutError, RedisError) as e:
+            self._errors += 1
+            logger.warning("Response cache %s unavailable: %s", self.backend.name, e)
+            return None
+
+
+def pet_tag(pet_id: int) -> str:
+    return f"pet:{pet_id}"
+
+
+def user_tag(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def vet_tag(vet_id: int) -> str:
+    return f"vet:{vet_id}"
+
+
+def _ratio(hits: int, misses: int) -> dict:
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 4) if total else None}
+
+
+def _backend_from_settings() -> CacheBackend | None:
+    settings = get_settings()
+    kind = settings.response_cache_backend.strip().lower()
+    if kind == "memory":
+        return MemoryBackend(settings.response_cache_max_entries)
+    if kind == "redis":
+        return RedisBackend(settings.response_cache_redis_url)
+    return None
+
+
+response_cache = ResponseCache(_backend_from_settings(), get_settings().response_cache_ttl_seconds)
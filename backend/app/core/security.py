@@ -7,6 +7,11 @@ import bcrypt
 from jose import JWTError, jwt
 
 from app.config import get_settings
+from app.core.executors import BoundedExecutor
+
+# bcrypt is CPU-bound (~250 ms at 12 rounds) and releases the GIL, so it runs on a small dedicated
+# pool instead of the event loop; a login storm queues for it rather than occupying every core.
+_hashing = BoundedExecutor(get_settings().password_hash_concurrency, "password-hash")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -18,13 +23,32 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt."""
+    """Hash a password using bcrypt with the configured cost (bcrypt_rounds)."""
     return bcrypt.hashpw(
         password.encode("utf-8"),
-        bcrypt.gensalt(),
+        bcrypt.gensalt(rounds=get_settings().bcrypt_rounds),
     ).decode("utf-8")
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True if the stored hash was made with a different cost factor than bcrypt_rounds."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds != get_settings().bcrypt_rounds
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password off the event loop (bounded hashing pool)."""
+    return await _hashing.run(verify_password, plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """get_password_hash off the event loop (bounded hashing pool)."""
+    return await _hashing.run(get_password_hash, password)
+
+
 def create_access_token(subject: str | int, extra_claims: dict[str, Any] | None = None) -> str:
     """Create a JWT access token."""
     settings = get_settings()
@@ -42,3 +66,24 @@ def decode_access_token(token: str) -> dict | None:
         return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
     except JWTError:
         return None
+
+
+def create_scoped_token(audience: str, claims: dict[str, Any], expires_in: timedelta) -> str:
+    """
+    Signed JWT for one purpose (e.g. completing a direct upload). It carries an aud claim, which
+    decode_access_token rejects, so a scoped token can never be used to log in.
+    """
+    settings = get_settings()
+    to_encode = {**claims, "aud": audience, "exp": datetime.now(timezone.utc) + expires_in}
+    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+
+
+def decode_scoped_token(token: str, audience: str) -> dict | None:
+    """Decode a create_scoped_token token for audience; None if invalid, expired or for another purpose."""
+    settings = get_settings()
+    try:
+        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm], audience=audience)
+    except JWTError:
+        return None
+    # jose only checks aud when the token has one: an access token (no aud) must not pass
+    return payload if payload.get("aud") == audience else None
@@ -0,0 +1,68 @@
+"""Single-pass JSON serialization for API responses.
+
+Returning ORM rows or models from a handler makes FastAPI validate them against response_model,
+dump the result to dicts and encode those with json.dumps: every item is validated (at least once)
+and copied several times. Handlers on the fast path instead read each item's attributes once into
+a dict keyed like its response schema (serialization aliases included) and return json_response,
+which encodes with orjson and is sent as is. response_model still documents the endpoint.
+
+Only flat schemas whose fields are attributes of the object (or passed explicitly) are supported,
+which covers the *Response schemas of the pets, users, community and veterinary routers.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Mapping
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+Dump = Callable[[Iterable[Any]], list[dict[str, Any]]]
+
+
+@lru_cache
+def _fields(schema: type[BaseModel]) -> tuple[tuple[str, str, Any], ...]:
+    """
+    (attribute, JSON key, default) per field of schema. Objects without the attribute get the
+    field's default; a required field has none (PydanticUndefined), which dumps() rejects.
+    """
+    return tuple(
+        (name, field.serialization_alias or name, field.get_default(call_default_factory=True))
+        for name, field in schema.model_fields.items()
+    )
+
+
+def row(schema: type[BaseModel], obj: Any, **values: Any) -> dict[str, Any]:
+    """Response dict for obj shaped like schema; values supplies fields obj does not have (e.g. URLs)."""
+    return {
+        key: values[name] if name in values else getattr(obj, name, default)
+        for name, key, default in _fields(schema)
+    }
+
+
+def dumper(schema: type[BaseModel]) -> Dump:
+    """Function turning objects into response dicts shaped like schema (e.g. for paginated)."""
+    fields = _fields(schema)
+
+    def dump(objs: Iterable[Any]) -> list[dict[str, Any]]:
+        return [{key: getattr(obj, name, default) for name, key, default in fields} for obj in objs]
+
+    return dump
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """orjson encoding as FastAPI would produce it (aware datetimes in UTC end in Z)."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def json_response(
+    content: Any, *, status_code: int = 200, headers: Mapping[str, str] | None = None
+) -> Response:
+    """JSON response encoded once with orjson; FastAPI does not revalidate returned Responses."""
+    return Response(content=dumps(content), status_code=status_code, headers=headers, media_type="application/json")
@@ -0,0 +1,225 @@
+"""Streaming file uploads: a multipart request body is parsed as it arrives and written straight to storage.
+
+FastAPI's UploadFile only reaches the endpoint once the whole body has been received and spooled,
+so upload endpoints take the Request instead and call receive_upload(): it parses up to the file
+part's headers (filename, content type) for the endpoint to validate, then IncomingFile.save()
+streams the rest through a storage writer. The first bytes are checked against the declared
+content type and the running size against the endpoint's limit, so a mislabelled or oversized file
+is refused as soon as that is known; the request is never held in memory beyond a chunk or two
+(plus one multipart part for Spaces).
+
+Storage is content-addressed: the file is written to a staging key while its SHA-256 is computed,
+then published under its blob key, or discarded when a blob with that content already exists
+(see app.crud.media_blob), so a duplicate upload costs no storage write.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+from fastapi import HTTPException, Request
+from python_multipart.multipart import MultipartParser, parse_options_header
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.media_blob import media_blob_crud
+from app.services.storage.base import FileStorage, run_io
+
+# Bytes needed to recognise every signature below
+SNIFF_BYTES = 16
+
+
+def _is_mp4(head: bytes) -> bool:
+    return head[4:8] == b"ftyp"  # ISO base media: mp4, mov
+
+
+def _is_mp3(head: bytes) -> bool:
+    return head.startswith(b"ID3") or (len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0)
+
+
+def _is_wav(head: bytes) -> bool:
+    return head[:4] == b"RIFF" and head[8:12] == b"WAVE"
+
+
+def _is_webm(head: bytes) -> bool:
+    return head.startswith(b"\x1a\x45\xdf\xa3")  # EBML: webm, mkv
+
+
+# Declared content type -> check on the file's first bytes. Types not listed are not sniffed.
+MAGIC: dict[str, Callable[[bytes], bool]] = {
+    "image/jpeg": lambda h: h.startswith(b"\xff\xd8\xff"),
+    "image/png": lambda h: h.startswith(b"\x89PNG"),
+    "image/gif": lambda h: h[:6] in (b"GIF87a", b"GIF89a"),
+    "image/webp": lambda h: h[:4] == b"RIFF" and h[8:12] == b"WEBP",
+    "audio/wav": _is_wav,
+    "audio/wave": _is_wav,
+    "audio/mpeg": _is_mp3,
+    "audio/mp3": _is_mp3,
+    "audio/webm": _is_webm,
+    "video/webm": _is_webm,
+    "video/mp4": _is_mp4,
+    "video/quicktime": _is_mp4,
+    "application/pdf": lambda h: h.startswith(b"%PDF-"),
+    "application/msword": lambda h: h.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"),
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": lambda h: h.startswith(b"PK\x03\x04"),
+}
+
+
+def multipart_file_body(description: str = "") -> dict:
+    """openapi_extra documenting the multipart "file" field of an endpoint that reads the request itself."""
+    file_schema = {"type": "string", "format": "binary", "description": description}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {"type": "object", "required": ["file"], "properties": {"file": file_schema}}
+                }
+            },
+        }
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class StoredFile:
+    """Where an upload ended up: its (possibly shared) blob key, size and SHA-256."""
+
+    key: str
+    size: int
+    sha256: str
+
+
+class IncomingFile:
+    """The file field of a multipart request, not yet read past its headers."""
+
+    def __init__(self, request: Request, boundary: bytes) -> None:
+        self._chunks = request.stream()
+        self._events: deque[tuple[str, object]] = deque()
+        self._header_field = bytearray()
+        self._header_value = bytearray()
+        self._headers: dict[bytes, bytes] = {}
+        self._parser = MultipartParser(
+            boundary,
+            {
+                "on_part_begin": self._headers.clear,
+                "on_header_field": lambda data, start, end: self._header_field.extend(data[start:end]),
+                "on_header_value": lambda data, start, end: self._header_value.extend(data[start:end]),
+                "on_header_end": self._on_header_end,
+                "on_headers_finished": lambda: self._events.append(("headers", dict(self._headers))),
+                "on_part_data": lambda data, start, end: self._events.append(("data", bytes(data[start:end]))),
+                "on_part_end": lambda: self._events.append(("end", None)),
+            },
+        )
+        self.filename: str | None = None
+        self.content_type = ""
+
+    def _on_header_end(self) -> None:
+        self._headers[bytes(self._header_field).lower()] = bytes(self._header_value)
+        self._header_field.clear()
+        self._header_value.clear()
+
+    async def _next_event(self) -> tuple[str, object] | None:
+        """Next parser event, feeding it request chunks as needed; None once the body is exhausted."""
+        while not self._events:
+            try:
+                chunk = await self._chunks.__anext__()
+            except StopAsyncIteration:
+                self._parser.finalize()
+                return self._events.popleft() if self._events else None
+            if chunk:
+                self._parser.write(chunk)
+        return self._events.popleft()
+
+    async def _find(self, field: str) -> bool:
+        """Advance to the data of the file part named field."""
+        while event := await self._next_event():
+            kind, headers = event
+            if kind != "headers":
+                continue
+            _, options = parse_options_header(headers.get(b"content-disposition"))
+            if options.get(b"name", b"").decode("latin-1") == field and b"filename" in options:
+                self.filename = options[b"filename"].decode("utf-8", "replace") or None
+                self.content_type = headers.get(b"content-type", b"").decode("latin-1").strip().lower()
+                return True
+        return False
+
+    async def _data(self) -> AsyncIterator[bytes]:
+        while (event := await self._next_event()) and event[0] == "data":
+            yield event[1]
+
+    async def save(self, db: AsyncSession, storage: FileStorage, *, max_size: int, too_large: str) -> StoredFile:
+        """
+        Stream the file to storage and take a reference to its blob (in db's transaction). Raises
+        400 when its first bytes do not match content_type and 413 (with detail too_large) as soon
+        as it exceeds max_size; nothing is left in storage either way.
+        """
+        check = MAGIC.get(self.content_type)
+        writer = await storage.aopen_writer(storage.staging_key(), self.content_type)
+        head = b""
+        size = 0
+        try:
+            async for data in self._data():
+                size += len(data)
+                if size > max_size:
+                    raise HTTPException(status_code=413, detail=too_large)
+                if check is not None and len(head) < SNIFF_BYTES:
+                    head += data
+                    if len(head) < SNIFF_BYTES:
+                        continue
+                    self._check(check, head)
+                    data, head = head, head[:SNIFF_BYTES]
+                await writer.write(data)
+            if check is not None and len(head) < SNIFF_BYTES:
+                self._check(check, head)
+                await writer.write(head)
+            await writer.flush()
+            sha256 = writer.sha256.hexdigest()
+            key, created = await media_blob_crud.acquire(
+                db, sha256=sha256, storage_key=storage.blob_key(sha256), size=size
+            )
+            if created:
+                await writer.commit(key)
+            else:
+                await writer.abort()
+        except BaseException:
+            await writer.abort()
+            raise
+        return StoredFile(key=key, size=size, sha256=sha256)
+
+    def _check(self, check: Callable[[bytes], bool], head: bytes) -> None:
+        if not check(head):
+            raise HTTPException(status_code=400, detail=f"File content is not {self.content_type}")
+
+
+async def verify_stored(storage: FileStorage, key: str, content_type: str, *, max_size: int, too_large: str) -> int:
+    """
+    The checks save() applies while streaming, for a file the client uploaded straight to storage:
+    returns its size, or deletes it and raises 413 / 400 when it is too large or its first bytes do
+    not match content_type. Raises FileNotFoundError if nothing was uploaded under key.
+    """
+    size = await storage.asize(key)
+    if size > max_size:
+        await storage.adelete(key)
+        raise HTTPException(status_code=413, detail=too_large)
+    check = MAGIC.get(content_type)
+    if check is not None:
+
+        def read_head() -> bytes:
+            with storage.open(key, 0, SNIFF_BYTES - 1) as f:
+                return f.read(SNIFF_BYTES)
+
+        if not check(await run_io(read_head)):
+            await storage.adelete(key)
+            raise HTTPException(status_code=400, detail=f"File content is not {content_type}")
+    return size
+
+
+async def receive_upload(request: Request, field: str = "file") -> IncomingFile:
+    """Read a multipart request up to the data of its file field. 400 if it is not multipart or has no such file."""
+    content_type, params = parse_options_header(request.headers.get("content-type"))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    upload = IncomingFile(request, boundary)
+    if not await upload._find(field):
+        raise HTTPException(status_code=400, detail=f"Missing file field '{field}'")
+    return upload
@@ -1,21 +1,150 @@
-"""CRUD for ActivityStateLog."""
+"""CRUD for ActivityStateLog.
 
-from datetime import datetime, timezone
+Devices and the live chart report the pet's state repeatedly, so a transition appended after the
+pet's latest one with the same state carries no information and is not stored (create returns
+the transition already in effect; create_many leaves it out of the count). Late transitions,
+dated before the pet's latest one, are always stored: they may split an existing interval.
+Writers take the pet's PET_ACTIVITY advisory lock before reading its neighbouring transitions, so
+concurrent transitions for one pet are applied one after the other.
+
+The table is partitioned by month of start_time. `ensure_partitions` pre-creates upcoming
+months and `expire` applies the retention period (see scripts/maintain_activity_logs.py).
+"""
+
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Float, Integer, Row, Select, bindparam, delete, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.live_events import imported_events, live_events
+from app.core.serialization import row
+from app.crud.pet_daily_stats import pet_daily_stats_crud
+from app.db.bulk import copy_rows
+from app.db.locks import PET_ACTIVITY, lock_ids
+from app.db.partitions import drop_partitions_before, ensure_monthly_partitions
+from app.db.statements import keyset_page, page_params
 from app.models.activity_state_log import ActivityStateLog
-from app.schemas.habits import ActivityStateLogCreate
+from app.schemas.habits import ActivityStateLogBulkItem, ActivityStateLogCreate, ActivityStateLogResponse
+
+# Latest transition of each pet in :pet_ids (one index probe per pet, whatever the history size)
+_LATEST_SQL = text(
+    """
+    SELECT p.pet_id, l.active, l.start_time
+    FROM unnest(CAST(:pet_ids AS INTEGER[])) AS p(pet_id)
+    JOIN LATERAL (
+        SELECT active, start_time FROM activity_state_logs
+        WHERE pet_id = p.pet_id
+        ORDER BY start_time DESC, id DESC
+        LIMIT 1
+    ) AS l ON true
+    """
+)
+
+# Hourly rollup of the transitions before :before, which are about to be deleted. Each interval
+# lasts until the pet's next transition (possibly one that is kept) and is counted in full, so
+# hourly rows plus the remaining raw transitions describe the whole history exactly once.
+_ROLLUP_SQL = text(
+    """
+    WITH intervals AS (
+        SELECT pet_id, active, start_time,
+               coalesce(
+                   lead(start_time) OVER (PARTITION BY pet_id ORDER BY start_time, id),
+                   (SELECT min(n.start_time) FROM activity_state_logs n
+                    WHERE n.pet_id = l.pet_id AND n.start_time >= :before)
+               ) AS end_time
+        FROM activity_state_logs l
+        WHERE start_time < :before
+    )
+    INSERT INTO activity_hourly_stats (pet_id, hour, active_seconds, transitions)
+    SELECT pet_id, hour, sum(active_seconds), sum(transitions)
+    FROM (
+        SELECT pet_id, date_trunc('hour', start_time) AS hour, 0 AS active_seconds, 1 AS transitions
+        FROM intervals
+        UNION ALL
+        SELECT pet_id, h, floor(extract(epoch FROM least(end_time, h + interval '1 hour') - greatest(start_time, h))), 0
+        FROM intervals
+        CROSS JOIN LATERAL generate_series(date_trunc('hour', start_time), end_time, interval '1 hour') AS h
+        WHERE active AND end_time IS NOT NULL
+    ) AS contributions
+    GROUP BY pet_id, hour
+    HAVING sum(active_seconds) > 0 OR sum(transitions) > 0
+    ON CONFLICT (pet_id, hour) DO UPDATE SET
+        active_seconds = activity_hourly_stats.active_seconds + excluded.active_seconds,
+        transitions = activity_hourly_stats.transitions + excluded.transitions
+    """
+)
+
+# Active and known (covered by some transition) seconds per bucket of :width seconds from :since,
+# for the intervals of one pet within [:since, :until). The interval in effect at :since starts
+# at the last transition on or before it; the latest interval runs to :until.
+_SERIES_SQL = text(
+    """
+    WITH intervals AS (
+        SELECT active,
+               extract(epoch FROM greatest(start_time, :since) - :since) AS s,
+               extract(epoch FROM least(
+                   coalesce(lead(start_time) OVER (ORDER BY start_time, id), :until), :until) - :since) AS e
+        FROM activity_state_logs
+        WHERE pet_id = :pet_id
+          AND start_time >= coalesce(
+              (SELECT max(start_time) FROM activity_state_logs WHERE pet_id = :pet_id AND start_time <= :since),
+              :since)
+          AND start_time < :until
+    )
+    SELECT b AS bucket,
+           coalesce(sum(overlap) FILTER (WHERE active), 0) AS active_seconds,
+           sum(overlap) AS known_seconds
+    FROM intervals
+    CROSS JOIN LATERAL generate_series(
+        CAST(floor(s / :width) AS INTEGER), least(CAST(ceil(e / :width) AS INTEGER) - 1, :points - 1)) AS b
+    CROSS JOIN LATERAL (SELECT least(e, (b + 1) * :width) - greatest(s, b * :width) AS overlap) AS o
+    WHERE e > s
+    GROUP BY b
+    ORDER BY b
+    """
+).bindparams(bindparam("width", type_=Float), bindparam("points", type_=Integer))
 
 
 def _naive_utc(dt: datetime | None) -> datetime | None:
-    if dt is None:
-        return None
-    if dt.tzinfo is not None:
-        dt = dt.astimezone(timezone.utc)
-    return dt.replace(tzinfo=None)
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache
+def _list_statement(since: bool, until: bool, after: bool) -> Select:
+    """Core SELECT for get_multi, built once per combination of filters."""
+    c = ActivityStateLog.__table__.c
+    q = select(*ActivityStateLog.__table__.c).where(c.pet_id == bindparam("pet_id"))
+    if since:
+        q = q.where(c.start_time >= bindparam("since"))
+    if until:
+        q = q.where(c.start_time <= bindparam("until"))
+    return keyset_page(q, c.start_time, c.id, after=after)
+
+
+def _drop_unchanged(
+    records: list[tuple[int, bool, datetime]], latest: dict[int, tuple[bool, datetime]]
+) -> list[tuple[int, bool, datetime]]:
+    """
+    (pet_id, active, start_time) records in time order without the appended ones that repeat the
+    state before them (the pet's latest stored transition or the previous appended record).
+    Records older than latest are kept.
+    """
+    state = dict(latest)
+    kept = []
+    for record in sorted(records, key=itemgetter(2)):
+        pet_id, active, start_time = record
+        last = state.get(pet_id)
+        if last is None or start_time >= last[1]:
+            if last is not None and last[0] == active:
+                continue
+            state[pet_id] = (active, start_time)
+        kept.append(record)
+    return kept
 
 
 class CRUDActivityStateLog:
@@ -24,13 +153,69 @@ class CRUDActivityStateLog:
     async def create(
         self, db: AsyncSession, *, pet_id: int, obj_in: ActivityStateLogCreate
     ) -> ActivityStateLog:
+        """
+        Store a transition and apply it to the daily rollup. When it would follow the pet's
+        latest transition with the same state, nothing is written and that transition is returned.
+        """
         start_time = _naive_utc(obj_in.start_time) or _naive_utc(datetime.now(timezone.utc))
+        await lock_ids(db, PET_ACTIVITY, [pet_id])
+        prev = (
+            await db.execute(
+                select(ActivityStateLog)
+                .where(ActivityStateLog.pet_id == pet_id, ActivityStateLog.start_time <= start_time)
+                .order_by(ActivityStateLog.start_time.desc(), ActivityStateLog.id.desc())
+                .limit(1)
+            )
+        ).scalar_one_or_none()
+        next_start = (
+            await db.execute(
+                select(ActivityStateLog.start_time)
+                .where(ActivityStateLog.pet_id == pet_id, ActivityStateLog.start_time > start_time)
+                .order_by(ActivityStateLog.start_time, ActivityStateLog.id)
+                .limit(1)
+            )
+        ).scalar_one_or_none()
+        if prev is not None and next_start is None and prev.active == obj_in.active:
+            return prev
         log = ActivityStateLog(pet_id=pet_id, active=obj_in.active, start_time=start_time)
         db.add(log)
         await db.flush()
-        await db.refresh(log)
+        await pet_daily_stats_crud.record_activity_transition(db, log=log, prev=prev, next_start=next_start)
+        await live_events.publish(db, pet_id, "activity_state", row(ActivityStateLogResponse, log))
         return log
 
+    async def create_many(self, db: AsyncSession, *, items: Sequence[ActivityStateLogBulkItem]) -> int:
+        """
+        Insert validated bulk items with COPY, without appended unchanged states.
+        active_minutes is then recomputed per pet over the span of days the batch touches.
+        Returns the number of transitions stored.
+        """
+        now = _naive_utc(datetime.now(timezone.utc))
+        records = [(item["pet_id"], item["active"], _naive_utc(item["start_time"]) or now) for item in items]
+        if not records:
+            return 0
+        pet_ids = sorted({record[0] for record in records})
+        await lock_ids(db, PET_ACTIVITY, pet_ids)
+        result = await db.execute(_LATEST_SQL, {"pet_ids": pet_ids})
+        records = _drop_unchanged(records, {r.pet_id: (r.active, r.start_time) for r in result})
+        if not records:
+            return 0
+        await copy_rows(db, ActivityStateLog.__table__, ("pet_id", "active", "start_time"), records)
+        # records are in time order: each pet's first and last are its span
+        spans: dict[int, list[datetime]] = {}
+        for pet_id, _, start_time in records:
+            span = spans.get(pet_id)
+            if span is None:
+                spans[pet_id] = [start_time, start_time]
+            else:
+                span[1] = start_time
+        for pet_id, (lo, hi) in sorted(spans.items()):
+            await pet_daily_stats_crud.refresh_active_minutes(db, pet_id=pet_id, since=lo, until=hi)
+        await live_events.publish_many(
+            db, imported_events("activity_state", ((pet_id, start_time) for pet_id, _, start_time in records))
+        )
+        return len(records)
+
     async def get_multi(
         self,
         db: AsyncSession,
@@ -38,19 +223,56 @@ class CRUDActivityStateLog:
         pet_id: int,
         since: datetime | None = None,
         until: datetime | None = None,
+        after: tuple[datetime, int] | None = None,
         skip: int = 0,
         limit: int = 500,
-    ) -> Sequence[ActivityStateLog]:
-        since_naive = _naive_utc(since)
-        until_naive = _naive_utc(until)
-        q = select(ActivityStateLog).where(ActivityStateLog.pet_id == pet_id)
-        if since_naive is not None:
-            q = q.where(ActivityStateLog.start_time >= since_naive)
-        if until_naive is not None:
-            q = q.where(ActivityStateLog.start_time <= until_naive)
-        q = q.order_by(ActivityStateLog.start_time.desc()).offset(skip).limit(limit)
-        result = await db.execute(q)
-        return result.scalars().all()
+    ) -> Sequence[Row]:
+        """
+        Transitions newest first as Row tuples (ActivityStateLog columns by name), up to 2000 per
+        live chart poll; `after` continues a keyset cursor.
+        """
+        params = page_params(after, skip, limit)
+        params.update(pet_id=pet_id, since=_naive_utc(since), until=_naive_utc(until))
+        q = _list_statement(since is not None, until is not None, after is not None)
+        result = await db.execute(q, params)
+        return result.all()
+
+    async def get_series(
+        self, db: AsyncSession, *, pet_id: int, since: datetime, until: datetime, points: int
+    ) -> list[float | None]:
+        """
+        Fraction of time active in each of `points` equal buckets of [since, until), computed in
+        SQL so only `points` numbers leave the database whatever the window. None for buckets
+        with no known state (before the pet's first transition, or past the retention period).
+        """
+        since, until = _naive_utc(since), _naive_utc(until)
+        width = (until - since).total_seconds() / points
+        result = await db.execute(
+            _SERIES_SQL, {"pet_id": pet_id, "since": since, "until": until, "width": width, "points": points}
+        )
+        series: list[float | None] = [None] * points
+        for bucket_row in result:
+            if bucket_row.known_seconds > 0:
+                series[bucket_row.bucket] = float(bucket_row.active_seconds) / float(bucket_row.known_seconds)
+        return series
+
+    async def ensure_partitions(self, db: AsyncSession, *, today: date, months_ahead: int) -> list[str]:
+        """Create missing month partitions from today's month to months_ahead months later."""
+        return await ensure_monthly_partitions(
+            db, ActivityStateLog.__table__, "start_time", start=today, months=months_ahead + 1
+        )
+
+    async def expire(self, db: AsyncSession, *, before: date) -> list[str]:
+        """
+        Roll transitions older than `before` (a month start) up into activity_hourly_stats, then drop
+        their month partitions and delete what is left of them in the default partition. The daily
+        rollup is not touched. Returns the dropped partitions.
+        """
+        cutoff = datetime.combine(before, datetime.min.time())
+        await db.execute(_ROLLUP_SQL, {"before": cutoff})
+        dropped = await drop_partitions_before(db, ActivityStateLog.__table__, before)
+        await db.execute(delete(ActivityStateLog).where(ActivityStateLog.start_time < cutoff))
+        return dropped
 
 
 activity_state_log_crud = CRUDActivityStateLog()
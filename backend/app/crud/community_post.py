@@ -1,15 +1,30 @@
 """CRUD operations for CommunityPost."""
 
+from datetime import datetime
+from functools import lru_cache
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.db.statements import keyset_page, page_params
 from app.models.community_post import CommunityPost
+from app.models.pet import Pet
+from app.models.user import User
 from app.schemas.community import CommunityPostCreate, CommunityPostUpdate
 
 
+@lru_cache
+def _feed_statement(after: bool) -> Select:
+    """Core SELECT for get_multi: post columns plus user_name and pet_name in one joined query."""
+    posts, users, pets = CommunityPost.__table__, User.__table__, Pet.__table__
+    q = select(posts, users.c.name.label("user_name"), pets.c.name.label("pet_name")).select_from(
+        posts.join(users, users.c.id == posts.c.user_id).outerjoin(pets, pets.c.id == posts.c.pet_id)
+    )
+    return keyset_page(q, posts.c.created_at, posts.c.id, after=after)
+
+
 class CRUDCommunityPost:
     """CRUD for CommunityPost model."""
 
@@ -26,18 +41,16 @@ class CRUDCommunityPost:
         self,
         db: AsyncSession,
         *,
+        after: tuple[datetime, int] | None = None,
         skip: int = 0,
         limit: int = 50,
-    ) -> Sequence[CommunityPost]:
-        """List posts newest first, with user and pet loaded."""
-        result = await db.execute(
-            select(CommunityPost)
-            .options(selectinload(CommunityPost.user), selectinload(CommunityPost.pet))
-            .order_by(CommunityPost.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-        )
-        return result.unique().scalars().all()
+    ) -> Sequence[Row]:
+        """
+        List posts newest first as Row tuples (CommunityPost columns plus user_name and pet_name).
+        `after` continues from a keyset cursor.
+        """
+        result = await db.execute(_feed_statement(after is not None), page_params(after, skip, limit))
+        return result.all()
 
     async def create(self, db: AsyncSession, *, obj_in: CommunityPostCreate, user_id: int) -> CommunityPost:
         """Create a post."""
@@ -49,7 +62,6 @@ class CRUDCommunityPost:
         )
         db.add(post)
         await db.flush()
-        await db.refresh(post)
         return post
 
     async def update(
@@ -60,7 +72,6 @@ class CRUDCommunityPost:
         for field, value in data.items():
             setattr(db_obj, field, value)
         await db.flush()
-        await db.refresh(db_obj)
         return db_obj
 
     async def delete(self, db: AsyncSession, *, id: int) -> bool:
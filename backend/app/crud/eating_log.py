@@ -1,32 +1,99 @@
 """CRUD for EatingLog."""
 
-from datetime import datetime
+from collections import Counter
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.live_events import imported_events, live_events
+from app.core.serialization import row
+from app.crud.pet_daily_stats import pet_daily_stats_crud
+from app.db.bulk import copy_rows
+from app.db.statements import keyset_page, page_params
 from app.models.eating_log import EatingLog
-from app.schemas.habits import EatingLogCreate
+from app.schemas.habits import EatingLogBulkItem, EatingLogCreate, EatingLogResponse
+
+
+def _naive_utc(dt: datetime | None) -> datetime | None:
+    """Convert to naive UTC for TIMESTAMP WITHOUT TIME ZONE storage."""
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _values(pet_id: int, obj_in: EatingLogCreate) -> dict:
+    """Column values for a new eating log."""
+    return {
+        "pet_id": pet_id,
+        "occurred_at": _naive_utc(obj_in.occurred_at),
+        "meal_type": obj_in.meal_type,
+        "amount": obj_in.amount,
+        "notes": obj_in.notes,
+        "source": obj_in.source,
+    }
+
+
+# COPY columns of create_many, in _record order
+_COLUMNS = ("pet_id", "occurred_at", "meal_type", "amount", "notes", "source")
+
+
+def _record(item: EatingLogBulkItem) -> tuple:
+    """_values of a validated bulk item, as a COPY record."""
+    return (
+        item["pet_id"],
+        _naive_utc(item["occurred_at"]),
+        item["meal_type"],
+        item["amount"],
+        item["notes"],
+        item["source"],
+    )
+
+
+@lru_cache
+def _list_statement(since: bool, until: bool, meal_type: bool, after: bool) -> Select:
+    """Core SELECT for get_multi, built once per combination of filters."""
+    c = EatingLog.__table__.c
+    q = select(*EatingLog.__table__.c).where(c.pet_id == bindparam("pet_id"))
+    if since:
+        q = q.where(c.occurred_at >= bindparam("since"))
+    if until:
+        q = q.where(c.occurred_at <= bindparam("until"))
+    if meal_type:
+        q = q.where(c.meal_type == bindparam("meal_type"))
+    return keyset_page(q, c.occurred_at, c.id, after=after)
 
 
 class CRUDEatingLog:
     """CRUD for EatingLog."""
 
     async def create(self, db: AsyncSession, *, pet_id: int, obj_in: EatingLogCreate) -> EatingLog:
-        log = EatingLog(
-            pet_id=pet_id,
-            occurred_at=obj_in.occurred_at,
-            meal_type=obj_in.meal_type,
-            amount=obj_in.amount,
-            notes=obj_in.notes,
-            source=obj_in.source,
-        )
+        log = EatingLog(**_values(pet_id, obj_in))
         db.add(log)
         await db.flush()
-        await db.refresh(log)
+        await pet_daily_stats_crud.add(db, pet_id=pet_id, day=log.occurred_at.date(), meals_count=1)
+        await live_events.publish(db, pet_id, "eating_log", row(EatingLogResponse, log))
         return log
 
+    async def create_many(self, db: AsyncSession, *, items: Sequence[EatingLogBulkItem]) -> int:
+        """Insert validated bulk items with COPY and update the daily rollup. Returns the count."""
+        records = [_record(item) for item in items]
+        if not records:
+            return 0
+        await copy_rows(db, EatingLog.__table__, _COLUMNS, records)
+        meals = Counter((pet_id, occurred_at.date()) for pet_id, occurred_at, *_ in records)
+        await pet_daily_stats_crud.add_many(
+            db,
+            [
+                {"pet_id": pet_id, "day": day, "sleep_minutes": 0, "meals_count": count, "active_minutes": 0}
+                for (pet_id, day), count in sorted(meals.items())
+            ],
+        )
+        await live_events.publish_many(db, imported_events("eating_log", (r[:2] for r in records)))
+        return len(records)
+
     async def get_multi(
         self,
         db: AsyncSession,
@@ -35,19 +102,15 @@ class CRUDEatingLog:
         since: datetime | None = None,
         until: datetime | None = None,
         meal_type: str | None = None,
+        after: tuple[datetime, int] | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> Sequence[EatingLog]:
-        q = select(EatingLog).where(EatingLog.pet_id == pet_id)
-        if since is not None:
-            q = q.where(EatingLog.occurred_at >= since)
-        if until is not None:
-            q = q.where(EatingLog.occurred_at <= until)
-        if meal_type is not None:
-            q = q.where(EatingLog.meal_type == meal_type)
-        q = q.order_by(EatingLog.occurred_at.desc()).offset(skip).limit(limit)
-        result = await db.execute(q)
-        return result.scalars().all()
-
+    ) -> Sequence[Row]:
+        """Logs newest first as Row tuples (EatingLog columns by name); `after` continues a keyset cursor."""
+        params = page_params(after, skip, limit)
+        params.update(pet_id=pet_id, since=_naive_utc(since), until=_naive_utc(until), meal_type=meal_type)
+        q = _list_statement(since is not None, until is not None, meal_type is not None, after is not None)
+        result = await db.execute(q, params)
+        return result.all()
 
 eating_log_crud = CRUDEatingLog()
@@ -0,0 +1,47 @@
+"""Named relationship loading profiles for Pet and User queries.
+
+Relationships on Pet and User are lazy="raise_on_sql": nothing is eager-loaded and touching an
+unloaded collection raises instead of silently querying. A CRUD getter loads the "lean" profile
+(columns only) unless the caller names a profile that opts into the collections it needs.
+"""
+
+from typing import Literal
+
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import ORMOption
+
+from app.models.pet import Pet
+from app.models.user import User
+
+PetProfile = Literal["lean", "linked_users"]
+UserProfile = Literal["lean", "linked_pets"]
+
+PET_PROFILES: dict[str, tuple[ORMOption, ...]] = {
+    # Pet columns only (existence checks, detail/list responses, updates)
+    "lean": (),
+    # Users the pet is shared with (owner + QR/link)
+    "linked_users": (selectinload(Pet.linked_users),),
+}
+
+USER_PROFILES: dict[str, tuple[ORMOption, ...]] = {
+    # User columns only (authentication, profile responses, updates)
+    "lean": (),
+    # Pets the user has access to (GET /users/me/pets, linking a pet to an account)
+    "linked_pets": (selectinload(User.linked_pets),),
+}
+
+
+def pet_load_options(profile: PetProfile = "lean") -> tuple[ORMOption, ...]:
+    """Return loader options for a Pet profile. Raises ValueError for unknown names."""
+    try:
+        return PET_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown pet loading profile: {profile!r}") from None
+
+
+def user_load_options(profile: UserProfile = "lean") -> tuple[ORMOption, ...]:
+    """Return loader options for a User profile. Raises ValueError for unknown names."""
+    try:
+        return USER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown user loading profile: {profile!r}") from None
@@ -0,0 +1,87 @@
+"""CRUD for MediaBlob (content-addressed stored files shared by media files with the same content).
+
+An upload is streamed to a staging key while its SHA-256 is computed, then `acquire`d: the first
+file with that content creates the blob and the caller publishes its staging file under the blob's
+key; any later one reuses the blob and the staging file is discarded (no storage write). Nothing is
+counted: a blob is referenced while a media_files row points at it, however that row goes away
+(explicit or cascaded delete). Blobs no row references are removed by scripts/sweep_media_blobs.py
+(`next_orphan` / `remove`, one blob per transaction) once media_blob_grace_hours have passed since
+their last acquire.
+
+Races: acquire upserts the blob row, so it waits for a sweep holding that row; the sweep skips
+rows locked by an acquire in progress and only deletes rows nothing references (the media_files
+foreign key would refuse anyway). A new blob's file is published before its transaction commits; if
+that then rolls back, the file is left without a row. The sweep finds such files in storage and
+`adopt`s them (a later upload of the same content reuses the file), so they expire like any blob.
+"""
+
+from collections.abc import Sequence
+from datetime import timedelta
+
+from sqlalchemy import exists, func, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.media_blob import MediaBlob
+from app.models.media_file import MediaFile
+
+
+class CRUDMediaBlob:
+    """CRUD for MediaBlob model."""
+
+    async def acquire(self, db: AsyncSession, *, sha256: str, storage_key: str, size: int) -> tuple[str, bool]:
+        """
+        Use the blob with this content, creating it (under storage_key) if there is none, and
+        restart its grace period. Returns the blob's storage key and whether it was created, i.e.
+        whether the caller must now write the file there.
+        """
+        stmt = (
+            pg_insert(MediaBlob)
+            .values(sha256=sha256, storage_key=storage_key, size_bytes=size)
+            .on_conflict_do_update(index_elements=[MediaBlob.sha256], set_={"updated_at": func.now()})
+            .returning(MediaBlob.storage_key, literal_column("xmax = 0").label("created"))
+        )
+        key, created = (await db.execute(stmt)).one()
+        return key, created
+
+    async def existing_keys(self, db: AsyncSession, keys: Sequence[str]) -> set[str]:
+        """Those of keys that belong to a blob row."""
+        result = await db.execute(select(MediaBlob.storage_key).where(MediaBlob.storage_key.in_(keys)))
+        return set(result.scalars().all())
+
+    async def adopt(self, db: AsyncSession, *, sha256: str, storage_key: str, size: int, age: timedelta) -> bool:
+        """
+        Give a blob file found in storage without a row one, as if last acquired age ago. Returns
+        False if a row for that content or key exists meanwhile (e.g. a concurrent upload's).
+        """
+        stmt = (
+            pg_insert(MediaBlob)
+            .values(sha256=sha256, storage_key=storage_key, size_bytes=size, updated_at=func.now() - age)
+            .on_conflict_do_nothing()
+            .returning(MediaBlob.sha256)
+        )
+        return (await db.execute(stmt)).scalar_one_or_none() is not None
+
+    async def next_orphan(self, db: AsyncSession, *, grace: timedelta) -> MediaBlob | None:
+        """
+        A blob no media file references, last acquired longer than grace ago, locked for removal
+        (skipping locked rows).
+        """
+        result = await db.execute(
+            select(MediaBlob)
+            .where(
+                MediaBlob.updated_at < func.now() - grace,
+                ~exists().where(MediaFile.content_sha256 == MediaBlob.sha256),
+            )
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def remove(self, db: AsyncSession, blob: MediaBlob) -> None:
+        """Delete the blob row (after its file has been deleted from storage)."""
+        await db.delete(blob)
+        await db.flush()
+
+
+media_blob_crud = CRUDMediaBlob()
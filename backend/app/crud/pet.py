@@ -1,35 +1,96 @@
 """CRUD operations for Pet."""
 
-from typing import Sequence
+from typing import Iterable, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Integer, any_, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
 
+from app.core.principal_cache import principal_cache
+from app.core.response_cache import pet_tag, response_cache
+from app.crud.loading import PetProfile, pet_load_options
+from app.models.media_file import MediaFile
 from app.models.pet import Pet
 from app.schemas.pet import PetCreate, PetUpdate
 
+# Session.info key for the per-session (= per-request) memo of pet id -> exists
+_EXISTS_MEMO = "pet_exists"
+
+
+def _exists_memo(db: AsyncSession) -> dict[int, bool]:
+    return db.info.setdefault(_EXISTS_MEMO, {})
+
 
 class CRUDPet:
     """CRUD for Pet model."""
 
-    async def get(self, db: AsyncSession, id: int) -> Pet | None:
-        """Get a pet by id."""
-        result = await db.execute(select(Pet).where(Pet.id == id))
+    async def get(self, db: AsyncSession, id: int, *, profile: PetProfile = "lean") -> Pet | None:
+        """Get a pet by id. Collections are loaded only if the profile asks for them."""
+        result = await db.execute(select(Pet).where(Pet.id == id).options(*pet_load_options(profile)))
         return result.scalar_one_or_none()
 
+    async def get_lean(self, db: AsyncSession, id: int) -> Pet | None:
+        """
+        Pet columns only, served from the session identity map when the pet was already loaded in
+        this request (no query). Records the outcome in the existence memo used by exists().
+        """
+        pet = await db.get(Pet, id)
+        _exists_memo(db)[id] = pet is not None
+        return pet
+
+    async def exists(self, db: AsyncSession, id: int) -> bool:
+        """
+        Whether a pet exists, selecting only its primary key. The answer is memoized on the session,
+        so repeated checks in the same request (dependencies + handler) cost one query at most.
+        """
+        memo = _exists_memo(db)
+        if id not in memo:
+            if db.identity_map.get(identity_key(Pet, id)) is not None:
+                memo[id] = True
+            else:
+                memo[id] = (await db.execute(select(Pet.id).where(Pet.id == id))).first() is not None
+        return memo[id]
+
     async def get_multi(
         self,
         db: AsyncSession,
         *,
         skip: int = 0,
         limit: int = 100,
+        profile: PetProfile = "lean",
     ) -> Sequence[Pet]:
         """List pets with pagination."""
-        result = await db.execute(select(Pet).offset(skip).limit(limit))
+        result = await db.execute(select(Pet).options(*pet_load_options(profile)).offset(skip).limit(limit))
         return result.scalars().all()
 
+    async def get_existing_ids(self, db: AsyncSession, *, ids: Iterable[int]) -> set[int]:
+        """Which of the given pet ids exist, in one query (bulk ingestion validation)."""
+        result = await db.execute(select(Pet.id).where(Pet.id == any_(literal(sorted(set(ids)), ARRAY(Integer)))))
+        return set(result.scalars().all())
+
+    async def get_profile_media_ids(self, db: AsyncSession, *, pets: Sequence[Pet]) -> dict[int, int | None]:
+        """
+        Profile picture media id per pet, for a whole page at once.
+        Uses the stored profile_media_id; pets without one fall back to their latest image in a single query.
+        """
+        out = {pet.id: pet.profile_media_id for pet in pets}
+        missing = [pet_id for pet_id, media_id in out.items() if media_id is None]
+        if missing:
+            result = await db.execute(
+                select(MediaFile.pet_id, func.max(MediaFile.id))
+                .where(MediaFile.pet_id.in_(missing), MediaFile.file_type == "image")
+                .group_by(MediaFile.pet_id)
+            )
+            out.update({pet_id: media_id for pet_id, media_id in result.all()})
+        return out
+
+    async def set_profile_media(self, db: AsyncSession, *, pet_id: int, media_id: int) -> None:
+        """Point the pet's profile picture at media_id (the pet does not need to be loaded)."""
+        await db.execute(update(Pet).where(Pet.id == pet_id).values(profile_media_id=media_id))
+
     async def create(self, db: AsyncSession, *, obj_in: PetCreate) -> Pet:
-        """Create a pet. Sets owner_id if provided; caller should add (owner_id, pet_id) to user_pets."""
+        """Create a pet. Sets owner_id if provided; caller links the owner with user_crud.link_pet."""
         pet = Pet(
             name=obj_in.name,
             species=obj_in.species,
@@ -41,7 +102,7 @@ class CRUDPet:
         )
         db.add(pet)
         await db.flush()
-        await db.refresh(pet)
+        _exists_memo(db)[pet.id] = True
         return pet
 
     async def update(self, db: AsyncSession, *, db_obj: Pet, obj_in: PetUpdate) -> Pet:
@@ -50,16 +111,19 @@ class CRUDPet:
         for field, value in data.items():
             setattr(db_obj, field, value)
         await db.flush()
-        await db.refresh(db_obj)
+        await response_cache.invalidate(db, pet_tag(db_obj.id))
         return db_obj
 
     async def delete(self, db: AsyncSession, *, id: int) -> bool:
         """Delete a pet. Returns True if deleted."""
-        pet = await self.get(db, id=id)
+        pet = await self.get_lean(db, id=id)
         if pet is None:
             return False
         await db.delete(pet)
         await db.flush()
+        _exists_memo(db)[id] = False
+        principal_cache.invalidate_pet(id, db)
+        await response_cache.invalidate(db, pet_tag(id))
         return True
 
 
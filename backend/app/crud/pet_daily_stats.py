@@ -0,0 +1,257 @@
+"""CRUD for PetDailyStats (per-pet, per-day rollup of sleep, eating and activity-state logs).
+
+The rollup is updated by the log CRUD create methods in the caller's transaction, so dashboards
+read a handful of small rows instead of scanning raw history. `rebuild` recomputes it from the raw
+logs (see scripts/rebuild_daily_stats.py).
+
+Conventions (must match between incremental updates and `rebuild`):
+- sleep: duration_minutes counts towards the day the sleep started.
+- meals: each eating log counts once towards the day it occurred.
+- active: an activity-state transition lasts until the pet's next transition (ordered by
+  start_time, id); active intervals are split at midnight and each piece floored to whole minutes.
+  The still-open latest interval is not counted until the next transition closes it.
+  Transitions past the retention period only survive as activity_hourly_stats; `rebuild` takes
+  those days from there, floored to whole minutes per day rather than per interval.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Sequence
+
+from sqlalchemy import Integer, any_, delete, func, literal, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.response_cache import pet_tag, response_cache
+from app.db.locks import PET_ACTIVITY, lock_ids
+from app.models.activity_state_log import ActivityStateLog
+from app.models.pet_daily_stats import PetDailyStats
+
+_REBUILD_SQL = text(
+    """
+    INSERT INTO pet_daily_stats (pet_id, day, sleep_minutes, meals_count, active_minutes)
+    SELECT pet_id, day, sum(sleep_minutes), sum(meals_count), sum(active_minutes)
+    FROM (
+        SELECT pet_id, started_at::date AS day, coalesce(duration_minutes, 0) AS sleep_minutes,
+               0 AS meals_count, 0 AS active_minutes
+        FROM sleep_logs
+        WHERE CAST(:pet_id AS INTEGER) IS NULL OR pet_id = :pet_id
+        UNION ALL
+        SELECT pet_id, occurred_at::date, 0, 1, 0
+        FROM eating_logs
+        WHERE CAST(:pet_id AS INTEGER) IS NULL OR pet_id = :pet_id
+        UNION ALL
+        SELECT pet_id, d::date, 0, 0,
+               floor(extract(epoch FROM least(end_time, d + interval '1 day') - greatest(start_time, d)) / 60)
+        FROM (
+            SELECT pet_id, active, start_time,
+                   lead(start_time) OVER (PARTITION BY pet_id ORDER BY start_time, id) AS end_time
+            FROM activity_state_logs
+            WHERE CAST(:pet_id AS INTEGER) IS NULL OR pet_id = :pet_id
+        ) AS intervals
+        CROSS JOIN LATERAL generate_series(date_trunc('day', start_time), end_time, interval '1 day') AS d
+        WHERE active AND end_time IS NOT NULL
+        UNION ALL
+        SELECT pet_id, hour::date, 0, 0, floor(sum(active_seconds) / 60)
+        FROM activity_hourly_stats
+        WHERE CAST(:pet_id AS INTEGER) IS NULL OR pet_id = :pet_id
+        GROUP BY pet_id, hour::date
+    ) AS contributions
+    GROUP BY pet_id, day
+    """
+)
+
+# Active minutes for days in [:lo, :hi) of one pet. Intervals reaching into the window start at the
+# last transition before :lo at the earliest and are closed by the first transition at/after :hi.
+_REFRESH_ACTIVE_SQL = text(
+    """
+    INSERT INTO pet_daily_stats (pet_id, day, active_minutes)
+    SELECT pet_id, d::date,
+           sum(floor(extract(epoch FROM least(end_time, d + interval '1 day') - greatest(start_time, d)) / 60))
+    FROM (
+        SELECT pet_id, active, start_time,
+               lead(start_time) OVER (ORDER BY start_time, id) AS end_time
+        FROM activity_state_logs
+        WHERE pet_id = :pet_id
+          AND start_time >= coalesce(
+              (SELECT max(start_time) FROM activity_state_logs WHERE pet_id = :pet_id AND start_time < :lo), :lo)
+          AND start_time <= coalesce(
+              (SELECT min(start_time) FROM activity_state_logs WHERE pet_id = :pet_id AND start_time >= :hi), :hi)
+    ) AS intervals
+    CROSS JOIN LATERAL generate_series(date_trunc('day', start_time), end_time, interval '1 day') AS d
+    WHERE active AND end_time IS NOT NULL AND d >= :lo AND d < :hi
+    GROUP BY pet_id, d::date
+    ON CONFLICT (pet_id, day) DO UPDATE SET active_minutes = excluded.active_minutes
+    """
+)
+
+
+# Deltas for any number of (pet, day) rows, passed as one array per column: a multi-row VALUES would
+# take five bind parameters per row and run past asyncpg's 32767 limit on large bulk imports.
+_ADD_MANY_SQL = text(
+    """
+    INSERT INTO pet_daily_stats (pet_id, day, sleep_minutes, meals_count, active_minutes)
+    SELECT * FROM unnest(
+        CAST(:pet_ids AS INTEGER[]), CAST(:days AS DATE[]), CAST(:sleep_minutes AS INTEGER[]),
+        CAST(:meals_counts AS INTEGER[]), CAST(:active_minutes AS INTEGER[])
+    )
+    ON CONFLICT (pet_id, day) DO UPDATE SET
+        sleep_minutes = pet_daily_stats.sleep_minutes + excluded.sleep_minutes,
+        meals_count = pet_daily_stats.meals_count + excluded.meals_count,
+        active_minutes = pet_daily_stats.active_minutes + excluded.active_minutes
+    """
+)
+
+
+def _minutes_by_day(start: datetime, end: datetime) -> dict[date, int]:
+    """Split [start, end) at midnight; whole minutes per day."""
+    out: dict[date, int] = {}
+    cur = start
+    while cur < end:
+        piece_end = min(end, datetime.combine(cur.date() + timedelta(days=1), time.min))
+        out[cur.date()] = out.get(cur.date(), 0) + int((piece_end - cur).total_seconds() // 60)
+        cur = piece_end
+    return out
+
+
+class CRUDPetDailyStats:
+    """CRUD for PetDailyStats."""
+
+    async def add(
+        self,
+        db: AsyncSession,
+        *,
+        pet_id: int,
+        day: date,
+        sleep_minutes: int = 0,
+        meals_count: int = 0,
+        active_minutes: int = 0,
+    ) -> None:
+        """Add deltas to one (pet, day) row, creating it if missing."""
+        await self.add_many(
+            db,
+            [
+                {
+                    "pet_id": pet_id,
+                    "day": day,
+                    "sleep_minutes": sleep_minutes,
+                    "meals_count": meals_count,
+                    "active_minutes": active_minutes,
+                }
+            ],
+        )
+
+    async def record_activity_transition(
+        self,
+        db: AsyncSession,
+        *,
+        log: ActivityStateLog,
+        prev: ActivityStateLog | None,
+        next_start: datetime | None,
+    ) -> None:
+        """
+        Apply a newly flushed activity-state transition to active_minutes, given its neighbours
+        (the caller looks them up before inserting, holding the pet's PET_ACTIVITY lock): what prev
+        used to cover up to next_start is now covered up to log.start_time, and log covers the rest.
+        """
+        t = log.start_time
+        deltas: dict[date, int] = defaultdict(int)
+        if prev is not None and prev.active:
+            if next_start is not None:
+                for day, minutes in _minutes_by_day(prev.start_time, next_start).items():
+                    deltas[day] -= minutes
+            for day, minutes in _minutes_by_day(prev.start_time, t).items():
+                deltas[day] += minutes
+        if log.active and next_start is not None:
+            for day, minutes in _minutes_by_day(t, next_start).items():
+                deltas[day] += minutes
+
+        rows = [
+            {"pet_id": log.pet_id, "day": day, "sleep_minutes": 0, "meals_count": 0, "active_minutes": minutes}
+            for day, minutes in sorted(deltas.items())
+            if minutes
+        ]
+        if rows:
+            await self.add_many(db, rows)
+
+    async def get_range(self, db: AsyncSession, *, pet_id: int, start: date, end: date) -> Sequence[PetDailyStats]:
+        """Rows for one pet with start <= day <= end. Days without activity have no row."""
+        q = (
+            select(PetDailyStats)
+            .where(PetDailyStats.pet_id == pet_id, PetDailyStats.day >= start, PetDailyStats.day <= end)
+            .order_by(PetDailyStats.day)
+        )
+        result = await db.execute(q)
+        return result.scalars().all()
+
+    async def get_range_for_pets(
+        self, db: AsyncSession, *, pet_ids: Sequence[int], start: date, end: date
+    ) -> Sequence[PetDailyStats]:
+        """Rows for several pets in one query (pet_id = ANY(:ids)), ordered by pet then day."""
+        q = (
+            select(PetDailyStats)
+            .where(
+                PetDailyStats.pet_id == any_(literal(list(pet_ids), ARRAY(Integer))),
+                PetDailyStats.day >= start,
+                PetDailyStats.day <= end,
+            )
+            .order_by(PetDailyStats.pet_id, PetDailyStats.day)
+        )
+        result = await db.execute(q)
+        return result.scalars().all()
+
+    async def rebuild(self, db: AsyncSession, *, pet_id: int | None = None) -> None:
+        """Recompute the rollup from raw logs for one pet, or for all pets when pet_id is None."""
+        q = delete(PetDailyStats)
+        if pet_id is not None:
+            q = q.where(PetDailyStats.pet_id == pet_id)
+        await db.execute(q)
+        await db.execute(_REBUILD_SQL, {"pet_id": pet_id})
+        if pet_id is None:
+            await response_cache.clear()
+        else:
+            await response_cache.invalidate(db, pet_tag(pet_id))
+
+    async def refresh_active_minutes(self, db: AsyncSession, *, pet_id: int, since: datetime, until: datetime) -> None:
+        """
+        Recompute active_minutes after transitions with start_time in [since, until] were inserted
+        in bulk (applying them one by one would cost two queries each). The affected days run from
+        since up to the pet's next transition after until, which closes the last inserted interval;
+        only the transitions bounding that window are read, not the pet's whole history.
+        Takes the pet's PET_ACTIVITY lock (held already when called from create_many).
+        """
+        await lock_ids(db, PET_ACTIVITY, [pet_id])
+        next_start = (
+            await db.execute(
+                select(func.min(ActivityStateLog.start_time)).where(
+                    ActivityStateLog.pet_id == pet_id, ActivityStateLog.start_time > until
+                )
+            )
+        ).scalar_one_or_none()
+        start, end = since.date(), (next_start or until).date()
+        lo = datetime.combine(start, time.min)
+        hi = datetime.combine(end + timedelta(days=1), time.min)
+        await db.execute(
+            update(PetDailyStats)
+            .where(PetDailyStats.pet_id == pet_id, PetDailyStats.day >= start, PetDailyStats.day <= end)
+            .values(active_minutes=0)
+        )
+        await db.execute(_REFRESH_ACTIVE_SQL, {"pet_id": pet_id, "lo": lo, "hi": hi})
+        await response_cache.invalidate(db, pet_tag(pet_id))
+
+    async def add_many(self, db: AsyncSession, rows: list[dict]) -> None:
+        """Add deltas to several (pet, day) rows in one statement; each row needs every counter key."""
+        await db.execute(
+            _ADD_MANY_SQL,
+            {
+                "pet_ids": [row["pet_id"] for row in rows],
+                "days": [row["day"] for row in rows],
+                "sleep_minutes": [row["sleep_minutes"] for row in rows],
+                "meals_counts": [row["meals_count"] for row in rows],
+                "active_minutes": [row["active_minutes"] for row in rows],
+            },
+        )
+        await response_cache.invalidate(db, *sorted({pet_tag(row["pet_id"]) for row in rows}))
+
+
+pet_daily_stats_crud = CRUDPetDailyStats()
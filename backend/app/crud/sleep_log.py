@@ -1,46 +1,101 @@
 """CRUD for SleepLog."""
 
-from datetime import datetime, timezone
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.live_events import imported_events, live_events
+from app.core.serialization import row
+from app.crud.pet_daily_stats import pet_daily_stats_crud
+from app.db.bulk import copy_rows
+from app.db.statements import keyset_page, page_params
 from app.models.sleep_log import SleepLog
-from app.schemas.habits import SleepLogCreate
+from app.schemas.habits import SleepLogBulkItem, SleepLogCreate, SleepLogResponse
 
 
 def _naive_utc(dt: datetime | None) -> datetime | None:
     """Convert to naive UTC for TIMESTAMP WITHOUT TIME ZONE storage."""
-    if dt is None:
-        return None
-    if dt.tzinfo is not None:
-        dt = dt.astimezone(timezone.utc)
-    return dt.replace(tzinfo=None)
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _values(pet_id: int, obj_in: SleepLogCreate) -> dict:
+    """Column values for a new sleep log; duration is derived from ended_at when not given."""
+    duration = obj_in.duration_minutes
+    if obj_in.ended_at and not duration:
+        delta = obj_in.ended_at - obj_in.started_at
+        duration = int(delta.total_seconds() / 60)
+    return {
+        "pet_id": pet_id,
+        "started_at": _naive_utc(obj_in.started_at),
+        "ended_at": _naive_utc(obj_in.ended_at),
+        "duration_minutes": duration,
+        "notes": obj_in.notes,
+        "source": obj_in.source,
+    }
+
+
+# COPY columns of create_many, in _record order
+_COLUMNS = ("pet_id", "started_at", "ended_at", "duration_minutes", "notes", "source")
+
+
+def _record(item: SleepLogBulkItem) -> tuple:
+    """_values of a validated bulk item, as a COPY record."""
+    started_at, ended_at, duration = item["started_at"], item["ended_at"], item["duration_minutes"]
+    if ended_at and not duration:
+        duration = int((ended_at - started_at).total_seconds() / 60)
+    return (item["pet_id"], _naive_utc(started_at), _naive_utc(ended_at), duration, item["notes"], item["source"])
+
+
+@lru_cache
+def _list_statement(since: bool, until: bool, after: bool) -> Select:
+    """Core SELECT for get_multi, built once per combination of filters."""
+    c = SleepLog.__table__.c
+    q = select(*SleepLog.__table__.c).where(c.pet_id == bindparam("pet_id"))
+    if since:
+        q = q.where(c.started_at >= bindparam("since"))
+    if until:
+        q = q.where(c.started_at <= bindparam("until"))
+    return keyset_page(q, c.started_at, c.id, after=after)
 
 
 class CRUDSleepLog:
     """CRUD for SleepLog."""
 
     async def create(self, db: AsyncSession, *, pet_id: int, obj_in: SleepLogCreate) -> SleepLog:
-        started = _naive_utc(obj_in.started_at)
-        ended = _naive_utc(obj_in.ended_at)
-        log = SleepLog(
-            pet_id=pet_id,
-            started_at=started,
-            ended_at=ended,
-            duration_minutes=obj_in.duration_minutes,
-            notes=obj_in.notes,
-            source=obj_in.source,
-        )
-        if obj_in.ended_at and not obj_in.duration_minutes:
-            delta = obj_in.ended_at - obj_in.started_at
-            log.duration_minutes = int(delta.total_seconds() / 60)
+        log = SleepLog(**_values(pet_id, obj_in))
         db.add(log)
         await db.flush()
-        await db.refresh(log)
+        await pet_daily_stats_crud.add(
+            db, pet_id=pet_id, day=log.started_at.date(), sleep_minutes=log.duration_minutes or 0
+        )
+        await live_events.publish(db, pet_id, "sleep_log", row(SleepLogResponse, log))
         return log
 
+    async def create_many(self, db: AsyncSession, *, items: Sequence[SleepLogBulkItem]) -> int:
+        """Insert validated bulk items with COPY and update the daily rollup. Returns the count."""
+        records = [_record(item) for item in items]
+        if not records:
+            return 0
+        await copy_rows(db, SleepLog.__table__, _COLUMNS, records)
+        totals: dict[tuple[int, date], int] = defaultdict(int)
+        for pet_id, started_at, _, duration, _, _ in records:
+            totals[(pet_id, started_at.date())] += duration or 0
+        await pet_daily_stats_crud.add_many(
+            db,
+            [
+                {"pet_id": pet_id, "day": day, "sleep_minutes": minutes, "meals_count": 0, "active_minutes": 0}
+                for (pet_id, day), minutes in sorted(totals.items())
+            ],
+        )
+        await live_events.publish_many(db, imported_events("sleep_log", (r[:2] for r in records)))
+        return len(records)
+
     async def get_multi(
         self,
         db: AsyncSession,
@@ -48,17 +103,15 @@ class CRUDSleepLog:
         pet_id: int,
         since: datetime | None = None,
         until: datetime | None = None,
+        after: tuple[datetime, int] | None = None,
         skip: int = 0,
         limit: int = 100,
-    ) -> Sequence[SleepLog]:
-        q = select(SleepLog).where(SleepLog.pet_id == pet_id)
-        if since is not None:
-            q = q.where(SleepLog.started_at >= since)
-        if until is not None:
-            q = q.where(SleepLog.started_at <= until)
-        q = q.order_by(SleepLog.started_at.desc()).offset(skip).limit(limit)
-        result = await db.execute(q)
-        return result.scalars().all()
-
+    ) -> Sequence[Row]:
+        """Logs newest first as Row tuples (SleepLog columns by name); `after` continues a keyset cursor."""
+        params = page_params(after, skip, limit)
+        params.update(pet_id=pet_id, since=_naive_utc(since), until=_naive_utc(until))
+        q = _list_statement(since is not None, until is not None, after is not None)
+        result = await db.execute(q, params)
+        return result.all()
 
 sleep_log_crud = CRUDSleepLog()
@@ -2,27 +2,80 @@
 
 from typing import Sequence
 
-from sqlalchemy import select
+from sqlalchemy import Integer, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.core.security import get_password_hash
+from app.core.principal_cache import principal_cache
+from app.core.security import aget_password_hash, averify_password, password_needs_rehash
+from app.crud.loading import UserProfile, user_load_options
+from app.models.pet import Pet
 from app.models.user import User
+from app.models.user_pet import user_pets
 from app.schemas.user import UserCreate, UserUpdate
 
 
 class CRUDUser:
     """CRUD for User model."""
 
-    async def get(self, db: AsyncSession, *, id: int) -> User | None:
-        """Get a user by id."""
-        result = await db.execute(select(User).where(User.id == id))
+    async def get(self, db: AsyncSession, *, id: int, profile: UserProfile = "lean") -> User | None:
+        """Get a user by id. Collections are loaded only if the profile asks for them."""
+        result = await db.execute(select(User).where(User.id == id).options(*user_load_options(profile)))
         return result.scalar_one_or_none()
 
-    async def get_by_email(self, db: AsyncSession, *, email: str) -> User | None:
+    async def get_by_email(self, db: AsyncSession, *, email: str, profile: UserProfile = "lean") -> User | None:
         """Get a user by email."""
-        result = await db.execute(select(User).where(User.email == email))
+        result = await db.execute(select(User).where(User.email == email).options(*user_load_options(profile)))
         return result.scalar_one_or_none()
 
+    async def check_password(self, db: AsyncSession, *, user: User, password: str) -> bool:
+        """
+        Verify password against the user's hash on the hashing pool. On success, a hash made with an
+        outdated cost factor is replaced with one at the configured bcrypt_rounds (the plain
+        password is only available at login).
+        """
+        if not await averify_password(password, user.hashed_password):
+            return False
+        if password_needs_rehash(user.hashed_password):
+            user.hashed_password = await aget_password_hash(password)
+            await db.flush()
+        return True
+
+    async def get_with_pet_ids(self, db: AsyncSession, *, id: int) -> tuple[User, list[int]] | None:
+        """User columns plus the ids of all linked pets, in one query (authentication)."""
+        pet_ids = select(func.array_agg(user_pets.c.pet_id)).where(user_pets.c.user_id == User.id).scalar_subquery()
+        row = (await db.execute(select(User, pet_ids).where(User.id == id))).first()
+        if row is None:
+            return None
+        return row[0], sorted(row[1] or [])
+
+    async def load_linked_pets(self, db: AsyncSession, *, user: User) -> User:
+        """Populate linked_pets on an already-loaded user with one query (no re-select of the user row)."""
+        if "linked_pets" not in user.__dict__:
+            result = await db.execute(
+                select(Pet).join(user_pets, user_pets.c.pet_id == Pet.id).where(user_pets.c.user_id == user.id)
+            )
+            set_committed_value(user, "linked_pets", list(result.scalars().all()))
+        return user
+
+    async def link_pet(self, db: AsyncSession, *, user_id: int, pet_id: int) -> bool:
+        """
+        Link a pet to the user's account with a single INSERT ... SELECT ... ON CONFLICT DO NOTHING
+        (no collection load). Returns False if nothing was inserted: the link already existed or
+        there is no such user. The user's cached principal is dropped when a link is added.
+        """
+        stmt = (
+            insert(user_pets)
+            .from_select(["user_id", "pet_id"], select(User.id, literal(pet_id, Integer)).where(User.id == user_id))
+            .on_conflict_do_nothing(index_elements=[user_pets.c.user_id, user_pets.c.pet_id])
+            .returning(user_pets.c.pet_id)
+        )
+        linked = (await db.execute(stmt)).scalar_one_or_none() is not None
+        if linked:
+            principal_cache.invalidate_user(user_id, db)
+        return linked
+
     async def get_multi(
         self,
         db: AsyncSession,
@@ -39,25 +92,24 @@ class CRUDUser:
         user = User(
             name=obj_in.name,
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await aget_password_hash(obj_in.password),
             display_name=obj_in.display_name,
             slack_webhook_url=obj_in.slack_webhook_url,
             slack_channel=obj_in.slack_channel,
         )
         db.add(user)
         await db.flush()
-        await db.refresh(user)
         return user
 
     async def update(self, db: AsyncSession, *, db_obj: User, obj_in: UserUpdate) -> User:
         """Update a user. Hashes password if provided."""
         data = obj_in.model_dump(exclude_unset=True)
         if "password" in data:
-            data["hashed_password"] = get_password_hash(data.pop("password"))
+            data["hashed_password"] = await aget_password_hash(data.pop("password"))
         for field, value in data.items():
             setattr(db_obj, field, value)
         await db.flush()
-        await db.refresh(db_obj)
+        principal_cache.invalidate_user(db_obj.id, db)
         return db_obj
 
     async def delete(self, db: AsyncSession, *, id: int) -> bool:
@@ -67,6 +119,7 @@ class CRUDUser:
             return False
         await db.delete(user)
         await db.flush()
+        principal_cache.invalidate_user(id, db)
         return True
 
 
@@ -6,4 +6,6 @@ from sqlalchemy.orm import DeclarativeBase, MappedAsDataclass
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
 
-    pass
+    # INSERT/UPDATE ... RETURNING brings back server-generated values (ids, created_at, updated_at)
+    # in the same statement, so a flushed object is complete without a refresh() round trip.
+    __mapper_args__ = {"eager_defaults": True}
@@ -0,0 +1,20 @@
+"""Bulk row loading with PostgreSQL COPY."""
+
+from typing import Any, Iterable, Sequence
+
+from sqlalchemy import Table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def copy_rows(db: AsyncSession, table: Table, columns: Sequence[str], records: Iterable[tuple[Any, ...]]) -> None:
+    """
+    COPY records (tuples of the listed columns' values) into table on the session's connection
+    (same transaction as the rest of the request). Columns not listed get their server defaults
+    (ids, created_at). Far faster than a multi-row INSERT for thousands of rows; ORM events and
+    Python-side defaults do not run.
+    """
+    conn = await db.connection()
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        table.name, columns=list(columns), records=records, schema_name=table.schema
+    )
@@ -0,0 +1,27 @@
+"""Transaction-scoped advisory locks that serialize read-then-write updates per row."""
+
+from typing import Iterable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# First key of pg_advisory_xact_lock(int, int): which kind of update the second key (an id) is for
+PET_ACTIVITY = 1
+
+# Locks taken in id order, so two transactions locking overlapping sets cannot deadlock
+_LOCK_SQL = text(
+    """
+    SELECT pg_advisory_xact_lock(:kind, id)
+    FROM (SELECT DISTINCT unnest(CAST(:ids AS INTEGER[])) AS id ORDER BY id) AS ids
+    """
+)
+
+
+async def lock_ids(db: AsyncSession, kind: int, ids: Iterable[int]) -> None:
+    """
+    Hold the kind lock for each id until db's transaction ends (one round trip; re-locking an id
+    this transaction already holds returns at once). Readers are not blocked.
+    """
+    ids = sorted(set(ids))
+    if ids:
+        await db.execute(_LOCK_SQL, {"kind": kind, "ids": ids})
@@ -0,0 +1,104 @@
+"""Monthly range partitions (PostgreSQL declarative partitioning).
+
+A table partitioned by RANGE on a timestamp column gets one partition per calendar month, named
+<table>_pYYYY_MM, plus <table>_default for rows outside every month partition (very old or far
+future timestamps), so an insert never fails for lack of a partition. Queries with a time range
+only touch the matching months, and expiring a month is a DROP TABLE: no DELETE, no dead tuples,
+nothing left for VACUUM.
+
+ensure_monthly_partitions pre-creates upcoming months (run it from a periodic job, e.g.
+scripts/maintain_activity_logs.py). Rows that already landed in the default partition for a
+month are moved into the new partition before it is attached.
+"""
+
+import re
+from datetime import date, datetime
+
+from sqlalchemy import Table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+_CHILDREN_SQL = text(
+    """
+    SELECT c.relname
+    FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = CAST(:table AS regclass)
+    """
+)
+
+
+def month_start(d: date | datetime) -> date:
+    """First day of d's month."""
+    return date(d.year, d.month, 1)
+
+
+def add_months(month: date, n: int) -> date:
+    """First day of the month n months after month (n may be negative)."""
+    index = month.year * 12 + month.month - 1 + n
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: Table, month: date) -> str:
+    """Name of table's partition for month."""
+    return f"{table.name}_p{month.year:04d}_{month.month:02d}"
+
+
+def default_partition_name(table: Table) -> str:
+    """Name of table's catch-all partition."""
+    return f"{table.name}_default"
+
+
+async def month_partitions(db: AsyncSession, table: Table) -> dict[date, str]:
+    """Existing month partitions of table by month, oldest first."""
+    pattern = re.compile(rf"^{re.escape(table.name)}_p(\d{{4}})_(\d{{2}})$")
+    names = (await db.execute(_CHILDREN_SQL, {"table": table.name})).scalars().all()
+    found = {date(int(m[1]), int(m[2]), 1): name for name in names if (m := pattern.match(name))}
+    return dict(sorted(found.items()))
+
+
+async def ensure_monthly_partitions(
+    db: AsyncSession, table: Table, column: str, *, start: date, months: int
+) -> list[str]:
+    """
+    Create the missing month partitions of table for `months` months from start's month.
+    Each is created detached, filled with the default partition's rows for that month and then
+    attached, so those rows do not block the attach. Returns the names of the created partitions.
+    """
+    existing = await month_partitions(db, table)
+    default = default_partition_name(table)
+    created = []
+    for i in range(months):
+        month = add_months(month_start(start), i)
+        if month in existing:
+            continue
+        name = partition_name(table, month)
+        bounds = {
+            "lo": datetime.combine(month, datetime.min.time()),
+            "hi": datetime.combine(add_months(month, 1), datetime.min.time()),
+        }
+        await db.execute(text(f'CREATE TABLE "{name}" (LIKE "{table.name}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+        await db.execute(
+            text(
+                f'WITH moved AS (DELETE FROM "{default}" WHERE "{column}" >= :lo AND "{column}" < :hi RETURNING *) '
+                f'INSERT INTO "{name}" SELECT * FROM moved'
+            ),
+            bounds,
+        )
+        await db.execute(
+            text(
+                f'ALTER TABLE "{table.name}" ATTACH PARTITION "{name}" '
+                f"FOR VALUES FROM ('{bounds['lo'].isoformat()}') TO ('{bounds['hi'].isoformat()}')"
+            )
+        )
+        created.append(name)
+    return created
+
+
+async def drop_partitions_before(db: AsyncSession, table: Table, before: date) -> list[str]:
+    """Drop table's month partitions that end on or before `before`. Returns the dropped names."""
+    dropped = []
+    for month, name in (await month_partitions(db, table)).items():
+        if add_months(month, 1) > before:
+            break
+        await db.execute(text(f'DROP TABLE "{name}"'))
+        dropped.append(name)
+    return dropped
@@ -0,0 +1,60 @@
+"""Connection pool instrumentation: checkout wait times and pool occupancy."""
+
+import time
+from typing import Any
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool that records how long each checkout waits for a connection (including
+    opening a new one) and how many checkouts timed out because the pool was exhausted.
+    """
+
+    def __init__(self, *args: Any, **kw: Any) -> None:
+        super().__init__(*args, **kw)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - t0
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+
+def pool_stats(engine: AsyncEngine) -> dict[str, Any]:
+    """Snapshot of the engine's pool: occupancy, overflow in use and checkout wait times."""
+    pool = engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return {"pool": type(pool).__name__}
+    # overflow() counts from -size: negative while some of the pool_size slots were never opened
+    overflow = pool.overflow()
+    stats: dict[str, Any] = {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "open": pool.size() + overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(overflow, 0),
+    }
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats.update(
+            checkouts=pool.checkouts,
+            timeouts=pool.timeouts,
+            wait_avg_ms=round(pool.wait_total / pool.checkouts * 1000, 3) if pool.checkouts else 0.0,
+            wait_max_ms=round(pool.wait_max * 1000, 3),
+        )
+    return stats
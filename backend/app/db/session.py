@@ -1,19 +1,28 @@
 """Async database session and engine."""
 
+import asyncio
+import logging
 import ssl
+import uuid
 from collections.abc import AsyncGenerator
+from contextlib import AsyncExitStack
 from typing import AsyncContextManager
 from typing import Any
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
+import asyncpg
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 from app.db.base import Base
+from app.db.pool import InstrumentedAsyncQueuePool
+
+logger = logging.getLogger(__name__)
 
 # asyncpg does not accept these as connect() kwargs; strip from URL and handle ssl via connect_args
 _ASYNCPG_STRIP_QUERY = (
@@ -46,14 +55,45 @@ def _url_and_connect_args_for_asyncpg(url: str) -> tuple[str, dict[str, Any]]:
     return clean, connect_args
 
 
+def _statement_cache_connect_args(settings: Settings) -> dict[str, Any]:
+    """
+    asyncpg prepared statement caching. Behind PgBouncer (transaction/statement pooling) a client
+    may land on a different server connection per transaction, so cached and numbered statements
+    are not safe: disable both caches and give every statement a unique name.
+    """
+    if settings.database_pgbouncer:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.database_statement_cache_size,
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+    }
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    """Async engine with the configured pool and statement cache settings."""
+    db_url, connect_args = _url_and_connect_args_for_asyncpg(url)
+    return create_async_engine(
+        db_url,
+        echo=settings.debug,
+        future=True,
+        connect_args={**connect_args, **_statement_cache_connect_args(settings)},
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=settings.database_pool_pre_ping,
+    )
+
+
 settings = get_settings()
-_db_url, _connect_args = _url_and_connect_args_for_asyncpg(settings.database_url_asyncpg)
-engine = create_async_engine(
-    _db_url,
-    echo=settings.debug,
-    future=True,
-    connect_args=_connect_args,
-)
+engine = _create_engine(settings.database_url_asyncpg)
+# Read replica for ReadDbSession; the primary itself when no replica is configured
+read_engine = _create_engine(settings.database_read_url_asyncpg) if settings.database_read_url_asyncpg else engine
 
 async_session_maker = async_sessionmaker(
     engine,
@@ -63,6 +103,62 @@ async_session_maker = async_sessionmaker(
     autoflush=False,
 )
 
+# Sessions on read_engine start BEGIN READ ONLY; the option is reset when the connection returns to the pool
+read_session_maker = async_sessionmaker(
+    read_engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+# Read-only sessions that always use the primary: for reads whose results are cached (see
+# app.core.response_cache), where replica lag would outlast the invalidation
+primary_read_session_maker = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+
+async def warm_pool(connections: int | None = None) -> int:
+    """
+    Open `connections` (default: database_pool_size) pooled connections concurrently and return
+    them to the pool (per engine: primary and read replica), so the first requests after startup do not pay connect/TLS latency.
+    Returns how many were opened; failures are logged rather than raised so the app still starts
+    while the database is unreachable.
+    """
+    count = settings.database_pool_size if connections is None else connections
+    opened = 0
+    for eng in {engine, read_engine}:
+        try:
+            async with AsyncExitStack() as stack:
+                await asyncio.gather(*(stack.enter_async_context(eng.connect()) for _ in range(count)))
+            opened += count
+        except Exception as e:
+            logger.warning("Connection pool warm-up failed for %s: %s", eng.url.render_as_string(), e)
+    return opened
+
+
+async def connect_listener() -> asyncpg.Connection:
+    """
+    Dedicated asyncpg connection (outside the pool) for LISTEN, on DATABASE_LISTEN_URL or the
+    primary. It stays open for the life of the process, so it must not go through PgBouncer in
+    transaction/statement mode.
+    """
+    url, connect_args = _url_and_connect_args_for_asyncpg(
+        settings.database_listen_url.strip() or settings.database_url_asyncpg
+    )
+    return await asyncpg.connect(url.replace("postgresql+asyncpg://", "postgresql://", 1), **connect_args)
+
+
+async def dispose_engines() -> None:
+    """Close all pooled connections (primary and replica)."""
+    for eng in {engine, read_engine}:
+        await eng.dispose()
+
 
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """Yield a single async session (for use outside Depends if needed)."""
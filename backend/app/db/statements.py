@@ -0,0 +1,34 @@
+"""Prebuilt Core SELECTs for the hot list reads (log lists, community feed).
+
+Those endpoints only serialize a few columns, so they select table columns rather than ORM
+entities: rows come back as plain Row tuples (attribute access by column name) with no identity
+map, instance state or relationship bookkeeping. Each CRUD builds its statement once per filter
+combination (functools.lru_cache) with every value as a bindparam, so a call neither rebuilds the
+select() nor recomputes its cache key, and SQLAlchemy's compiled cache always hits.
+"""
+
+from typing import Any
+
+from sqlalchemy import ColumnElement, Integer, Select, bindparam, tuple_
+
+
+def keyset_page(q: Select, key: ColumnElement, id_col: ColumnElement, *, after: bool) -> Select:
+    """
+    Newest-first page of q ordered by (key, id), with :skip and :limit bound at execute time.
+    When after is set, only rows strictly before (:after_key, :after_id) (keyset cursor).
+    """
+    if after:
+        q = q.where(tuple_(key, id_col) < tuple_(bindparam("after_key"), bindparam("after_id")))
+    return (
+        q.order_by(key.desc(), id_col.desc())
+        .offset(bindparam("skip", type_=Integer))
+        .limit(bindparam("limit", type_=Integer))
+    )
+
+
+def page_params(after: tuple[Any, int] | None, skip: int, limit: int) -> dict[str, Any]:
+    """Bind values for keyset_page."""
+    params: dict[str, Any] = {"skip": skip, "limit": limit}
+    if after is not None:
+        params["after_key"], params["after_id"] = after
+    return params
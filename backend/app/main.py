@@ -1,6 +1,7 @@
 """FastAPI application entry point."""
 
 import asyncio
+import gc
 import logging
 from contextlib import asynccontextmanager
 from typing import Any, AsyncGenerator
@@ -15,17 +16,28 @@ logger = logging.getLogger(__name__)
 from app import __version__
 from app.api.v1.router import api_router
 from app.config import get_settings
-from app.db.session import async_session_maker
+from app.core.live_events import live_events
+from app.core.response_cache import response_cache
+from app.db.pool import pool_stats
+from app.db.session import async_session_maker, dispose_engines, engine, read_engine, warm_pool
 from app.services.storage import get_storage
+from app.services.storage.base import run_io
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Startup and shutdown events."""
-    # Startup: e.g. connect DB, load caches
+    # Startup: open the pool's persistent connections before taking traffic
+    await warm_pool()
+    # Everything loaded so far (modules, routes, schemas, mappers) lives as long as the process:
+    # keep it out of the collector, or every full collection re-scans it. Requests that allocate a
+    # lot, such as a bulk ingest, trigger one every request or two.
+    gc.freeze()
     yield
-    # Shutdown: e.g. close DB pool
-    pass
+    # Shutdown: close pooled connections
+    await live_events.close()
+    await dispose_engines()
+    await response_cache.close()
 
 
 def create_application() -> FastAPI:
@@ -90,13 +102,30 @@ def create_application() -> FastAPI:
             try:
                 storage = get_storage()
                 client = storage._get_client()
-                client.head_bucket(Bucket=storage.bucket)
+                await run_io(lambda: client.head_bucket(Bucket=storage.bucket))
                 result["spaces"] = {"ok": True}
             except Exception as e:
                 result["spaces"] = {"ok": False, "error": str(e)}
 
         return result
 
+    @app.get("/api/health/pool", tags=["Health"])
+    async def health_pool() -> dict[str, Any]:
+        """
+        Database connection pool pressure: connections open / checked out / in overflow, plus
+        checkout count, timeouts and average / max wait for a connection since startup.
+        The read replica pool (DATABASE_READ_URL) is reported under "replica" when configured.
+        """
+        stats = pool_stats(engine)
+        if read_engine is not engine:
+            stats["replica"] = pool_stats(read_engine)
+        return stats
+
+    @app.get("/api/health/cache", tags=["Health"])
+    async def health_cache() -> dict[str, Any]:
+        """Response cache (dashboard stats/calendar) backend, hits / misses and hit ratio per endpoint since startup."""
+        return response_cache.stats()
+
     return app
 
 
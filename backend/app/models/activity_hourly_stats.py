@@ -0,0 +1,27 @@
+"""Activity hourly stats - per-pet, per-hour rollup of expired activity-state transitions."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ActivityHourlyStats(Base):
+    """
+    One row per pet and hour (start of the hour): seconds spent active and transitions started.
+    Written when raw activity_state_logs partitions expire (see app.crud.activity_state_log), so
+    history past the retention period keeps its shape at hourly resolution. An interval is
+    attributed to the transition that started it, including the part after the expired month.
+    """
+
+    __tablename__ = "activity_hourly_stats"
+
+    pet_id: Mapped[int] = mapped_column(ForeignKey("pets.id", ondelete="CASCADE"), primary_key=True)
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    active_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    transitions: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"<ActivityHourlyStats(pet_id={self.pet_id}, hour={self.hour})>"
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -10,16 +10,31 @@ from app.models.base import TimestampMixin
 
 
 class ActivityStateLog(Base, TimestampMixin):
-    """One activity state change: active (True) or resting (False) at start_time."""
+    """
+    One activity state change: active (True) or resting (False) at start_time.
+    Partitioned by month of start_time (see app.db.partitions), so the primary key includes it;
+    months past the retention period are rolled up into ActivityHourlyStats and dropped.
+    """
 
     __tablename__ = "activity_state_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (start_time)"}
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
-    pet_id: Mapped[int] = mapped_column(ForeignKey("pets.id", ondelete="CASCADE"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    pet_id: Mapped[int] = mapped_column(ForeignKey("pets.id", ondelete="CASCADE"), nullable=False)
     active: Mapped[bool] = mapped_column(Boolean, nullable=False)
-    start_time: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    start_time: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
 
     pet: Mapped["Pet"] = relationship("Pet", back_populates="activity_state_logs")
 
     def __repr__(self) -> str:
         return f"<ActivityStateLog(id={self.id}, pet_id={self.pet_id}, active={self.active}, start_time={self.start_time})>"
+
+
+# Serves get_multi: pet_id filter + start_time range, newest first, keyset cursor on (start_time, id).
+# Also the pet_id index for the pets foreign key (ON DELETE CASCADE).
+Index(
+    "ix_activity_state_logs_pet_id_start_time_id",
+    ActivityStateLog.pet_id,
+    ActivityStateLog.start_time.desc(),
+    ActivityStateLog.id.desc(),
+)
@@ -1,6 +1,6 @@
 """Community post model - user posts with optional pet and media."""
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -23,3 +23,7 @@ class CommunityPost(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<CommunityPost(id={self.id}, user_id={self.user_id})>"
+
+
+# Serves the community feed: newest first, keyset cursor on (created_at, id)
+Index("ix_community_posts_created_at_id", CommunityPost.created_at.desc(), CommunityPost.id.desc())
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -14,8 +14,8 @@ class EatingLog(Base, TimestampMixin):
 
     __tablename__ = "eating_logs"
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
-    pet_id: Mapped[int] = mapped_column(ForeignKey("pets.id", ondelete="CASCADE"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    pet_id: Mapped[int] = mapped_column(ForeignKey("pets.id", ondelete="CASCADE"), nullable=False)
     occurred_at: Mapped[datetime] = mapped_column(nullable=False)
     meal_type: Mapped[str] = mapped_column(String(32), nullable=False)  # breakfast, lunch, dinner, snack
     amount: Mapped[str | None] = mapped_column(String(128), nullable=True)  # e.g. "1 cup", "half bowl"
@@ -26,3 +26,7 @@ class EatingLog(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<EatingLog(id={self.id}, pet_id={self.pet_id}, meal_type={self.meal_type!r})>"
+
+
+# Serves get_multi: pet_id filter + occurred_at range, newest first, keyset cursor on (occurred_at, id)
+Index("ix_eating_logs_pet_id_occurred_at_id", EatingLog.pet_id, EatingLog.occurred_at.desc(), EatingLog.id.desc())
@@ -0,0 +1,24 @@
+"""Media blob model - one stored file per distinct content, shared by every MediaFile with that content."""
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.base import TimestampMixin
+
+
+class MediaBlob(Base, TimestampMixin):
+    """
+    A file in storage under a content-addressed key (its SHA-256), shared by the media_files rows
+    pointing at it; once none do, scripts/sweep_media_blobs.py deletes it (file and row).
+    updated_at is its last acquire (see app.crud.media_blob).
+    """
+
+    __tablename__ = "media_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    storage_key: Mapped[str] = mapped_column(String(512), nullable=False, unique=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<MediaBlob(sha256={self.sha256}, storage_key={self.storage_key})>"
@@ -1,6 +1,6 @@
 """Media file model - metadata only. File content is in file storage (local or DO Spaces), never in Postgres."""
 
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import ForeignKey, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -20,9 +20,14 @@ class MediaFile(Base, TimestampMixin):
     )
     file_type: Mapped[str] = mapped_column(String(32), nullable=False)  # image, audio, video, document
     mime_type: Mapped[str] = mapped_column(String(128), nullable=False)
-    storage_key: Mapped[str] = mapped_column(String(512), nullable=False, unique=True)  # relative path or DO key
+    # Relative path or DO key. Shared by files with the same content (content-addressed blob key)
+    storage_key: Mapped[str] = mapped_column(String(512), nullable=False, index=True)
     storage_backend: Mapped[str] = mapped_column(String(32), nullable=False, default="local")  # local, digitalocean
     file_size_bytes: Mapped[int | None] = mapped_column(nullable=True)
+    # Content hash of the shared blob holding the file (None for files stored under their own key)
+    content_sha256: Mapped[str | None] = mapped_column(
+        String(64), ForeignKey("media_blobs.sha256"), nullable=True, index=True
+    )
 
     owner: Mapped["User"] = relationship("User", back_populates="media_files")
     vet_visit: Mapped["VetVisit | None"] = relationship(
@@ -31,3 +36,25 @@ class MediaFile(Base, TimestampMixin):
     activities: Mapped[list["Activity"]] = relationship(
         "Activity", back_populates="media_file", foreign_keys="Activity.media_file_id"
     )
+
+
+# Serves latest image / documents per pet
+Index("ix_media_files_pet_id_file_type_id", MediaFile.pet_id, MediaFile.file_type, MediaFile.id.desc())
+
+# Serves the medical records list (documents only): newest first, keyset cursor on (created_at, id)
+Index(
+    "ix_media_files_pet_id_documents_created_at_id",
+    MediaFile.pet_id,
+    MediaFile.created_at.desc(),
+    MediaFile.id.desc(),
+    postgresql_where=MediaFile.file_type == "document",
+)
+
+# A file stored under its own key (direct upload) is registered once, however many completions
+# race; content-addressed blob keys are shared, so only rows without a blob are unique
+Index(
+    "ix_media_files_direct_storage_key",
+    MediaFile.storage_key,
+    unique=True,
+    postgresql_where=MediaFile.content_sha256.is_(None),
+)
@@ -14,7 +14,7 @@ class Pet(Base, TimestampMixin):
     __tablename__ = "pets"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
-    owner_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
+    owner_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     species: Mapped[str] = mapped_column(String(100), nullable=False)
     breed: Mapped[str | None] = mapped_column(String(100), nullable=True)
@@ -22,22 +22,40 @@ class Pet(Base, TimestampMixin):
     date_of_birth: Mapped[str | None] = mapped_column(String(20), nullable=True)  # or approximate age string
     weight: Mapped[float | None] = mapped_column(Float, nullable=True)  # weight in lbs
     health_notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Current profile picture (maintained on upload; SET NULL when the media row is deleted)
+    profile_media_id: Mapped[int | None] = mapped_column(
+        ForeignKey("media_files.id", ondelete="SET NULL", use_alter=True, name="pets_profile_media_id_fkey"),
+        nullable=True,
+    )
 
     owner: Mapped["User | None"] = relationship("User", back_populates="pets")
+    # Collections are never loaded implicitly; opt in via a profile from app.crud.loading.
     linked_users: Mapped[list["User"]] = relationship(
-        "User", secondary=user_pets, back_populates="linked_pets", lazy="selectin"
+        "User", secondary=user_pets, back_populates="linked_pets", lazy="raise_on_sql", passive_deletes=True
+    )
+    activities: Mapped[list["Activity"]] = relationship(
+        "Activity", back_populates="pet", lazy="raise_on_sql", passive_deletes=True
+    )
+    milestones: Mapped[list["Milestone"]] = relationship(
+        "Milestone", back_populates="pet", lazy="raise_on_sql", passive_deletes=True
+    )
+    llm_outputs: Mapped[list["LLMOutput"]] = relationship(
+        "LLMOutput", back_populates="pet", lazy="raise_on_sql", passive_deletes=True
+    )
+    sleep_logs: Mapped[list["SleepLog"]] = relationship(
+        "SleepLog", back_populates="pet", lazy="raise_on_sql", passive_deletes=True
+    )
+    eating_logs: Mapped[list["EatingLog"]] = relationship(
+        "EatingLog", back_populates="pet", lazy="raise_on_sql", passive_deletes=True
     )
-    activities: Mapped[list["Activity"]] = relationship("Activity", back_populates="pet", lazy="selectin")
-    milestones: Mapped[list["Milestone"]] = relationship("Milestone", back_populates="pet", lazy="selectin")
-    llm_outputs: Mapped[list["LLMOutput"]] = relationship("LLMOutput", back_populates="pet", lazy="selectin")
-    sleep_logs: Mapped[list["SleepLog"]] = relationship("SleepLog", back_populates="pet", lazy="selectin")
-    eating_logs: Mapped[list["EatingLog"]] = relationship("EatingLog", back_populates="pet", lazy="selectin")
     activity_state_logs: Mapped[list["ActivityStateLog"]] = relationship(
-        "ActivityStateLog", back_populates="pet", lazy="selectin"
+        "ActivityStateLog", back_populates="pet", lazy="raise_on_sql", passive_deletes=True
+    )
+    vet_visits: Mapped[list["VetVisit"]] = relationship(
+        "VetVisit", back_populates="pet", lazy="raise_on_sql", passive_deletes=True
     )
-    vet_visits: Mapped[list["VetVisit"]] = relationship("VetVisit", back_populates="pet", lazy="selectin")
     community_posts: Mapped[list["CommunityPost"]] = relationship(
-        "CommunityPost", back_populates="pet", lazy="selectin"
+        "CommunityPost", back_populates="pet", lazy="raise_on_sql", passive_deletes=True
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,27 @@
+"""Pet daily stats - per-pet, per-day activity rollup for dashboards and calendars."""
+
+from datetime import date
+
+from sqlalchemy import Date, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class PetDailyStats(Base):
+    """
+    One row per pet and day: total sleep minutes, meals, and active minutes.
+    Derived from sleep, eating and activity-state logs; maintained by their CRUD create methods
+    (see app.crud.pet_daily_stats) and rebuildable from the raw logs.
+    """
+
+    __tablename__ = "pet_daily_stats"
+
+    pet_id: Mapped[int] = mapped_column(ForeignKey("pets.id", ondelete="CASCADE"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    sleep_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    meals_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    active_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"<PetDailyStats(pet_id={self.pet_id}, day={self.day})>"
@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -14,8 +14,8 @@ class SleepLog(Base, TimestampMixin):
 
     __tablename__ = "sleep_logs"
 
-    id: Mapped[int] = mapped_column(primary_key=True, index=True, autoincrement=True)
-    pet_id: Mapped[int] = mapped_column(ForeignKey("pets.id", ondelete="CASCADE"), nullable=False, index=True)
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    pet_id: Mapped[int] = mapped_column(ForeignKey("pets.id", ondelete="CASCADE"), nullable=False)
     started_at: Mapped[datetime] = mapped_column(nullable=False)
     ended_at: Mapped[datetime | None] = mapped_column(nullable=True)
     duration_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -26,3 +26,7 @@ class SleepLog(Base, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<SleepLog(id={self.id}, pet_id={self.pet_id}, started_at={self.started_at})>"
+
+
+# Serves get_multi: pet_id filter + started_at range, newest first, keyset cursor on (started_at, id)
+Index("ix_sleep_logs_pet_id_started_at_id", SleepLog.pet_id, SleepLog.started_at.desc(), SleepLog.id.desc())
@@ -21,14 +21,21 @@ class User(Base, TimestampMixin):
     slack_webhook_url: Mapped[str | None] = mapped_column(String(512), nullable=True)
     slack_channel: Mapped[str | None] = mapped_column(String(128), nullable=True)
 
-    # Pets this user owns (primary owner via Pet.owner_id)
-    pets: Mapped[list["Pet"]] = relationship("Pet", back_populates="owner", lazy="selectin")
+    # Collections are never loaded implicitly; opt in via a profile from app.crud.loading.
+    # Pets this user owns (primary owner via Pet.owner_id; ON DELETE SET NULL keeps them, ownerless)
+    pets: Mapped[list["Pet"]] = relationship(
+        "Pet", back_populates="owner", lazy="raise_on_sql", passive_deletes=True
+    )
     # All pets this user has access to (owned + shared via QR/link)
     linked_pets: Mapped[list["Pet"]] = relationship(
-        "Pet", secondary=user_pets, back_populates="linked_users", lazy="selectin"
+        "Pet", secondary=user_pets, back_populates="linked_users", lazy="raise_on_sql", passive_deletes=True
+    )
+    posts: Mapped[list["CommunityPost"]] = relationship(
+        "CommunityPost", back_populates="user", lazy="raise_on_sql", passive_deletes=True
+    )
+    media_files: Mapped[list["MediaFile"]] = relationship(
+        "MediaFile", back_populates="owner", lazy="raise_on_sql", passive_deletes=True
     )
-    posts: Mapped[list["CommunityPost"]] = relationship("CommunityPost", back_populates="user", lazy="selectin")
-    media_files: Mapped[list["MediaFile"]] = relationship("MediaFile", back_populates="owner", lazy="selectin")
 
     def __repr__(self) -> str:
         return f"<User(id={self.id}, email={self.email!r})>"
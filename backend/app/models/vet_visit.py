@@ -2,7 +2,7 @@
 
 from datetime import date
 
-from sqlalchemy import Date, ForeignKey, String, Text
+from sqlalchemy import Date, ForeignKey, Index, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -27,3 +27,7 @@ class VetVisit(Base, TimestampMixin):
     medical_records: Mapped[list["MediaFile"]] = relationship(
         "MediaFile", back_populates="vet_visit", foreign_keys="MediaFile.vet_visit_id", lazy="selectin"
     )
+
+
+# Serves the visit history list: newest first, keyset cursor on (visit_date, id)
+Index("ix_vet_visits_pet_id_visit_date_id", VetVisit.pet_id, VetVisit.visit_date.desc(), VetVisit.id.desc())
@@ -1,9 +1,10 @@
 """Schemas for sleep and eating habit logs."""
 
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Annotated, Generic, Literal, Optional, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import TypedDict
 
 
 class SleepLogCreate(BaseModel):
@@ -73,3 +74,70 @@ class ActivityStateLogResponse(BaseModel):
     active: bool
     start_time: datetime
     created_at: datetime
+
+
+# --- Bulk ingestion (camera / device sources) ---
+
+BULK_MAX_ITEMS = 10_000
+
+
+# Bulk items are validated into plain dicts rather than models: they go straight into COPY rows,
+# and building (then unpacking) up to BULK_MAX_ITEMS model instances per request costs more than
+# the COPY itself. Fields and limits are those of the matching *Create schema, plus the pet;
+# defaults are filled in, so a validated item has every key.
+
+
+class SleepLogBulkItem(TypedDict):
+    """One sleep log in a bulk request (SleepLogCreate fields); may target any pet."""
+
+    pet_id: int
+    started_at: datetime
+    ended_at: Annotated[Optional[datetime], Field(None)]
+    duration_minutes: Annotated[Optional[int], Field(None, ge=0, le=1440)]
+    notes: Annotated[Optional[str], Field(None, max_length=2000)]
+    source: Annotated[Literal["manual", "camera", "device"], Field("manual")]
+
+
+class EatingLogBulkItem(TypedDict):
+    """One eating log in a bulk request (EatingLogCreate fields); may target any pet."""
+
+    pet_id: int
+    occurred_at: datetime
+    meal_type: Literal["breakfast", "lunch", "dinner", "snack"]
+    amount: Annotated[Optional[str], Field(None, max_length=128)]
+    notes: Annotated[Optional[str], Field(None, max_length=2000)]
+    source: Annotated[Literal["manual", "camera", "device"], Field("manual")]
+
+
+class ActivityStateLogBulkItem(TypedDict):
+    """One activity state change in a bulk request (ActivityStateLogCreate fields); may target any pet."""
+
+    pet_id: int
+    active: bool
+    start_time: Annotated[Optional[datetime], Field(None)]
+
+
+ItemT = TypeVar("ItemT")
+
+
+class BulkLogRequest(BaseModel, Generic[ItemT]):
+    """
+    Bulk log ingestion. The endpoints validate the body as BulkLogRequest[<kind>BulkItem] in one
+    pass; an invalid item is reported in errors (by index) instead of rejecting the whole batch.
+    """
+
+    items: list[ItemT] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemError(BaseModel):
+    """Why one item of a bulk request was not inserted."""
+
+    index: int = Field(..., description="Position of the item in the request")
+    detail: str
+
+
+class BulkLogResponse(BaseModel):
+    """Result of a bulk ingestion: valid items are inserted, the rest are listed in errors."""
+
+    inserted: int = Field(..., description="Rows stored (activity states that repeat the latest one are skipped)")
+    errors: list[BulkItemError] = Field(default_factory=list)
@@ -0,0 +1,42 @@
+"""Schemas for direct (presigned) media uploads and downloads."""
+
+from pydantic import BaseModel, Field
+
+
+class DirectUploadCreate(BaseModel):
+    """A file the client is about to upload straight to storage."""
+
+    file_type: str = Field(..., description="image | audio | video | document (PDF)")
+    content_type: str = Field(..., description="MIME type; the PUT requests must send it as Content-Type")
+    size: int = Field(..., ge=1, description="File size in bytes (picks single or multipart upload)")
+    filename: str = "file"
+    owner_id: int = Field(1, description="Owner user id (from auth when available)")
+    pet_id: int | None = Field(None, description="Optional pet id to associate")
+
+
+class DirectUploadResponse(BaseModel):
+    """
+    Where to upload. Single upload: PUT the file to url. Multipart: PUT consecutive part_size
+    slices to part_urls in order (the last may be shorter) and keep each response's ETag header.
+    Then POST token (and the ETags) to /media/uploads/complete.
+    """
+
+    token: str
+    storage_key: str
+    expires_in: int
+    headers: dict[str, str]
+    url: str | None = None
+    part_size: int | None = None
+    part_urls: list[str] = []
+
+
+class DirectUploadComplete(BaseModel):
+    """Completion callback for a direct upload."""
+
+    token: str
+    etags: list[str] = Field([], description="Multipart only: each part's ETag, in part order")
+
+
+class DownloadUrlResponse(BaseModel):
+    url: str
+    expires_in: int
@@ -0,0 +1,14 @@
+"""Cursor pagination envelope for list endpoints."""
+
+from typing import Generic, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list."""
+
+    items: list[T] = Field(default_factory=list)
+    next_cursor: Optional[str] = Field(None, description="Pass as cursor to fetch the next page; null on the last page")
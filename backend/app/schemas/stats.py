@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, datetime
 
 from pydantic import BaseModel, Field
 
@@ -13,6 +13,7 @@ class DayActivityStats(BaseModel):
     day: date = Field(..., description="Date (YYYY-MM-DD)", serialization_alias="date")
     sleep_minutes: int = Field(0, ge=0, description="Total sleep duration that day")
     meals_count: int = Field(0, ge=0, description="Number of eating events that day")
+    active_minutes: int = Field(0, ge=0, description="Time spent in the active state that day")
 
 
 class ActivityStatsResponse(BaseModel):
@@ -22,6 +23,19 @@ class ActivityStatsResponse(BaseModel):
     days: list[DayActivityStats] = Field(default_factory=list, description="Stats per day, newest first")
 
 
+class ActivityStateSeriesResponse(BaseModel):
+    """Downsampled activity state for the live chart: a fixed number of equal time buckets."""
+
+    pet_id: int
+    since: datetime = Field(..., description="Start of the first bucket")
+    until: datetime = Field(..., description="End of the last bucket")
+    bucket_seconds: float = Field(..., description="Width of each bucket")
+    active: list[float | None] = Field(
+        default_factory=list,
+        description="Fraction of each bucket spent active (0-1), oldest first; null where the state is unknown",
+    )
+
+
 class UpcomingEventItem(BaseModel):
     """Single upcoming event (vet visit) for dashboard/calendar."""
 
@@ -47,6 +61,7 @@ class CalendarDayStats(BaseModel):
     day: date = Field(..., description="Date (YYYY-MM-DD)", serialization_alias="date")
     sleep_minutes: int = Field(0, ge=0)
     meals_count: int = Field(0, ge=0)
+    active_minutes: int = Field(0, ge=0)
 
 
 class CalendarEventsResponse(BaseModel):
@@ -1,7 +1,125 @@
-"""Abstract file storage - implement for local or DigitalOcean Spaces."""
+"""Abstract file storage - implement for local or DigitalOcean Spaces.
 
+Backends implement blocking save/read/delete/open/open_writer (filesystem calls, boto3). Async
+code uses the a* variants, which run those calls on a dedicated pool of storage_io_concurrency
+threads: a large upload or a slow Spaces round trip then waits in a thread instead of freezing the
+event loop, and a burst of transfers queues (cancellably) instead of taking every default-executor
+thread. open_writer streams a file in chunks, so an upload never has to be held in memory whole.
+"""
+
+import hashlib
+import io
+import itertools
+import re
+import shutil
+import uuid
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Callable, Iterator, TypeVar
+
+from app.config import get_settings
+from app.core.executors import BoundedExecutor
+
+T = TypeVar("T")
+
+STREAM_CHUNK_SIZE = 256 * 1024
+
+# Content-addressed blobs and the staging files uploads are written to before their hash is known
+BLOB_PREFIX = "blobs/"
+STAGING_PREFIX = "blobs/incoming/"
+
+_io_pool = BoundedExecutor(get_settings().storage_io_concurrency, "storage-io")
+
+
+async def run_io(fn: Callable[..., T], *args: Any) -> T:
+    """Run a blocking storage call on the storage I/O pool, at most storage_io_concurrency at a time."""
+    return await _io_pool.run(fn, *args)
+
+
+class StorageWriter(ABC):
+    """A file being written under a key: write() chunks, then commit() to publish it or abort() to discard it."""
+
+    @abstractmethod
+    def write(self, data: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def commit(self, key: str | None = None) -> None:
+        """
+        Make the file visible under key, by default the one it was opened with (replacing any
+        previous file). Content-addressed uploads only learn their key once every byte is written.
+        """
+        ...
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Discard everything written. Safe to call after a failed write or commit."""
+        ...
+
+
+class _BufferedWriter(StorageWriter):
+    """Fallback for backends without a streaming write: collects the file, then save()s it."""
+
+    def __init__(self, storage: "FileStorage", key: str, content_type: str | None) -> None:
+        self._storage = storage
+        self._key = key
+        self._content_type = content_type
+        self._buffer = io.BytesIO()
+
+    def write(self, data: bytes) -> None:
+        self._buffer.write(data)
+
+    def commit(self, key: str | None = None) -> None:
+        self._storage.save(key or self._key, self._buffer.getvalue(), self._content_type)
+
+    def abort(self) -> None:
+        self._buffer = io.BytesIO()
+
+
+class AsyncStorageWriter:
+    """
+    StorageWriter driven from async code: writes are batched into STREAM_CHUNK_SIZE calls on the
+    I/O pool, which also feed sha256 (the content hash, complete once everything is written).
+    """
+
+    def __init__(self, writer: StorageWriter) -> None:
+        self._writer = writer
+        self._pending = bytearray()
+        self.sha256 = hashlib.sha256()
+
+    async def write(self, data: bytes) -> None:
+        self._pending += data
+        if len(self._pending) >= STREAM_CHUNK_SIZE:
+            await self.flush()
+
+    async def commit(self, key: str | None = None) -> None:
+        await self.flush()
+        await run_io(self._writer.commit, key)
+
+    async def abort(self) -> None:
+        self._pending.clear()
+        await run_io(self._writer.abort)
+
+    async def flush(self) -> None:
+        """Write out everything buffered (sha256 then covers all data written so far)."""
+        if self._pending:
+            data, self._pending = bytes(self._pending), bytearray()
+            await run_io(self._write, data)
+
+    def _write(self, data: bytes) -> None:
+        self.sha256.update(data)
+        self._writer.write(data)
+
+
+@dataclass(frozen=True, slots=True)
+class StoredObject:
+    """A file found by list_files(): its key, size and when it was last written (UTC)."""
+
+    key: str
+    size: int
+    modified: datetime
 
 
 class FileStorage(ABC):
@@ -27,9 +145,135 @@ class FileStorage(ABC):
         """Return public or signed URL for the key, or None if not applicable."""
         ...
 
+    @abstractmethod
+    def list_files(self, prefix: str = "") -> Iterator[StoredObject]:
+        """Every file whose key starts with prefix, fetched lazily (in pages for remote backends)."""
+        ...
+
+    def open(self, key: str, start: int = 0, end: int | None = None) -> BinaryIO:
+        """
+        Readable binary file object for key positioned at byte start (caller closes it). Backends may
+        stop after byte end (inclusive), so read no further than that. Raises FileNotFoundError if missing.
+        """
+        return io.BytesIO(self.read(key)[start:])
+
+    def size(self, key: str) -> int:
+        """Size of the file in bytes. Raises FileNotFoundError if missing."""
+        return len(self.read(key))
+
+    def local_path(self, key: str) -> Path | None:
+        """Filesystem path of the file when the backend keeps one (servable with sendfile), else None."""
+        return None
+
+    def download(self, key: str, dest: Path) -> None:
+        """Copy the file to dest in chunks (never whole in memory). Raises FileNotFoundError if missing."""
+        with self.open(key) as src, dest.open("wb") as out:
+            shutil.copyfileobj(src, out, STREAM_CHUNK_SIZE)
+
+    def presign_download(self, key: str, expires_in: int) -> str | None:
+        """URL the client can GET the file from directly for expires_in seconds; None if the backend has none."""
+        return None
+
+    def presign_upload(self, key: str, content_type: str, expires_in: int) -> str | None:
+        """URL the client can PUT the file to directly (with this Content-Type); None if unsupported."""
+        return None
+
+    def presign_multipart_upload(
+        self, key: str, content_type: str, part_count: int, expires_in: int
+    ) -> tuple[str, list[str]] | None:
+        """Start a multipart upload: (upload id, PUT URL per part, in order); None if unsupported."""
+        return None
+
+    def complete_multipart_upload(self, key: str, upload_id: str, etags: list[str]) -> bool:
+        """
+        Assemble a presigned multipart upload from its parts' ETags (in part order); False if unsupported.
+        An upload assembled already counts as completed; FileNotFoundError if it was aborted instead.
+        """
+        return False
+
+    def open_writer(self, key: str, content_type: str | None = None) -> StorageWriter:
+        """Writer for a new file under key; nothing is visible under the key until commit()."""
+        return _BufferedWriter(self, key, content_type)
+
+    async def asave(self, key: str, data: bytes, content_type: str | None = None) -> str:
+        """save() off the event loop."""
+        return await run_io(self.save, key, data, content_type)
+
+    async def aread(self, key: str) -> bytes:
+        """read() off the event loop."""
+        return await run_io(self.read, key)
+
+    async def adelete(self, key: str) -> None:
+        """delete() off the event loop."""
+        await run_io(self.delete, key)
+
+    async def asize(self, key: str) -> int:
+        """size() off the event loop."""
+        return await run_io(self.size, key)
+
+    async def adownload(self, key: str, dest: Path) -> None:
+        """download() off the event loop."""
+        await run_io(self.download, key, dest)
+
+    async def alocal_path(self, key: str) -> Path | None:
+        """local_path() off the event loop."""
+        return await run_io(self.local_path, key)
+
+    async def aopen_stream(
+        self, key: str, chunk_size: int = STREAM_CHUNK_SIZE, start: int = 0, end: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Chunks of the file (or of bytes start..end inclusive), each read off the event loop, for
+        StreamingResponse. The file is opened before this returns, so a missing key raises
+        FileNotFoundError here rather than mid-stream.
+        """
+        f = await run_io(self.open, key, start, end)
+        remaining = None if end is None else end - start + 1
+
+        async def chunks() -> AsyncIterator[bytes]:
+            nonlocal remaining
+            try:
+                while remaining != 0:
+                    size = chunk_size if remaining is None else min(chunk_size, remaining)
+                    chunk = await run_io(f.read, size)
+                    if not chunk:
+                        break
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    yield chunk
+            finally:
+                await run_io(f.close)
+
+        return chunks()
+
+    async def alist_files(self, prefix: str = "", batch_size: int = 1000) -> AsyncIterator[StoredObject]:
+        """list_files() off the event loop, batch_size files per thread hop."""
+        files = await run_io(self.list_files, prefix)
+        while batch := await run_io(list, itertools.islice(files, batch_size)):
+            for stored in batch:
+                yield stored
+
+    async def aopen_writer(self, key: str, content_type: str | None = None) -> AsyncStorageWriter:
+        """open_writer() off the event loop."""
+        return AsyncStorageWriter(await run_io(self.open_writer, key, content_type))
+
+    def blob_key(self, sha256: str) -> str:
+        """Content-addressed key for a file with this SHA-256 (hex): blobs/ab/ab12..."""
+        return f"{BLOB_PREFIX}{sha256[:2]}/{sha256}"
+
+    def blob_sha256(self, key: str) -> str | None:
+        """The SHA-256 a blob_key() was made from; None if key is not one."""
+        sha256 = key.rsplit("/", 1)[-1]
+        if re.fullmatch(r"[0-9a-f]{64}", sha256) and self.blob_key(sha256) == key:
+            return sha256
+        return None
+
+    def staging_key(self) -> str:
+        """Key to write an upload to before its content (and so its blob key) is known."""
+        return f"{STAGING_PREFIX}{uuid.uuid4().hex}"
+
     def key_for(self, file_type: str, owner_id: int, filename: str) -> str:
         """Generate a stable key: e.g. images/1/uuid-or-filename."""
-        import uuid
         ext = Path(filename).suffix or ""
         unique = f"{uuid.uuid4().hex[:12]}{ext}"
         return f"{file_type}s/{owner_id}/{unique}"
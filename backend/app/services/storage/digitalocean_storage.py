@@ -1,9 +1,65 @@
 """DigitalOcean Spaces storage (S3-compatible). Migrate from local for production."""
 
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
 from urllib.parse import quote
 
 from app.config import get_settings
-from app.services.storage.base import FileStorage
+from app.services.storage.base import FileStorage, StorageWriter, StoredObject
+
+# Spaces (like S3) requires every multipart part but the last to be at least 5 MiB
+MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+
+class _MultipartWriter(StorageWriter):
+    """
+    Streams to Spaces with a multipart upload, holding at most one part in memory. Files smaller
+    than a part never start a multipart upload and are sent with a single put_object on commit
+    (so one committed under another key, or aborted, costs no upload at all).
+    """
+
+    def __init__(self, client, bucket: str, key: str, content_type: str | None) -> None:
+        self._client = client
+        self._target = {"Bucket": bucket, "Key": key}
+        self._extra = {"ContentType": content_type} if content_type else {}
+        self._buffer = bytearray()
+        self._upload_id: str | None = None
+        self._parts: list[dict] = []
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        while len(self._buffer) >= MULTIPART_PART_SIZE:
+            self._upload_part(bytes(self._buffer[:MULTIPART_PART_SIZE]))
+            del self._buffer[:MULTIPART_PART_SIZE]
+
+    def commit(self, key: str | None = None) -> None:
+        target = self._target if key is None else {**self._target, "Key": key}
+        if self._upload_id is None:
+            self._client.put_object(Body=bytes(self._buffer), **target, **self._extra)
+            return
+        if self._buffer:
+            self._upload_part(bytes(self._buffer))
+        self._client.complete_multipart_upload(
+            UploadId=self._upload_id, MultipartUpload={"Parts": self._parts}, **self._target
+        )
+        if target != self._target:
+            # The multipart upload's key was fixed when it started: server-side copy, then drop it
+            self._client.copy_object(CopySource=self._target, **target)
+            self._client.delete_object(**self._target)
+
+    def abort(self) -> None:
+        self._buffer.clear()
+        if self._upload_id is not None:
+            self._client.abort_multipart_upload(UploadId=self._upload_id, **self._target)
+            self._upload_id = None
+
+    def _upload_part(self, body: bytes) -> None:
+        if self._upload_id is None:
+            resp = self._client.create_multipart_upload(**self._target, **self._extra)
+            self._upload_id = resp["UploadId"]
+        number = len(self._parts) + 1
+        resp = self._client.upload_part(UploadId=self._upload_id, PartNumber=number, Body=body, **self._target)
+        self._parts.append({"PartNumber": number, "ETag": resp["ETag"]})
 
 
 class DigitalOceanSpacesStorage(FileStorage):
@@ -27,7 +83,10 @@ class DigitalOceanSpacesStorage(FileStorage):
                 endpoint_url=settings.do_spaces_endpoint,
                 aws_access_key_id=settings.do_spaces_key,
                 aws_secret_access_key=settings.do_spaces_secret,
-                config=Config(signature_version="s3v4"),
+                config=Config(
+                    signature_version="s3v4",
+                    s3={"addressing_style": "path"} if settings.do_spaces_path_style else None,
+                ),
             )
         return self._client
 
@@ -41,15 +100,92 @@ class DigitalOceanSpacesStorage(FileStorage):
         )
         return key
 
+    def open_writer(self, key: str, content_type: str | None = None) -> StorageWriter:
+        return _MultipartWriter(self._get_client(), self.bucket, key, content_type)
+
     def read(self, key: str) -> bytes:
-        resp = self._get_client().get_object(Bucket=self.bucket, Key=key)
-        return resp["Body"].read()
+        with self.open(key) as body:
+            return body.read()
+
+    def open(self, key: str, start: int = 0, end: int | None = None) -> BinaryIO:
+        """
+        The object's streaming body (read in chunks; nothing is buffered up front). A partial read is
+        a ranged GET, so only bytes start..end are transferred.
+        """
+        extra = {"Range": f"bytes={start}-{'' if end is None else end}"} if start or end is not None else {}
+        with self._not_found_as(key):
+            resp = self._get_client().get_object(Bucket=self.bucket, Key=key, **extra)
+        return resp["Body"]
+
+    def list_files(self, prefix: str = "") -> Iterator[StoredObject]:
+        pages = self._get_client().get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=prefix)
+        for page in pages:
+            for obj in page.get("Contents", ()):
+                yield StoredObject(obj["Key"], obj["Size"], obj["LastModified"])
+
+    def size(self, key: str) -> int:
+        with self._not_found_as(key):
+            return self._get_client().head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    @contextmanager
+    def _not_found_as(self, key: str) -> Iterator[None]:
+        """Raise FileNotFoundError for a missing object (get_object says NoSuchKey, head_object 404)."""
+        from botocore.exceptions import ClientError
+        try:
+            yield
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("NoSuchKey", "404"):
+                raise FileNotFoundError(key) from e
+            raise
 
     def delete(self, key: str) -> None:
         self._get_client().delete_object(Bucket=self.bucket, Key=key)
 
     def get_url(self, key: str) -> str | None:
-        """Public URL if bucket is public; otherwise None (use signed URL in real impl)."""
+        """Public URL if bucket is public; otherwise None (use presign_download for private buckets)."""
+        if get_settings().do_spaces_path_style:
+            return f"{self.endpoint}/{self.bucket}/{quote(key)}"
         # Example: https://bucket.nyc3.digitaloceanspaces.com/key
         base = self.endpoint.replace("https://", f"https://{self.bucket}.")
         return f"{base}/{quote(key)}"
+
+    def presign_download(self, key: str, expires_in: int) -> str:
+        return self._get_client().generate_presigned_url(
+            "get_object", Params={"Bucket": self.bucket, "Key": key}, ExpiresIn=expires_in
+        )
+
+    def presign_upload(self, key: str, content_type: str, expires_in: int) -> str:
+        return self._get_client().generate_presigned_url(
+            "put_object",
+            Params={"Bucket": self.bucket, "Key": key, "ContentType": content_type},
+            ExpiresIn=expires_in,
+        )
+
+    def presign_multipart_upload(
+        self, key: str, content_type: str, part_count: int, expires_in: int
+    ) -> tuple[str, list[str]]:
+        client = self._get_client()
+        upload_id = client.create_multipart_upload(Bucket=self.bucket, Key=key, ContentType=content_type)["UploadId"]
+        urls = [
+            client.generate_presigned_url(
+                "upload_part",
+                Params={"Bucket": self.bucket, "Key": key, "UploadId": upload_id, "PartNumber": number},
+                ExpiresIn=expires_in,
+            )
+            for number in range(1, part_count + 1)
+        ]
+        return upload_id, urls
+
+    def complete_multipart_upload(self, key: str, upload_id: str, etags: list[str]) -> bool:
+        from botocore.exceptions import ClientError
+        parts = [{"PartNumber": number, "ETag": etag} for number, etag in enumerate(etags, start=1)]
+        try:
+            self._get_client().complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts}
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "NoSuchUpload":
+                raise
+            # Completed already (a racing or retried completion) if the file is there; aborted if not
+            self.size(key)
+        return True
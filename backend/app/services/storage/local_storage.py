@@ -1,9 +1,38 @@
 """Local filesystem storage - good for dev; migrate to DO Spaces for production."""
 
+import os
+import tempfile
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import BinaryIO, Iterator
 
 from app.config import get_settings
-from app.services.storage.base import FileStorage
+from app.services.storage.base import FileStorage, StorageWriter, StoredObject
+
+
+class _LocalWriter(StorageWriter):
+    """Writes to a temp file beside the target, renamed over it on commit (readers never see a partial file)."""
+
+    def __init__(self, storage: "LocalFileStorage", key: str) -> None:
+        self._storage = storage
+        self._path = storage._path(key)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(
+            dir=self._path.parent, prefix=f".{self._path.name}.", suffix=".part", delete=False
+        )
+
+    def write(self, data: bytes) -> None:
+        self._file.write(data)
+
+    def commit(self, key: str | None = None) -> None:
+        self._file.close()
+        path = self._path if key is None else self._storage._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self._file.name, path)
+
+    def abort(self) -> None:
+        self._file.close()
+        Path(self._file.name).unlink(missing_ok=True)
 
 
 class LocalFileStorage(FileStorage):
@@ -20,17 +49,43 @@ class LocalFileStorage(FileStorage):
             raise ValueError("Invalid key: path escape")
         return p
 
+    def _existing(self, key: str) -> Path:
+        path = self._path(key)
+        if not path.is_file():
+            raise FileNotFoundError(key)
+        return path
+
     def save(self, key: str, data: bytes, content_type: str | None = None) -> str:
         path = self._path(key)
         path.parent.mkdir(parents=True, exist_ok=True)
         path.write_bytes(data)
         return key
 
+    def open_writer(self, key: str, content_type: str | None = None) -> StorageWriter:
+        return _LocalWriter(self, key)
+
     def read(self, key: str) -> bytes:
-        path = self._path(key)
-        if not path.is_file():
-            raise FileNotFoundError(key)
-        return path.read_bytes()
+        return self._existing(key).read_bytes()
+
+    def list_files(self, prefix: str = "") -> Iterator[StoredObject]:
+        # Walk only the directory the prefix names (or lies in), then match the rest of it
+        top = self._path(prefix.rpartition("/")[0]) if "/" in prefix else self.root
+        for path in top.rglob("*"):
+            key = path.relative_to(self.root).as_posix()
+            if key.startswith(prefix) and path.is_file():
+                stat = path.stat()
+                yield StoredObject(key, stat.st_size, datetime.fromtimestamp(stat.st_mtime, timezone.utc))
+
+    def open(self, key: str, start: int = 0, end: int | None = None) -> BinaryIO:
+        f = self._existing(key).open("rb")
+        f.seek(start)
+        return f
+
+    def size(self, key: str) -> int:
+        return self._existing(key).stat().st_size
+
+    def local_path(self, key: str) -> Path:
+        return self._existing(key)
 
     def delete(self, key: str) -> None:
         path = self._path(key)
@@ -0,0 +1,110 @@
+"""
+Benchmark bulk log ingestion throughput (rows/sec) through the API on one worker.
+Run from backend dir: uv run python scripts/benchmark_bulk_ingest.py [--batch 10000] [--batches 5] [--pets 10]
+
+Posts batches to /pets/{sleep,eating,activity-state}-logs/bulk in-process, with the app started as
+under uvicorn (JSON parsing, per-item validation, pet check, COPY and rollup update included).
+Everything runs in one transaction that is rolled back at the end, so it is safe to run against a
+dev DB; the log tables are vacuumed first so the dead rows of earlier runs do not slow this one.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Ensure backend root is on path so `app` resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+
+from app.core.dependencies import get_db
+from app.crud.pet import pet_crud
+from app.crud.user import user_crud
+from app.db.session import async_session_maker, engine
+from app.main import app, lifespan
+from app.models.activity_state_log import ActivityStateLog
+from app.models.eating_log import EatingLog
+from app.models.sleep_log import SleepLog
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+
+def _items(kind: str, pet_ids: list[int], start: datetime, n: int) -> list[dict]:
+    items = []
+    for i in range(n):
+        at = (start + timedelta(seconds=37 * i)).isoformat()
+        pet_id = pet_ids[i % len(pet_ids)]
+        if kind == "sleep":
+            items.append({"pet_id": pet_id, "started_at": at, "duration_minutes": 5, "source": "device"})
+        elif kind == "eating":
+            items.append({"pet_id": pet_id, "occurred_at": at, "meal_type": "snack", "source": "camera"})
+        else:
+            items.append({"pet_id": pet_id, "active": i % 3 != 0, "start_time": at})
+    return items
+
+
+async def _vacuum_logs() -> None:
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for model in (SleepLog, EatingLog, ActivityStateLog):
+            await conn.execute(text(f"VACUUM {model.__tablename__}"))
+
+
+async def run_benchmark(batch: int, batches: int, pets: int) -> None:
+    await _vacuum_logs()
+    async with lifespan(app), async_session_maker() as session:
+
+        async def _shared_db():
+            yield session
+
+        app.dependency_overrides[get_db] = _shared_db
+        try:
+            user = await user_crud.create(
+                session,
+                obj_in=UserCreate(name="Benchmark", email="benchmark-bulk@example.com", password="benchmark123"),
+            )
+            pet_ids = [
+                (await pet_crud.create(session, obj_in=PetCreate(name=f"Bench {i}", species="dog", owner_id=user.id))).id
+                for i in range(pets)
+            ]
+            transport = ASGITransport(app=app)
+            async with AsyncClient(transport=transport, base_url="http://bench") as client:
+                for kind in ("sleep", "eating", "activity-state"):
+                    start = datetime(2024, 1, 1)
+                    # Encode up front: client-side serialization is not part of the worker's cost
+                    payloads = []
+                    for _ in range(batches):
+                        payloads.append(json.dumps({"items": _items(kind.split("-")[0], pet_ids, start, batch)}))
+                        start += timedelta(seconds=37 * batch)
+                    t0 = time.perf_counter()
+                    for payload in payloads:
+                        resp = await client.post(
+                            f"/api/v1/pets/{kind}-logs/bulk",
+                            content=payload,
+                            headers={"Content-Type": "application/json"},
+                        )
+                        resp.raise_for_status()
+                        assert not resp.json()["errors"], resp.json()["errors"][:3]
+                    elapsed = time.perf_counter() - t0
+                    print(f"{kind:>15}: {batch * batches / elapsed:>10,.0f} rows/sec ({batches} x {batch} rows)")
+        finally:
+            app.dependency_overrides.clear()
+            await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=10_000, help="Items per request")
+    parser.add_argument("--batches", type=int, default=5, help="Requests per log type")
+    parser.add_argument("--pets", type=int, default=10, help="Pets the items are spread over")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.batch, args.batches, args.pets))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark the multi-pet calendar activity read for 1, 10 and 100 linked pets.
+Run from backend dir: uv run python scripts/benchmark_calendar.py [--days 31] [--repeat 20]
+
+Compares the previous per-pet loop (one query per pet) with the single pet_id = ANY(:ids) query
+used by GET /users/me/calendar/events. Seeds a throwaway user and pets with a month of daily
+stats inside a transaction that is rolled back at the end, so it is safe to run against a dev DB.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+# Ensure backend root is on path so `app` resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.crud.pet import pet_crud
+from app.crud.pet_daily_stats import pet_daily_stats_crud
+from app.crud.user import user_crud
+from app.db.session import async_session_maker
+from app.models.pet_daily_stats import PetDailyStats
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+PET_COUNTS = (1, 10, 100)
+
+
+async def _timed(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def run_benchmark(days: int, repeat: int) -> None:
+    end = date.today()
+    start = end - timedelta(days=days - 1)
+    async with async_session_maker() as session:
+        try:
+            user = await user_crud.create(
+                session,
+                obj_in=UserCreate(name="Benchmark", email="benchmark-calendar@example.com", password="benchmark123"),
+            )
+            pet_ids: list[int] = []
+            print(f"{'pets':>5} {'per-pet loop (ms)':>18} {'single query (ms)':>18}")
+            for count in PET_COUNTS:
+                while len(pet_ids) < count:
+                    pet = await pet_crud.create(
+                        session, obj_in=PetCreate(name=f"Bench {len(pet_ids)}", species="dog", owner_id=user.id)
+                    )
+                    session.add_all(
+                        PetDailyStats(pet_id=pet.id, day=start + timedelta(days=i), sleep_minutes=60, meals_count=2)
+                        for i in range(days)
+                    )
+                    pet_ids.append(pet.id)
+                await session.flush()
+                session.expunge_all()
+
+                async def per_pet() -> None:
+                    for pid in pet_ids:
+                        await pet_daily_stats_crud.get_range(session, pet_id=pid, start=start, end=end)
+                    session.expunge_all()
+
+                async def single() -> None:
+                    await pet_daily_stats_crud.get_range_for_pets(session, pet_ids=pet_ids, start=start, end=end)
+                    session.expunge_all()
+
+                print(f"{count:>5} {await _timed(per_pet, repeat):>18.2f} {await _timed(single, repeat):>18.2f}")
+        finally:
+            await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=31, help="Days in the calendar range")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per measurement (median reported)")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.days, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Benchmark the hot list reads: ORM entities vs prebuilt Core selects returning Row tuples.
+Run from backend dir: uv run python scripts/benchmark_list_reads.py [--rows 2000] [--repeat 20]
+
+For activity-state logs (a 2000-row live chart poll), sleep logs, eating logs and the community
+feed (posts with user and pet names), compares the previous select(Model) ... scalars().all()
+queries (community: selectinload of user and pet) with the CRUD get_multi Core fast paths.
+Reports rows/sec (median run) and peak Python memory per read (tracemalloc). Seeds a throwaway
+user and pet inside a transaction that is rolled back at the end, so it is safe against a dev DB.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Ensure backend root is on path so `app` resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.crud.activity_state_log import activity_state_log_crud
+from app.crud.community_post import community_post_crud
+from app.crud.eating_log import eating_log_crud
+from app.crud.pet import pet_crud
+from app.crud.sleep_log import sleep_log_crud
+from app.crud.user import user_crud
+from app.db.session import async_session_maker
+from app.models.activity_state_log import ActivityStateLog
+from app.models.community_post import CommunityPost
+from app.models.eating_log import EatingLog
+from app.models.sleep_log import SleepLog
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+
+async def _orm(session, model, key, pet_id: int, limit: int) -> list:
+    q = select(model).where(model.pet_id == pet_id).order_by(key.desc(), model.id.desc()).limit(limit)
+    return (await session.execute(q)).scalars().all()
+
+
+async def _orm_feed(session, limit: int) -> list:
+    q = (
+        select(CommunityPost)
+        .options(selectinload(CommunityPost.user), selectinload(CommunityPost.pet))
+        .order_by(CommunityPost.created_at.desc(), CommunityPost.id.desc())
+        .limit(limit)
+    )
+    return (await session.execute(q)).unique().scalars().all()
+
+
+async def _measure(session, fn, repeat: int) -> tuple[float, float]:
+    """(rows/sec of the median run, peak KiB allocated during one run)."""
+    samples, count = [], 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        count = len(await fn())
+        samples.append(time.perf_counter() - t0)
+        session.expunge_all()
+    tracemalloc.start()
+    await fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    session.expunge_all()
+    return count / statistics.median(samples), peak / 1024
+
+
+async def _seed(session, rows: int) -> int:
+    user = await user_crud.create(
+        session, obj_in=UserCreate(name="Benchmark", email="benchmark-lists@example.com", password="benchmark123")
+    )
+    pet = await pet_crud.create(session, obj_in=PetCreate(name="Bench", species="dog", owner_id=user.id))
+    start = datetime(2026, 1, 1)
+    times = [start + timedelta(minutes=5 * i) for i in range(rows)]
+    await activity_state_log_crud.create_many(
+        session, items=[{"pet_id": pet.id, "active": i % 2 == 0, "start_time": t} for i, t in enumerate(times)]
+    )
+    await sleep_log_crud.create_many(
+        session,
+        items=[
+            {"pet_id": pet.id, "started_at": t, "ended_at": None, "duration_minutes": 5, "notes": None, "source": "manual"}
+            for t in times
+        ],
+    )
+    await eating_log_crud.create_many(
+        session,
+        items=[
+            {"pet_id": pet.id, "occurred_at": t, "meal_type": "snack", "amount": None, "notes": None, "source": "manual"}
+            for t in times
+        ],
+    )
+    session.add_all(
+        CommunityPost(user_id=user.id, pet_id=pet.id if i % 2 else None, content=f"Post {i}") for i in range(rows)
+    )
+    await session.flush()
+    session.expunge_all()
+    return pet.id
+
+
+async def run_benchmark(rows: int, repeat: int) -> None:
+    async with async_session_maker() as session:
+        try:
+            pet_id = await _seed(session, rows)
+            feed_limit = min(rows, 100)
+            cases = [
+                (
+                    "activity states",
+                    lambda: _orm(session, ActivityStateLog, ActivityStateLog.start_time, pet_id, rows),
+                    lambda: activity_state_log_crud.get_multi(session, pet_id=pet_id, limit=rows),
+                ),
+                (
+                    "sleep logs",
+                    lambda: _orm(session, SleepLog, SleepLog.started_at, pet_id, rows),
+                    lambda: sleep_log_crud.get_multi(session, pet_id=pet_id, limit=rows),
+                ),
+                (
+                    "eating logs",
+                    lambda: _orm(session, EatingLog, EatingLog.occurred_at, pet_id, rows),
+                    lambda: eating_log_crud.get_multi(session, pet_id=pet_id, limit=rows),
+                ),
+                (
+                    "community feed",
+                    lambda: _orm_feed(session, feed_limit),
+                    lambda: community_post_crud.get_multi(session, limit=feed_limit),
+                ),
+            ]
+            print(f"{'read':>16} {'rows':>5} {'ORM rows/s':>11} {'Core rows/s':>12} {'ORM peak KiB':>13} {'Core peak KiB':>14}")
+            for label, orm, core in cases:
+                orm_rate, orm_peak = await _measure(session, orm, repeat)
+                core_rate, core_peak = await _measure(session, core, repeat)
+                count = len(await core())
+                print(
+                    f"{label:>16} {count:>5} {orm_rate:>11,.0f} {core_rate:>12,.0f} {orm_peak:>13,.0f} {core_peak:>14,.0f}"
+                )
+        finally:
+            await session.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="Rows seeded per table and read per call")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per measurement (median reported)")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark the latency of an unrelated endpoint while a burst of logins is being hashed.
+Run from backend dir: uv run python scripts/benchmark_login_burst.py [--logins 100] [--rounds 12]
+
+Fires --logins concurrent POST /auth/login requests in-process and, at the same time, probes
+GET /api/health every 10 ms. Reports p50/p99/max probe latency and the burst's wall
+time twice: with bcrypt called inline on the event loop (the previous behaviour) and on the
+bounded hashing pool. A throwaway user is created for the run and deleted at the end.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Ensure backend root is on path so `app` resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from httpx import ASGITransport, AsyncClient
+
+from app.config import get_settings
+from app.core import security
+from app.crud.user import user_crud
+from app.db.session import async_session_maker
+from app.main import app
+from app.schemas.user import UserCreate
+
+EMAIL = "benchmark-login@example.com"
+PASSWORD = "benchmark123"
+PROBE_INTERVAL = 0.01  # seconds between /api/health probes
+
+
+class _InlineHashing:
+    """The old behaviour: bcrypt runs on the event loop."""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+async def _burst(client: AsyncClient, logins: int) -> tuple[list[float], float, int]:
+    """Run the login burst while probing /api/health; return (probe latencies ms, burst seconds, failed logins)."""
+    probes: list[float] = []
+    done = asyncio.Event()
+
+    async def probe() -> None:
+        # Latency is measured from when each probe was due, so time the event loop spent blocked
+        # before it could even send the request counts too
+        due = time.perf_counter()
+        while not done.is_set():
+            due += PROBE_INTERVAL
+            await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            (await client.get("/api/health")).raise_for_status()
+            probes.append((time.perf_counter() - due) * 1000)
+            due = max(due, time.perf_counter())
+
+    async def login() -> bool:
+        resp = await client.post("/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        return resp.status_code == 200
+
+    prober = asyncio.create_task(probe())
+    await asyncio.sleep(0.05)
+    t0 = time.perf_counter()
+    ok = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - t0
+    done.set()
+    await prober
+    return probes, elapsed, ok.count(False)
+
+
+async def run_benchmark(logins: int, rounds: int) -> None:
+    get_settings().bcrypt_rounds = rounds
+    async with async_session_maker() as session:
+        existing = await user_crud.get_by_email(session, email=EMAIL)
+        if existing:
+            await user_crud.delete(session, id=existing.id)
+        user = await user_crud.create(session, obj_in=UserCreate(name="Benchmark", email=EMAIL, password=PASSWORD))
+        user_id = user.id
+        await session.commit()
+    try:
+        transport = ASGITransport(app=app, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            print(f"{logins} concurrent logins, bcrypt rounds={rounds}")
+            print(f"{'mode':>8} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10} {'burst (s)':>10} {'failed':>7}")
+            for mode in ("inline", "pool"):
+                hashing = security._hashing
+                if mode == "inline":
+                    security._hashing = _InlineHashing()
+                try:
+                    probes, elapsed, failed = await _burst(client, logins)
+                finally:
+                    security._hashing = hashing
+                p = sorted(probes)
+                p99 = p[min(len(p) - 1, int(len(p) * 0.99))]
+                print(f"{mode:>8} {statistics.median(p):>10.1f} {p99:>10.1f} {p[-1]:>10.1f} {elapsed:>10.2f} {failed:>7}")
+    finally:
+        async with async_session_maker() as session:
+            await user_crud.delete(session, id=user_id)
+            await session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100, help="Concurrent logins in the burst")
+    parser.add_argument("--rounds", type=int, default=get_settings().bcrypt_rounds, help="bcrypt cost factor")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.logins, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
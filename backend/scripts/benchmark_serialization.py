@@ -0,0 +1,135 @@
+"""
+Benchmark response serialization for 1k and 10k pets and 10k sleep log rows.
+Run from backend dir: uv run python scripts/benchmark_serialization.py [--repeat 10]
+
+Compares the previous path with the single-pass one, using in-memory ORM objects (no DB):
+- before: PetResponse.model_validate(pet).model_dump() per pet plus the profile URL patch (pets
+  only), then FastAPI's own response handling: validation against response_model, serialization
+  and json.dumps (fastapi.routing.serialize_response + JSONResponse).
+- after: app.core.serialization (one dict per row read from ORM attributes, encoded by orjson).
+Both outputs are checked to decode to the same JSON.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+# Ensure backend root is on path so `app` resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.v1.endpoints.pets import _pet_response, _profile_picture_url, _sleep_log_rows
+from app.core.serialization import dumps
+from app.models.pet import Pet
+from app.models.sleep_log import SleepLog
+from app.schemas.habits import SleepLogResponse
+from app.schemas.pet import PetResponse
+
+
+def _pets(n: int) -> list[Pet]:
+    now = datetime(2026, 1, 1, 12, 30, 15, 123456)
+    return [
+        Pet(
+            id=i,
+            name=f"Pet {i}",
+            species="dog",
+            breed="Labrador",
+            gender="female",
+            date_of_birth=str(date(2020, 1, 1) + timedelta(days=i % 1000)),
+            health_notes="Healthy" if i % 3 else None,
+            owner_id=i % 50 + 1,
+            profile_media_id=i if i % 2 else None,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+def _sleep_logs(n: int) -> list[SleepLog]:
+    start = datetime(2026, 1, 1)
+    return [
+        SleepLog(
+            id=i,
+            pet_id=i % 10 + 1,
+            started_at=start + timedelta(minutes=30 * i),
+            ended_at=start + timedelta(minutes=30 * i + 25),
+            duration_minutes=25,
+            notes=None,
+            source="device",
+            created_at=start,
+        )
+        for i in range(1, n + 1)
+    ]
+
+
+async def _fastapi_body(schema, content) -> bytes:
+    """What FastAPI does with a handler's return value for response_model=list[schema]."""
+    field = create_model_field(name="Response", type_=list[schema], mode="serialization")
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+async def _pets_before(pets: list[Pet]) -> bytes:
+    out = []
+    for pet in pets:
+        data = PetResponse.model_validate(pet).model_dump()
+        media_id = pet.profile_media_id
+        data["profile_photo_url"] = _profile_picture_url(pet.id, media_id) if media_id else None
+        out.append(data)
+    return await _fastapi_body(PetResponse, out)
+
+
+async def _pets_after(pets: list[Pet]) -> bytes:
+    return dumps([_pet_response(pet, pet.profile_media_id) for pet in pets])
+
+
+async def _logs_before(logs: list[SleepLog]) -> bytes:
+    return await _fastapi_body(SleepLogResponse, list(logs))
+
+
+async def _logs_after(logs: list[SleepLog]) -> bytes:
+    return dumps(_sleep_log_rows(logs))
+
+
+async def _timed(fn, arg, repeat: int) -> float:
+    """Median wall time of fn(arg) in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn(arg)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples)
+
+
+async def run_benchmark(repeat: int) -> None:
+    cases = [
+        ("1k pets", _pets(1_000), _pets_before, _pets_after),
+        ("10k pets", _pets(10_000), _pets_before, _pets_after),
+        ("10k sleep logs", _sleep_logs(10_000), _logs_before, _logs_after),
+    ]
+    print(f"{'payload':>16} {'before (ms)':>12} {'after (ms)':>11} {'speedup':>8} {'bytes':>10}")
+    for label, objs, before, after in cases:
+        old, new = await before(objs), await after(objs)
+        assert json.loads(old) == json.loads(new), f"{label}: outputs differ"
+        t_before = await _timed(before, objs, repeat)
+        t_after = await _timed(after, objs, repeat)
+        print(f"{label:>16} {t_before:>12.1f} {t_after:>11.1f} {t_before / t_after:>7.1f}x {len(new):>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="Timed runs per measurement (median reported)")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Maintain the monthly partitions of activity_state_logs. Run daily.
+Run from backend dir: uv run python scripts/maintain_activity_logs.py
+
+Creates the partitions for the current month and the next ACTIVITY_LOG_PARTITIONS_AHEAD months.
+When ACTIVITY_LOG_RETENTION_MONTHS is set (> 0), transitions from before that many months ago are
+rolled up into activity_hourly_stats and their partitions dropped.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+
+# Ensure backend root is on path so `app` resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import get_settings
+from app.crud.activity_state_log import activity_state_log_crud
+from app.db.partitions import add_months, month_start
+from app.db.session import async_session_maker
+
+
+async def run_maintenance() -> None:
+    settings = get_settings()
+    today = datetime.now(timezone.utc).date()
+    async with async_session_maker() as session:
+        try:
+            created = await activity_state_log_crud.ensure_partitions(
+                session, today=today, months_ahead=settings.activity_log_partitions_ahead
+            )
+            print(f"Created partitions: {', '.join(created) or 'none'}.")
+            if settings.activity_log_retention_months > 0:
+                before = add_months(month_start(today), -settings.activity_log_retention_months)
+                dropped = await activity_state_log_crud.expire(session, before=before)
+                print(f"Rolled up transitions before {before}; dropped partitions: {', '.join(dropped) or 'none'}.")
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            print(f"Maintenance failed: {e}")
+            raise
+
+
+def main() -> None:
+    asyncio.run(run_maintenance())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Rebuild the pet_daily_stats rollup from raw sleep, eating and activity-state logs.
+Run from backend dir: uv run python scripts/rebuild_daily_stats.py [PET_ID ...]
+
+With no arguments every pet is rebuilt. Use after bulk imports or manual edits that bypass the
+CRUD create methods, or to repair drift.
+"""
+
+import asyncio
+import os
+import sys
+
+# Ensure backend root is on path so `app` resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.crud.pet_daily_stats import pet_daily_stats_crud
+from app.db.session import async_session_maker
+
+
+async def run_rebuild(pet_ids: list[int]) -> None:
+    async with async_session_maker() as session:
+        try:
+            if pet_ids:
+                for pet_id in pet_ids:
+                    await pet_daily_stats_crud.rebuild(session, pet_id=pet_id)
+                    print(f"Rebuilt daily stats for pet {pet_id}.")
+            else:
+                await pet_daily_stats_crud.rebuild(session)
+                print("Rebuilt daily stats for all pets.")
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            print(f"Rebuild failed: {e}")
+            raise
+
+
+def main() -> None:
+    asyncio.run(run_rebuild([int(arg) for arg in sys.argv[1:]]))
+
+
+if __name__ == "__main__":
+    main()
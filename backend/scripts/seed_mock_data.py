@@ -27,6 +27,7 @@ from app.config import get_settings
 from app.crud.community_post import community_post_crud
 from app.crud.eating_log import eating_log_crud
 from app.crud.pet import pet_crud
+from app.crud.pet_daily_stats import pet_daily_stats_crud
 from app.crud.sleep_log import sleep_log_crud
 from app.crud.user import user_crud
 from app.db.session import async_session_maker
@@ -89,7 +90,7 @@ async def run_seed() -> None:
                 await session.flush()
                 await session.refresh(pet)
                 # Link pet to owner (user_pets + owner_id already set by create; ensure linked_pets)
-                u1 = await session.get(User, user1.id)
+                u1 = await user_crud.get(session, id=user1.id, profile="linked_pets")
                 if u1 and pet not in u1.linked_pets:
                     u1.linked_pets.append(pet)
                 await session.flush()
@@ -173,6 +174,9 @@ async def run_seed() -> None:
                 await session.flush()
                 print("Created 7 eating logs for activity stats.")
 
+            # Logs above bypass the CRUD create methods; refresh the pet's daily stats rollup
+            await pet_daily_stats_crud.rebuild(session, pet_id=pet.id)
+
             await session.commit()
             print("Seed completed successfully.")
             settings = get_settings()
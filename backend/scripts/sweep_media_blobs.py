@@ -0,0 +1,94 @@
+"""
+Delete deduplicated media blobs that no media file references any more. Run daily.
+Run from backend dir: uv run python scripts/sweep_media_blobs.py
+
+A blob is removed once no media file references it and MEDIA_BLOB_GRACE_HOURS have passed since
+its last upload: its file is deleted from storage, then its row, one blob per transaction so a
+failed storage delete leaves that blob intact for the next run.
+
+Storage is reconciled first, for files older than the grace period that no row accounts for:
+staging files of interrupted uploads are deleted, and blob files whose upload rolled back after
+publishing them are adopted as blob rows, which the sweep then removes.
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+# Ensure backend root is on path so `app` resolves
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import get_settings
+from app.crud.media_blob import media_blob_crud
+from app.db.session import async_session_maker
+from app.services.storage import FileStorage, get_storage
+from app.services.storage.base import BLOB_PREFIX, STAGING_PREFIX, StoredObject
+
+BATCH_SIZE = 500
+
+
+async def adopt_unrecorded(storage: FileStorage, files: list[StoredObject]) -> int:
+    """Adopt those blob files that have no row; returns how many."""
+    now = datetime.now(timezone.utc)
+    adopted = 0
+    async with async_session_maker() as session:
+        known = await media_blob_crud.existing_keys(session, [f.key for f in files])
+        for f in files:
+            sha256 = storage.blob_sha256(f.key)
+            if f.key in known or sha256 is None:
+                continue
+            adopted += await media_blob_crud.adopt(
+                session, sha256=sha256, storage_key=f.key, size=f.size, age=now - f.modified
+            )
+        await session.commit()
+    return adopted
+
+
+async def reconcile_storage(storage: FileStorage, grace: timedelta) -> tuple[int, int]:
+    """Delete stale staging files and adopt stale unrecorded blob files. Returns (deleted, adopted)."""
+    cutoff = datetime.now(timezone.utc) - grace
+    deleted = adopted = 0
+    batch: list[StoredObject] = []
+    async for f in storage.alist_files(BLOB_PREFIX):
+        if f.modified >= cutoff:
+            continue  # may belong to an upload still in progress
+        if f.key.startswith(STAGING_PREFIX):
+            await storage.adelete(f.key)
+            deleted += 1
+            continue
+        batch.append(f)
+        if len(batch) >= BATCH_SIZE:
+            adopted += await adopt_unrecorded(storage, batch)
+            batch = []
+    if batch:
+        adopted += await adopt_unrecorded(storage, batch)
+    return deleted, adopted
+
+
+async def run_sweep() -> None:
+    settings = get_settings()
+    grace = timedelta(hours=settings.media_blob_grace_hours)
+    storage = get_storage()
+    staged, adopted = await reconcile_storage(storage, grace)
+    print(f"Deleted {staged} stale staging files; adopted {adopted} blob files without a row.")
+    removed = freed = 0
+    while True:
+        async with async_session_maker() as session:
+            blob = await media_blob_crud.next_orphan(session, grace=grace)
+            if blob is None:
+                break
+            await storage.adelete(blob.storage_key)
+            await media_blob_crud.remove(session, blob)
+            await session.commit()
+            removed += 1
+            freed += blob.size_bytes
+    print(f"Removed {removed} unreferenced blobs ({freed / (1024 * 1024):.1f} MB).")
+
+
+def main() -> None:
+    asyncio.run(run_sweep())
+
+
+if __name__ == "__main__":
+    main()
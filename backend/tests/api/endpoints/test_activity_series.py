@@ -0,0 +1,98 @@
+"""Downsampled activity-state series for the live chart."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.activity_state_log import activity_state_log_crud
+from app.crud.pet import pet_crud
+from app.crud.user import user_crud
+from app.schemas.habits import ActivityStateLogCreate
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+START = datetime(2024, 6, 1)
+
+
+@pytest.fixture
+async def db_pet(db_session: AsyncSession) -> int:
+    """Create a user and pet, return pet_id."""
+    user = await user_crud.create(
+        db_session,
+        obj_in=UserCreate(name="Owner", email="owner@series.com", password="pass123456"),
+    )
+    pet = await pet_crud.create(db_session, obj_in=PetCreate(name="Buddy", species="dog", owner_id=user.id))
+    return pet.id
+
+
+@pytest.mark.asyncio
+async def test_series_buckets_active_fraction(
+    session_client: AsyncClient, db_session: AsyncSession, db_pet: int
+) -> None:
+    """Each bucket holds the fraction of its known time spent active; unknown buckets are null."""
+    for active, at in [
+        (True, START + timedelta(minutes=15)),
+        (False, START + timedelta(minutes=45)),
+        (True, START + timedelta(minutes=90)),
+    ]:
+        await activity_state_log_crud.create(
+            db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=active, start_time=at)
+        )
+    resp = await session_client.get(
+        f"/api/v1/pets/{db_pet}/activity-state/series",
+        params={"since": START.isoformat(), "until": (START + timedelta(hours=2)).isoformat(), "points": 4},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["bucket_seconds"] == 1800
+    # 0:00-0:15 unknown, 0:15-0:30 active; 0:30-0:45 active; 0:45-1:30 resting; 1:30-2:00 active
+    assert data["active"] == [1.0, 0.5, 0.0, 1.0]
+
+    # A window starting mid-interval takes the state in effect before it
+    resp = await session_client.get(
+        f"/api/v1/pets/{db_pet}/activity-state/series",
+        params={
+            "since": (START + timedelta(minutes=20)).isoformat(),
+            "until": (START + timedelta(minutes=50)).isoformat(),
+            "points": 3,
+        },
+    )
+    assert resp.json()["active"] == [1.0, 1.0, 0.5]
+
+
+@pytest.mark.asyncio
+async def test_series_payload_does_not_grow_with_window(
+    session_client: AsyncClient, db_session: AsyncSession, db_pet: int
+) -> None:
+    """A 30-day window with thousands of transitions returns the same number of points as an hour."""
+    await activity_state_log_crud.create_many(
+        db_session,
+        items=[
+            {"pet_id": db_pet, "active": i % 2 == 0, "start_time": START + timedelta(minutes=7 * i)}
+            for i in range(6000)
+        ],
+    )
+    sizes = []
+    for window in (timedelta(hours=1), timedelta(days=30)):
+        resp = await session_client.get(
+            f"/api/v1/pets/{db_pet}/activity-state/series",
+            params={"since": START.isoformat(), "until": (START + window).isoformat(), "points": 200},
+        )
+        assert resp.status_code == 200
+        active = resp.json()["active"]
+        assert len(active) == 200
+        assert all(a is not None and 0 <= a <= 1 for a in active)
+        sizes.append(len(resp.content))
+    assert max(sizes) < 4096
+
+
+@pytest.mark.asyncio
+async def test_series_rejects_empty_window(session_client: AsyncClient, db_pet: int) -> None:
+    """since must come before until."""
+    resp = await session_client.get(
+        f"/api/v1/pets/{db_pet}/activity-state/series",
+        params={"since": START.isoformat(), "until": START.isoformat()},
+    )
+    assert resp.status_code == 400
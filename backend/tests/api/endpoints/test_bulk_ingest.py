@@ -0,0 +1,142 @@
+"""Bulk ingestion endpoints for sleep, eating and activity-state logs."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.activity_state_log import activity_state_log_crud
+from app.crud.pet import pet_crud
+from app.crud.pet_daily_stats import pet_daily_stats_crud
+from app.crud.user import user_crud
+from app.models.eating_log import EatingLog
+from app.models.sleep_log import SleepLog
+from app.schemas.habits import ActivityStateLogCreate
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+DAY = date(2024, 6, 1)
+
+
+@pytest.fixture
+async def two_pets(db_session: AsyncSession) -> tuple[int, int]:
+    """Create a user with two pets, return their ids."""
+    user = await user_crud.create(
+        db_session,
+        obj_in=UserCreate(name="Owner", email="owner@bulk.com", password="pass123456"),
+    )
+    a = await pet_crud.create(db_session, obj_in=PetCreate(name="A", species="dog", owner_id=user.id))
+    b = await pet_crud.create(db_session, obj_in=PetCreate(name="B", species="cat", owner_id=user.id))
+    return a.id, b.id
+
+
+async def _stats(db: AsyncSession, pet_id: int) -> dict[date, tuple[int, int, int]]:
+    rows = await pet_daily_stats_crud.get_range(
+        db, pet_id=pet_id, start=DAY - timedelta(days=3), end=DAY + timedelta(days=3)
+    )
+    return {
+        r.day: (r.sleep_minutes, r.meals_count, r.active_minutes)
+        for r in rows
+        if (r.sleep_minutes, r.meals_count, r.active_minutes) != (0, 0, 0)
+    }
+
+
+@pytest.mark.asyncio
+async def test_bulk_sleep_logs_multi_pet_with_partial_failures(
+    session_client: AsyncClient, db_session: AsyncSession, two_pets: tuple[int, int]
+) -> None:
+    """Valid items for several pets are inserted; bad fields and unknown pets are reported per index."""
+    a, b = two_pets
+    at = datetime(2024, 6, 1, 22).isoformat()
+    items = [
+        {"pet_id": a, "started_at": at, "duration_minutes": 60, "source": "device"},
+        {"pet_id": b, "started_at": at, "duration_minutes": 30, "source": "camera"},
+        {"pet_id": a, "started_at": "not a time"},
+        {"pet_id": 999_999_999, "started_at": at, "duration_minutes": 10},
+        {"pet_id": a, "started_at": at, "duration_minutes": 15},
+    ]
+    resp = await session_client.post("/api/v1/pets/sleep-logs/bulk", json={"items": items})
+    assert resp.status_code == 200, resp.text
+    body = resp.json()
+    assert body["inserted"] == 3
+    assert [e["index"] for e in body["errors"]] == [2, 3]
+    assert "started_at" in body["errors"][0]["detail"]
+    assert body["errors"][1]["detail"] == "Pet not found"
+
+    count = await db_session.scalar(
+        select(func.count()).select_from(SleepLog).where(SleepLog.pet_id.in_([a, b]))
+    )
+    assert count == 3
+    assert await _stats(db_session, a) == {DAY: (75, 0, 0)}
+    assert await _stats(db_session, b) == {DAY: (30, 0, 0)}
+
+
+@pytest.mark.asyncio
+async def test_bulk_eating_logs(
+    session_client: AsyncClient, db_session: AsyncSession, two_pets: tuple[int, int]
+) -> None:
+    """Eating logs are inserted in bulk and counted in the daily rollup."""
+    a, _ = two_pets
+    items = [
+        {"pet_id": a, "occurred_at": datetime(2024, 6, 1, h).isoformat(), "meal_type": "snack"}
+        for h in range(8, 12)
+    ]
+    resp = await session_client.post("/api/v1/pets/eating-logs/bulk", json={"items": items})
+    assert resp.json() == {"inserted": 4, "errors": []}
+    count = await db_session.scalar(select(func.count()).select_from(EatingLog).where(EatingLog.pet_id == a))
+    assert count == 4
+    assert await _stats(db_session, a) == {DAY: (0, 4, 0)}
+
+
+@pytest.mark.asyncio
+async def test_bulk_activity_state_matches_rebuild(
+    session_client: AsyncClient, db_session: AsyncSession, two_pets: tuple[int, int]
+) -> None:
+    """Bulk transitions (interleaved with existing ones) leave the rollup equal to a full rebuild."""
+    a, b = two_pets
+    for active, at in [(True, datetime(2024, 5, 31, 20)), (False, datetime(2024, 6, 2, 9))]:
+        await activity_state_log_crud.create(
+            db_session, pet_id=a, obj_in=ActivityStateLogCreate(active=active, start_time=at)
+        )
+    items = [
+        {"pet_id": a, "active": False, "start_time": datetime(2024, 6, 1, 1).isoformat()},
+        {"pet_id": a, "active": True, "start_time": datetime(2024, 6, 1, 12, 30).isoformat()},
+        {"pet_id": b, "active": True, "start_time": datetime(2024, 6, 1, 23).isoformat()},
+        {"pet_id": b, "active": False, "start_time": datetime(2024, 6, 2, 0, 20).isoformat()},
+    ]
+    resp = await session_client.post("/api/v1/pets/activity-state-logs/bulk", json={"items": items})
+    assert resp.json() == {"inserted": 4, "errors": []}
+    incremental = {pet_id: await _stats(db_session, pet_id) for pet_id in (a, b)}
+    assert incremental[b] == {DAY: (0, 0, 60), DAY + timedelta(days=1): (0, 0, 20)}
+
+    for pet_id in (a, b):
+        await pet_daily_stats_crud.rebuild(db_session, pet_id=pet_id)
+    db_session.expire_all()
+    assert {pet_id: await _stats(db_session, pet_id) for pet_id in (a, b)} == incremental
+
+
+@pytest.mark.asyncio
+async def test_bulk_rejects_empty_batch(session_client: AsyncClient) -> None:
+    """An empty items list is a request error."""
+    resp = await session_client.post("/api/v1/pets/sleep-logs/bulk", json={"items": []})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_reports_non_object_items_and_rejects_bad_bodies(
+    session_client: AsyncClient, two_pets: tuple[int, int]
+) -> None:
+    """An item that is not an object is an item error; a body that is not a batch is a 422."""
+    a, _ = two_pets
+    items = ["oops", {"pet_id": a, "occurred_at": datetime(2024, 6, 1, 8).isoformat(), "meal_type": "snack"}]
+    resp = await session_client.post("/api/v1/pets/eating-logs/bulk", json={"items": items})
+    assert resp.status_code == 200
+    assert resp.json()["inserted"] == 1 and [e["index"] for e in resp.json()["errors"]] == [0]
+
+    for content in (b"not json", b'{"items": "x"}', b"[]"):
+        resp = await session_client.post(
+            "/api/v1/pets/eating-logs/bulk", content=content, headers={"Content-Type": "application/json"}
+        )
+        assert resp.status_code == 422, content
@@ -0,0 +1,121 @@
+"""ETag / If-None-Match and Cache-Control on pets, stats and stored files."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.http_cache import IMMUTABLE, REVALIDATE
+from app.crud.pet import pet_crud
+from app.crud.user import user_crud
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture
+async def owned_pet(db_session: AsyncSession) -> dict:
+    user = await user_crud.create(
+        db_session, obj_in=UserCreate(name="Etag", email="etag@cache.com", password="pass123456")
+    )
+    pet = await pet_crud.create(db_session, obj_in=PetCreate(name="Tag", species="dog", owner_id=user.id))
+    return {"user_id": user.id, "pet_id": pet.id}
+
+
+async def _revalidate(client: AsyncClient, url: str, first: Response) -> Response:
+    return await client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+
+
+@pytest.mark.asyncio
+async def test_pet_etag_follows_updated_at_and_picture(
+    session_client: AsyncClient, db_session: AsyncSession, owned_pet: dict, temp_storage_path
+) -> None:
+    """GET /pets/{id} answers 304 until the pet row or its profile picture changes."""
+    url = f"/api/v1/pets/{owned_pet['pet_id']}"
+    first = await session_client.get(url)
+    assert first.status_code == 200 and first.headers["Cache-Control"] == REVALIDATE
+    again = await _revalidate(session_client, url, first)
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+    # A later transaction's update moves updated_at
+    pet = await pet_crud.get_lean(db_session, owned_pet["pet_id"])
+    pet.updated_at = pet.updated_at + timedelta(seconds=1)
+    await db_session.flush()
+    renamed = await _revalidate(session_client, url, first)
+    assert renamed.status_code == 200 and renamed.headers["ETag"] != first.headers["ETag"]
+
+    upload = await session_client.post(
+        f"{url}/profile-picture", files={"file": ("p.png", b"\x89PNG fake", "image/png")}
+    )
+    assert upload.status_code == 200
+    db_session.expunge_all()  # like the next request's fresh session
+    with_picture = await _revalidate(session_client, url, renamed)
+    assert with_picture.status_code == 200
+    assert with_picture.json()["profile_photo_url"].endswith(f"/profile-picture?v={upload.json()['media_id']}")
+
+
+@pytest.mark.asyncio
+async def test_profile_picture_immutable_when_versioned(
+    session_client: AsyncClient, owned_pet: dict, temp_storage_path
+) -> None:
+    """The versioned picture URL is immutable; the bare URL revalidates against the storage key."""
+    url = f"/api/v1/pets/{owned_pet['pet_id']}/profile-picture"
+    upload = await session_client.post(url, files={"file": ("p.png", b"\x89PNG one", "image/png")})
+    media_id = upload.json()["media_id"]
+
+    versioned = await session_client.get(url, params={"v": media_id})
+    assert versioned.status_code == 200 and versioned.content == b"\x89PNG one"
+    assert versioned.headers["Cache-Control"] == IMMUTABLE
+    bare = await session_client.get(url)
+    assert bare.headers["Cache-Control"] == REVALIDATE
+    assert bare.headers["ETag"] == versioned.headers["ETag"]
+    assert (await _revalidate(session_client, url, bare)).status_code == 304
+
+    await session_client.post(url, files={"file": ("p.png", b"\x89PNG two", "image/png")})
+    replaced = await _revalidate(session_client, url, bare)
+    assert replaced.status_code == 200 and replaced.content == b"\x89PNG two"
+    # An old versioned URL now serves the new picture, so it must not be cached as immutable
+    stale = await session_client.get(url, params={"v": media_id})
+    assert stale.headers["Cache-Control"] == REVALIDATE
+
+
+@pytest.mark.asyncio
+async def test_medical_record_file_is_immutable(
+    session_client: AsyncClient, owned_pet: dict, temp_storage_path
+) -> None:
+    """A record's file is immutable and revalidates with 304 without reading storage."""
+    base = f"/api/v1/pets/{owned_pet['pet_id']}/veterinary/medical-records"
+    record = await session_client.post(
+        base,
+        params={"owner_id": owned_pet["user_id"]},
+        files={"file": ("m.pdf", b"%PDF-1.4 etag", "application/pdf")},
+    )
+    assert record.status_code == 201
+    url = f"{base}/{record.json()['id']}/file"
+    first = await session_client.get(url)
+    assert first.status_code == 200 and first.headers["Cache-Control"] == IMMUTABLE
+    for path in temp_storage_path.rglob("*"):
+        if path.is_file():
+            path.unlink()
+    again = await _revalidate(session_client, url, first)
+    assert again.status_code == 304 and again.headers["Cache-Control"] == IMMUTABLE
+
+
+@pytest.mark.asyncio
+async def test_stats_etag_changes_with_new_logs(session_client: AsyncClient, owned_pet: dict) -> None:
+    """Stats bodies carry their own ETag: 304 while unchanged, 200 after a log write."""
+    url = f"/api/v1/pets/{owned_pet['pet_id']}/stats/activity"
+    first = await session_client.get(url)
+    assert first.status_code == 200 and "ETag" in first.headers
+    assert (await _revalidate(session_client, url, first)).status_code == 304
+    assert (
+        await session_client.get(url, headers={"If-None-Match": f'"other", W/{first.headers["ETag"]}'})
+    ).status_code == 304
+
+    await session_client.post(
+        f"/api/v1/pets/{owned_pet['pet_id']}/eating-logs",
+        json={"occurred_at": datetime.now().isoformat(), "meal_type": "snack"},
+    )
+    changed = await _revalidate(session_client, url, first)
+    assert changed.status_code == 200 and changed.json()["days"][0]["meals_count"] == 1
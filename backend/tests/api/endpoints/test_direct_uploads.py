@@ -0,0 +1,193 @@
+"""Direct-to-Spaces uploads and downloads with presigned URLs, against a stubbed S3 client."""
+
+import io
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+from httpx import AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints.media import UPLOAD_TOKEN_AUDIENCE, _register
+from app.core.security import create_scoped_token
+from app.crud.user import user_crud
+from app.models.media_file import MediaFile
+from app.schemas.user import UserCreate
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 1000
+
+
+@pytest.fixture
+def spaces(monkeypatch: pytest.MonkeyPatch) -> Stubber:
+    """Spaces storage pointed at a local S3 stand-in; its client's calls are answered by a Stubber."""
+    for name, value in {
+        "STORAGE_BACKEND": "digitalocean",
+        "DO_SPACES_KEY": "test",
+        "DO_SPACES_SECRET": "test",
+        "DO_SPACES_BUCKET": "pets",
+        "DO_SPACES_ENDPOINT": "http://127.0.0.1:9000",
+        "DO_SPACES_PATH_STYLE": "true",
+    }.items():
+        monkeypatch.setenv(name, value)
+    from app.config import get_settings
+    from app.services.storage.factory import get_storage
+    get_settings.cache_clear()
+    get_storage.cache_clear()
+    with Stubber(get_storage()._get_client()) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+    get_settings.cache_clear()
+    get_storage.cache_clear()
+
+
+@pytest.fixture
+async def owner_id(db_session: AsyncSession) -> int:
+    user = await user_crud.create(
+        db_session, obj_in=UserCreate(name="Direct", email="direct@upload.com", password="pass123456")
+    )
+    return user.id
+
+
+def _stored(stubber: Stubber, key: str, content: bytes, size: int | None = None) -> None:
+    """Expect the completion checks: a HEAD for the size, then a ranged GET of the first bytes."""
+    stubber.add_response("head_object", {"ContentLength": size or len(content)}, {"Bucket": "pets", "Key": key})
+    head = content[:16]
+    stubber.add_response(
+        "get_object",
+        {"Body": StreamingBody(io.BytesIO(head), len(head))},
+        {"Bucket": "pets", "Key": key, "Range": "bytes=0-15"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_single_put_upload_and_download_url(
+    session_client: AsyncClient, spaces: Stubber, owner_id: int
+) -> None:
+    """A small file gets one presigned PUT; completion registers it once; downloads get a presigned GET."""
+    resp = await session_client.post(
+        "/api/v1/media/uploads",
+        json={"file_type": "image", "content_type": "image/png", "size": len(PNG), "owner_id": owner_id},
+    )
+    assert resp.status_code == 201
+    upload = resp.json()
+    key = upload["storage_key"]
+    assert upload["url"].startswith(f"http://127.0.0.1:9000/pets/{key}?")
+    assert "X-Amz-Signature" in upload["url"] and upload["part_urls"] == []
+    assert upload["headers"] == {"Content-Type": "image/png"}
+
+    _stored(spaces, key, PNG)
+    done = await session_client.post("/api/v1/media/uploads/complete", json={"token": upload["token"]})
+    assert done.status_code == 200
+    media = done.json()
+    assert media["storage_key"] == key and media["size"] == len(PNG)
+    again = await session_client.post("/api/v1/media/uploads/complete", json={"token": upload["token"]})
+    assert again.json()["id"] == media["id"]
+
+    download = await session_client.get(f"/api/v1/media/{media['id']}/download-url")
+    assert download.status_code == 200
+    assert download.json()["url"].startswith(f"http://127.0.0.1:9000/pets/{key}?")
+
+
+@pytest.mark.asyncio
+async def test_multipart_upload_rejected_when_too_large(
+    session_client: AsyncClient, spaces: Stubber, owner_id: int
+) -> None:
+    """A large file gets a URL per part; a completed upload over the limit is deleted, not registered."""
+    spaces.add_response("create_multipart_upload", {"UploadId": "up-1"})
+    resp = await session_client.post(
+        "/api/v1/media/uploads",
+        json={"file_type": "video", "content_type": "video/mp4", "size": 40 * 1024 * 1024, "owner_id": owner_id},
+    )
+    assert resp.status_code == 201
+    upload = resp.json()
+    key = upload["storage_key"]
+    assert upload["url"] is None and upload["part_size"] == 16 * 1024 * 1024
+    queries = [parse_qs(urlparse(url).query) for url in upload["part_urls"]]
+    assert [(q["uploadId"], q["partNumber"]) for q in queries] == [(["up-1"], [str(n)]) for n in (1, 2, 3)]
+
+    missing = await session_client.post("/api/v1/media/uploads/complete", json={"token": upload["token"]})
+    assert missing.status_code == 400
+
+    parts = [{"PartNumber": n, "ETag": f'"e{n}"'} for n in (1, 2, 3)]
+    spaces.add_response(
+        "complete_multipart_upload",
+        {},
+        {"Bucket": "pets", "Key": key, "UploadId": "up-1", "MultipartUpload": {"Parts": parts}},
+    )
+    spaces.add_response("head_object", {"ContentLength": 200 * 1024 * 1024}, {"Bucket": "pets", "Key": key})
+    spaces.add_response("delete_object", {}, {"Bucket": "pets", "Key": key})
+    done = await session_client.post(
+        "/api/v1/media/uploads/complete", json={"token": upload["token"], "etags": ['"e1"', '"e2"', '"e3"']}
+    )
+    assert done.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_multipart_completion_retried(session_client: AsyncClient, spaces: Stubber, owner_id: int) -> None:
+    """A completion whose upload was assembled already (NoSuchUpload) goes on to register the file."""
+    spaces.add_response("create_multipart_upload", {"UploadId": "up-2"})
+    resp = await session_client.post(
+        "/api/v1/media/uploads",
+        json={"file_type": "video", "content_type": "video/mp4", "size": 20 * 1024 * 1024, "owner_id": owner_id},
+    )
+    upload = resp.json()
+    key = upload["storage_key"]
+    complete = {"token": upload["token"], "etags": ['"e1"', '"e2"']}
+
+    spaces.add_client_error("complete_multipart_upload", "NoSuchUpload")
+    spaces.add_client_error("head_object", "404", http_status_code=404)
+    aborted = await session_client.post("/api/v1/media/uploads/complete", json=complete)
+    assert aborted.status_code == 409
+
+    mp4 = b"\x00\x00\x00\x18ftypmp42" + b"\x00" * 16
+    spaces.add_client_error("complete_multipart_upload", "NoSuchUpload")
+    spaces.add_response("head_object", {"ContentLength": len(mp4)}, {"Bucket": "pets", "Key": key})
+    _stored(spaces, key, mp4)
+    done = await session_client.post("/api/v1/media/uploads/complete", json=complete)
+    assert done.status_code == 200
+    assert done.json()["storage_key"] == key and done.json()["size"] == len(mp4)
+
+
+@pytest.mark.asyncio
+async def test_direct_uploads_need_spaces(session_client: AsyncClient, temp_storage_path) -> None:
+    """Local storage has no presigned URLs; forged or login tokens cannot complete an upload."""
+    resp = await session_client.post(
+        "/api/v1/media/uploads", json={"file_type": "image", "content_type": "image/png", "size": 10}
+    )
+    assert resp.status_code == 501
+    from app.core.security import create_access_token
+
+    for token in ("not-a-token", create_access_token(1, {"key": "images/1/x.png"})):
+        resp = await session_client.post("/api/v1/media/uploads/complete", json={"token": token})
+        assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_direct_upload_registered_once(db_session: AsyncSession, owner_id: int, temp_storage_path) -> None:
+    """A second registration of a key (a racing completion) returns the first media file."""
+    key = f"images/{owner_id}/raced.png"
+    args = {"key": key, "size": 10, "file_type": "image", "content_type": "image/png", "owner_id": owner_id}
+    first = await _register(db_session, pet_id=None, **args)
+    second = await _register(db_session, pet_id=None, **args)
+    assert second["id"] == first["id"]
+    count = await db_session.scalar(select(func.count()).select_from(MediaFile).where(MediaFile.storage_key == key))
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_multipart_completion_needs_spaces(session_client: AsyncClient, temp_storage_path) -> None:
+    """Completing a multipart upload on storage without multipart uploads is 501, not a server error."""
+    claims = {
+        "sub": "1",
+        "key": "videos/1/x.mp4",
+        "file_type": "video",
+        "content_type": "video/mp4",
+        "pet_id": None,
+        "upload_id": "up-1",
+    }
+    token = create_scoped_token(UPLOAD_TOKEN_AUDIENCE, claims, timedelta(minutes=5))
+    resp = await session_client.post("/api/v1/media/uploads/complete", json={"token": token, "etags": ['"e1"']})
+    assert resp.status_code == 501
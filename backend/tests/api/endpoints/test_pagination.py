@@ -0,0 +1,91 @@
+"""Keyset (cursor) pagination on list endpoints, alongside the legacy skip/limit lists."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.pet import pet_crud
+from app.crud.user import user_crud
+from app.models.community_post import CommunityPost
+from app.models.sleep_log import SleepLog
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture
+async def owner_pet(db_session: AsyncSession) -> tuple[int, int]:
+    """Create a user and pet, return (user_id, pet_id)."""
+    user = await user_crud.create(
+        db_session,
+        obj_in=UserCreate(name="Owner", email="owner@pagination.com", password="pass123456"),
+    )
+    pet = await pet_crud.create(db_session, obj_in=PetCreate(name="Buddy", species="dog", owner_id=user.id))
+    return user.id, pet.id
+
+
+async def _walk(client: AsyncClient, path: str, limit: int) -> list[dict]:
+    """Follow next_cursor from the first page to the end, return all items."""
+    items: list[dict] = []
+    cursor = ""
+    while cursor is not None:
+        resp = await client.get(path, params={"cursor": cursor, "limit": limit})
+        assert resp.status_code == 200, resp.text
+        page = resp.json()
+        items.extend(page["items"])
+        cursor = page["next_cursor"]
+    return items
+
+
+@pytest.mark.asyncio
+async def test_sleep_logs_cursor_pages(
+    session_client: AsyncClient, db_session: AsyncSession, owner_pet: tuple[int, int]
+) -> None:
+    """Cursor pages cover every log exactly once, newest first, including ties on started_at."""
+    _, pet_id = owner_pet
+    start = datetime(2024, 1, 1)
+    for i in range(25):
+        # Pairs of logs share a started_at, so (started_at, id) breaks the tie
+        db_session.add(SleepLog(pet_id=pet_id, started_at=start + timedelta(hours=i // 2), duration_minutes=i))
+    await db_session.flush()
+
+    items = await _walk(session_client, f"/api/v1/pets/{pet_id}/sleep-logs", limit=4)
+    assert len(items) == 25
+    assert len({i["id"] for i in items}) == 25
+    keys = [(i["started_at"], i["id"]) for i in items]
+    assert keys == sorted(keys, reverse=True)
+
+    # Legacy offset pagination still returns a plain list
+    resp = await session_client.get(f"/api/v1/pets/{pet_id}/sleep-logs", params={"skip": 4, "limit": 4})
+    assert resp.status_code == 200
+    assert [i["id"] for i in resp.json()] == [i["id"] for i in items[4:8]]
+
+
+@pytest.mark.asyncio
+async def test_community_feed_cursor_stable_under_inserts(
+    session_client: AsyncClient, db_session: AsyncSession, owner_pet: tuple[int, int]
+) -> None:
+    """New posts published between page requests do not shift the next page."""
+    user_id, _ = owner_pet
+    base = datetime(2030, 1, 1)
+    for i in range(6):
+        db_session.add(CommunityPost(user_id=user_id, content=f"post {i}", created_at=base + timedelta(minutes=i)))
+    await db_session.flush()
+
+    first = (await session_client.get("/api/v1/community/posts", params={"cursor": "", "limit": 3})).json()
+    assert [p["content"] for p in first["items"]] == ["post 5", "post 4", "post 3"]
+    db_session.add(CommunityPost(user_id=user_id, content="newer", created_at=base + timedelta(hours=1)))
+    await db_session.flush()
+    second = (
+        await session_client.get("/api/v1/community/posts", params={"cursor": first["next_cursor"], "limit": 3})
+    ).json()
+    assert [p["content"] for p in second["items"]] == ["post 2", "post 1", "post 0"]
+    assert second["items"][0]["user_name"] == "Owner" and second["items"][0]["pet_name"] is None
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_rejected(session_client: AsyncClient) -> None:
+    """A malformed cursor is a 400, not a server error."""
+    resp = await session_client.get("/api/v1/community/posts", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
@@ -0,0 +1,201 @@
+"""Query and loaded-row budgets for hot endpoints.
+
+A pet with a long history must not make the dashboard endpoints load that history: each endpoint
+gets a fixed number of SQL statements and ORM rows, independent of how many logs exist.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import create_access_token
+from app.crud.pet import pet_crud
+from app.crud.pet_daily_stats import pet_daily_stats_crud
+from app.crud.user import user_crud
+from app.models.activity_state_log import ActivityStateLog
+from app.models.community_post import CommunityPost
+from app.models.eating_log import EatingLog
+from app.models.media_file import MediaFile
+from app.models.sleep_log import SleepLog
+from app.models.user_pet import user_pets
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+HISTORY_SIZE = 200
+
+
+@pytest.fixture
+async def long_lived_pet(db_session: AsyncSession) -> dict:
+    """User linked to a pet with HISTORY_SIZE old sleep/eating/activity-state logs and posts."""
+    user = await user_crud.create(
+        db_session,
+        obj_in=UserCreate(name="Owner", email="owner@budget.com", password="pass123456"),
+    )
+    pet = await pet_crud.create(db_session, obj_in=PetCreate(name="Old Timer", species="dog", owner_id=user.id))
+    await db_session.execute(user_pets.insert().values(user_id=user.id, pet_id=pet.id))
+    start = datetime(2020, 1, 1)
+    for i in range(HISTORY_SIZE):
+        at = start + timedelta(hours=i)
+        db_session.add(SleepLog(pet_id=pet.id, started_at=at, duration_minutes=30, source="device"))
+        db_session.add(EatingLog(pet_id=pet.id, occurred_at=at, meal_type="snack", source="device"))
+        db_session.add(ActivityStateLog(pet_id=pet.id, active=i % 2 == 0, start_time=at))
+        db_session.add(CommunityPost(user_id=user.id, pet_id=pet.id, content=f"post {i}"))
+    await db_session.flush()
+    await pet_daily_stats_crud.rebuild(db_session, pet_id=pet.id)
+    ids = {"user_id": user.id, "pet_id": pet.id, "token": create_access_token(user.id)}
+    # Start each request with an empty identity map, like a fresh request session would
+    db_session.expunge_all()
+    return ids
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("path", "auth", "max_queries", "max_rows"),
+    [
+        ("/api/v1/pets/{pet_id}", False, 2, 1),
+        ("/api/v1/pets", False, 2, 1),
+        ("/api/v1/pets/{pet_id}/stats/activity", False, 2, 1),
+        # Calendars load at most one rollup row per day in range (plus the pet/user)
+        ("/api/v1/pets/{pet_id}/calendar/events?start=2020-01-01&end=2020-01-31", False, 3, 32),
+        ("/api/v1/users/me", True, 1, 1),
+        ("/api/v1/auth/me", True, 1, 1),
+        ("/api/v1/users/me/pets", True, 3, 2),
+        ("/api/v1/users/me/upcoming-events", True, 3, 1),
+        ("/api/v1/users/me/calendar/events?start=2020-01-01&end=2020-01-31", True, 4, 32),
+    ],
+)
+async def test_hot_endpoint_budget(
+    session_client: AsyncClient,
+    long_lived_pet: dict,
+    count_queries,
+    path: str,
+    auth: bool,
+    max_queries: int,
+    max_rows: int,
+) -> None:
+    """Hot endpoints stay within their query/row budget regardless of the pet's history size."""
+    headers = {"Authorization": f"Bearer {long_lived_pet['token']}"} if auth else {}
+    with count_queries as counted:
+        resp = await session_client.get(path.format(**long_lived_pet), headers=headers)
+    assert resp.status_code == 200, resp.text
+    assert counted.queries <= max_queries, counted.statements
+    assert counted.rows <= max_rows
+
+
+@pytest.mark.asyncio
+async def test_writes_cost_one_statement_each(
+    session_client: AsyncClient, long_lived_pet: dict, count_queries
+) -> None:
+    """Creates/updates get server defaults from RETURNING (no refresh SELECT); links are one upsert."""
+    pet_id, user_id = long_lived_pet["pet_id"], long_lived_pet["user_id"]
+    with count_queries as counted:
+        resp = await session_client.post("/api/v1/pets", json={"name": "New", "species": "cat", "owner_id": user_id})
+    assert resp.status_code == 201 and resp.json()["created_at"]
+    assert [s.split()[0] for s in counted.statements] == ["INSERT", "INSERT"], counted.statements
+    assert "DO NOTHING" in counted.statements[1]
+    new_pet_id = resp.json()["id"]
+
+    with count_queries as counted:
+        resp = await session_client.patch(f"/api/v1/pets/{new_pet_id}", json={"name": "Renamed"})
+    assert resp.status_code == 200 and resp.json()["updated_at"]
+    assert [s.split()[0] for s in counted.statements] == ["SELECT", "UPDATE", "SELECT"], counted.statements
+    assert "RETURNING" in counted.statements[1]
+
+    # Linking an already linked pet is a no-op insert, not a collection load
+    with count_queries as counted:
+        resp = await session_client.post(f"/api/v1/pets/{new_pet_id}/add-to-account", params={"user_id": user_id})
+    assert resp.status_code == 201
+    assert not any("JOIN user_pets" in s for s in counted.statements), counted.statements
+
+    with count_queries as counted:
+        resp = await session_client.post(
+            f"/api/v1/pets/{pet_id}/veterinary/visits", json={"visit_date": "2030-01-01", "visit_reason": "Checkup"}
+        )
+    assert resp.status_code == 201 and resp.json()["created_at"]
+    assert counted.queries == 1, counted.statements
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", [1, 25])
+async def test_pet_lists_constant_queries(
+    session_client: AsyncClient, db_session: AsyncSession, count_queries, page_size: int
+) -> None:
+    """GET /pets and /users/me/pets cost the same number of queries for 1 or 25 pets (no per-pet photo lookup)."""
+    user = await user_crud.create(
+        db_session,
+        obj_in=UserCreate(name="Many", email="many@budget.com", password="pass123456"),
+    )
+    for i in range(page_size):
+        pet = await pet_crud.create(db_session, obj_in=PetCreate(name=f"Pet {i}", species="cat", owner_id=user.id))
+        await db_session.execute(user_pets.insert().values(user_id=user.id, pet_id=pet.id))
+        if i % 2 == 0:
+            # Half the pets have an image but no stored pointer (pre-backfill data) -> batched fallback
+            db_session.add(
+                MediaFile(
+                    owner_id=user.id,
+                    pet_id=pet.id,
+                    file_type="image",
+                    mime_type="image/png",
+                    storage_key=f"images/{user.id}/budget-{i}.png",
+                )
+            )
+    await db_session.flush()
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    db_session.expunge_all()
+
+    with count_queries as counted:
+        resp = await session_client.get("/api/v1/users/me/pets", headers=headers)
+    assert resp.status_code == 200
+    pets = resp.json()
+    assert len(pets) == page_size
+    assert sum(1 for p in pets if p["profile_photo_url"]) == (page_size + 1) // 2
+    assert counted.queries <= 3, counted.statements
+
+    with count_queries as counted:
+        resp = await session_client.get("/api/v1/pets", params={"limit": 100})
+    assert resp.status_code == 200
+    assert counted.queries <= 2, counted.statements
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pet_count", [1, 10])
+async def test_my_calendar_constant_queries(
+    session_client: AsyncClient, db_session: AsyncSession, count_queries, pet_count: int
+) -> None:
+    """GET /users/me/calendar/events costs the same number of queries for 1 or 10 linked pets."""
+    user = await user_crud.create(
+        db_session,
+        obj_in=UserCreate(name="Household", email="household@budget.com", password="pass123456"),
+    )
+    for i in range(pet_count):
+        pet = await pet_crud.create(db_session, obj_in=PetCreate(name=f"Pet {i}", species="dog", owner_id=user.id))
+        await db_session.execute(user_pets.insert().values(user_id=user.id, pet_id=pet.id))
+        db_session.add(SleepLog(pet_id=pet.id, started_at=datetime(2024, 5, 2, 22), duration_minutes=60 + i))
+        db_session.add(EatingLog(pet_id=pet.id, occurred_at=datetime(2024, 5, 3, 8), meal_type="breakfast"))
+        await db_session.flush()
+        await pet_daily_stats_crud.rebuild(db_session, pet_id=pet.id)
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    db_session.expunge_all()
+
+    with count_queries as counted:
+        resp = await session_client.get(
+            "/api/v1/users/me/calendar/events", params={"start": "2024-05-01", "end": "2024-05-07"}, headers=headers
+        )
+    assert resp.status_code == 200
+    daily = resp.json()["daily_stats"]
+    assert len(daily) == pet_count * 7
+    assert sum(d["sleep_minutes"] for d in daily) == sum(60 + i for i in range(pet_count))
+    assert sum(d["meals_count"] for d in daily) == pet_count
+    assert counted.queries <= 4, counted.statements
+
+
+@pytest.mark.asyncio
+async def test_veterinary_missing_pet_404(session_client: AsyncClient, count_queries) -> None:
+    """Veterinary routes 404 through the shared pet dependency with a single id lookup."""
+    with count_queries as counted:
+        resp = await session_client.get("/api/v1/pets/999999999/veterinary/visits")
+    assert resp.status_code == 404
+    assert resp.json()["detail"] == "Pet not found"
+    assert counted.queries == 1
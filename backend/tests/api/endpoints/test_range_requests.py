@@ -0,0 +1,114 @@
+"""Range / 206 Partial Content on stored file downloads (local files and ranged remote reads)."""
+
+from typing import BinaryIO
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.downloads import requested_range
+from app.crud.pet import pet_crud
+from app.crud.user import user_crud
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+from app.services.storage.local_storage import LocalFileStorage
+
+PDF = b"%PDF-1.4 " + bytes(range(256)) * 64
+
+
+class RemoteStorage(LocalFileStorage):
+    """Local files served as if remote: no filesystem path, so downloads go through ranged open()."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.opened: list[tuple[int, int | None]] = []
+
+    def local_path(self, key: str) -> None:
+        return None
+
+    def open(self, key: str, start: int = 0, end: int | None = None) -> BinaryIO:
+        self.opened.append((start, end))
+        return super().open(key, start, end)
+
+
+@pytest.fixture
+async def record_url(session_client: AsyncClient, db_session: AsyncSession, temp_storage_path) -> str:
+    user = await user_crud.create(
+        db_session, obj_in=UserCreate(name="Range", email="range@download.com", password="pass123456")
+    )
+    pet = await pet_crud.create(db_session, obj_in=PetCreate(name="Seek", species="dog", owner_id=user.id))
+    base = f"/api/v1/pets/{pet.id}/veterinary/medical-records"
+    resp = await session_client.post(
+        base, params={"owner_id": user.id}, files={"file": ("m.pdf", PDF, "application/pdf")}
+    )
+    assert resp.status_code == 201
+    return f"{base}/{resp.json()['id']}/file"
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("bytes=0-9", (0, 9)),
+        ("bytes=10-", (10, 99)),
+        ("bytes=-30", (70, 99)),
+        ("bytes=90-500", (90, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=0-1,5-6", None),
+        ("items=0-9", None),
+        ("bytes=9-2", None),
+        ("bytes=abc", None),
+    ],
+)
+def test_requested_range(header: str | None, expected: tuple[int, int] | None) -> None:
+    assert requested_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=-0"])
+def test_requested_range_not_satisfiable(header: str) -> None:
+    with pytest.raises(HTTPException) as exc:
+        requested_range(header, 100)
+    assert exc.value.status_code == 416
+    assert exc.value.headers == {"Content-Range": "bytes */100"}
+
+
+@pytest.mark.asyncio
+async def test_local_file_range(session_client: AsyncClient, record_url: str) -> None:
+    """Files on disk are served by FileResponse: whole with Accept-Ranges, or just the requested bytes."""
+    full = await session_client.get(record_url)
+    assert full.status_code == 200 and full.content == PDF
+    assert full.headers["Accept-Ranges"] == "bytes"
+
+    part = await session_client.get(record_url, headers={"Range": "bytes=9-18"})
+    assert part.status_code == 206
+    assert part.content == PDF[9:19]
+    assert part.headers["Content-Range"] == f"bytes 9-18/{len(PDF)}"
+    assert part.headers["ETag"] == full.headers["ETag"]
+
+    past_end = await session_client.get(record_url, headers={"Range": f"bytes={len(PDF)}-"})
+    assert past_end.status_code == 416
+
+
+@pytest.mark.asyncio
+async def test_remote_file_range_reads_only_the_range(
+    session_client: AsyncClient, record_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Without a local path only the requested bytes are read; a stale If-Range gets the whole file."""
+    storage = RemoteStorage()
+    monkeypatch.setattr("app.core.downloads.get_storage", lambda: storage)
+
+    part = await session_client.get(record_url, headers={"Range": "bytes=-100"})
+    assert part.status_code == 206
+    assert part.content == PDF[-100:]
+    assert part.headers["Content-Range"] == f"bytes {len(PDF) - 100}-{len(PDF) - 1}/{len(PDF)}"
+    assert part.headers["Content-Length"] == "100"
+    assert storage.opened == [(len(PDF) - 100, len(PDF) - 1)]
+
+    stale = await session_client.get(record_url, headers={"Range": "bytes=0-9", "If-Range": '"other"'})
+    assert stale.status_code == 200 and stale.content == PDF
+    assert stale.headers["Accept-Ranges"] == "bytes"
+
+    past_end = await session_client.get(record_url, headers={"Range": f"bytes={len(PDF)}-"})
+    assert past_end.status_code == 416
+    assert past_end.headers["Content-Range"] == f"bytes */{len(PDF)}"
@@ -6,10 +6,12 @@ from pathlib import Path
 
 import pytest
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_db
-from app.db.session import async_session_maker
+from app.core.dependencies import get_db, get_primary_read_db, get_read_db
+from app.db.base import Base
+from app.db.session import async_session_maker, engine
 
 
 async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -50,6 +52,59 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
             await session.rollback()
 
 
+@pytest.fixture
+async def session_client(db_session: AsyncSession) -> AsyncClient:
+    """Client whose requests all run in db_session, so rows seeded by the test are visible to the
+    endpoints under test. Everything is rolled back with db_session after the test."""
+    from app.main import app
+
+    async def _shared_db() -> AsyncGenerator[AsyncSession, None]:
+        yield db_session
+
+    app.dependency_overrides[get_db] = _shared_db
+    app.dependency_overrides[get_read_db] = _shared_db
+    app.dependency_overrides[get_primary_read_db] = _shared_db
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+    app.dependency_overrides.clear()
+
+
+class QueryCounter:
+    """Count SQL statements sent to the engine and ORM rows (instances) loaded while active."""
+
+    def __init__(self) -> None:
+        self.statements: list[str] = []
+        self.rows = 0
+
+    @property
+    def queries(self) -> int:
+        return len(self.statements)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(statement)
+
+    def _on_load(self, target, context) -> None:
+        self.rows += 1
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements.clear()
+        self.rows = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        event.listen(Base, "load", self._on_load, propagate=True)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        event.remove(engine.sync_engine, "before_cursor_execute", self._on_execute)
+        event.remove(Base, "load", self._on_load)
+
+
+@pytest.fixture
+def count_queries() -> QueryCounter:
+    """Use as `with count_queries as counted:` to assert query and loaded-row budgets."""
+    return QueryCounter()
+
+
 @pytest.fixture
 def temp_storage_path(monkeypatch: pytest.MonkeyPatch) -> Path:
     """Temporary directory for local storage during tests."""
@@ -0,0 +1,168 @@
+"""Tests for activity-state log ingest (unchanged states), partition upkeep and retention."""
+
+import asyncio
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.activity_state_log import activity_state_log_crud
+from app.crud.pet import pet_crud
+from app.crud.pet_daily_stats import pet_daily_stats_crud
+from app.crud.user import user_crud
+from app.db.locks import PET_ACTIVITY, lock_ids
+from app.db.session import async_session_maker
+from app.models.activity_hourly_stats import ActivityHourlyStats
+from app.models.activity_state_log import ActivityStateLog
+from app.schemas.habits import ActivityStateLogCreate
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+
+@pytest.fixture
+async def db_pet(db_session: AsyncSession) -> int:
+    """Create a user and pet, return pet_id."""
+    user = await user_crud.create(
+        db_session,
+        obj_in=UserCreate(name="Owner", email="owner@activity.com", password="pass123456"),
+    )
+    pet = await pet_crud.create(
+        db_session,
+        obj_in=PetCreate(name="Buddy", species="dog", owner_id=user.id),
+    )
+    return pet.id
+
+
+async def _transitions(db: AsyncSession, pet_id: int) -> list[tuple[bool, datetime]]:
+    q = (
+        select(ActivityStateLog.active, ActivityStateLog.start_time)
+        .where(ActivityStateLog.pet_id == pet_id)
+        .order_by(ActivityStateLog.start_time)
+    )
+    return [tuple(row) for row in (await db.execute(q)).all()]
+
+
+async def _daily_active(db: AsyncSession, pet_id: int) -> dict[date, int]:
+    rows = await pet_daily_stats_crud.get_range(db, pet_id=pet_id, start=date(2024, 1, 1), end=date(2024, 12, 31))
+    return {r.day: r.active_minutes for r in rows if r.active_minutes}
+
+
+@pytest.mark.asyncio
+async def test_create_skips_unchanged_state(db_session: AsyncSession, db_pet: int) -> None:
+    """A transition repeating the latest state is not stored; late transitions always are."""
+    first = await activity_state_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=True, start_time=datetime(2024, 3, 1, 10))
+    )
+    repeated = await activity_state_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=True, start_time=datetime(2024, 3, 1, 11))
+    )
+    assert repeated.id == first.id
+    await activity_state_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=False, start_time=datetime(2024, 3, 1, 12))
+    )
+    await activity_state_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=True, start_time=datetime(2024, 3, 1, 9))
+    )
+    assert await _transitions(db_session, db_pet) == [
+        (True, datetime(2024, 3, 1, 9)),
+        (True, datetime(2024, 3, 1, 10)),
+        (False, datetime(2024, 3, 1, 12)),
+    ]
+    assert await _daily_active(db_session, db_pet) == {date(2024, 3, 1): 180}
+
+
+@pytest.mark.asyncio
+async def test_create_waits_for_a_concurrent_transition(db_session: AsyncSession, db_pet: int) -> None:
+    """A transition reads its neighbours only once another writer for the same pet has finished."""
+    async with async_session_maker() as other:
+        await lock_ids(other, PET_ACTIVITY, [db_pet])  # another transaction is applying a transition
+        pending = asyncio.create_task(
+            activity_state_log_crud.create(
+                db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=True, start_time=datetime(2024, 5, 1))
+            )
+        )
+        await asyncio.sleep(0.2)
+        assert not pending.done()
+        await other.rollback()
+    assert (await pending).active is True
+
+
+@pytest.mark.asyncio
+async def test_create_many_skips_unchanged_states(db_session: AsyncSession, db_pet: int) -> None:
+    """Bulk ingest drops appended repeats of the running state and counts only stored rows."""
+    await activity_state_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=True, start_time=datetime(2024, 3, 1, 10))
+    )
+    inserted = await activity_state_log_crud.create_many(
+        db_session,
+        items=[
+            {"pet_id": db_pet, "active": False, "start_time": datetime(2024, 3, 1, 13)},
+            {"pet_id": db_pet, "active": True, "start_time": datetime(2024, 3, 1, 11)},
+            {"pet_id": db_pet, "active": False, "start_time": datetime(2024, 3, 1, 12)},
+            {"pet_id": db_pet, "active": True, "start_time": datetime(2024, 3, 1, 9)},
+        ],
+    )
+    assert inserted == 2
+    assert await _transitions(db_session, db_pet) == [
+        (True, datetime(2024, 3, 1, 9)),
+        (True, datetime(2024, 3, 1, 10)),
+        (False, datetime(2024, 3, 1, 12)),
+    ]
+    assert await activity_state_log_crud.create_many(
+        db_session, items=[{"pet_id": db_pet, "active": False, "start_time": datetime(2024, 3, 1, 14)}]
+    ) == 0
+
+
+@pytest.mark.asyncio
+async def test_ensure_partitions_moves_rows_out_of_default(db_session: AsyncSession, db_pet: int) -> None:
+    """Creating a month partition takes over that month's rows from the default partition."""
+    await activity_state_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=True, start_time=datetime(2031, 5, 10))
+    )
+    created = await activity_state_log_crud.ensure_partitions(db_session, today=date(2031, 4, 20), months_ahead=1)
+    assert created == ["activity_state_logs_p2031_04", "activity_state_logs_p2031_05"]
+    assert await activity_state_log_crud.ensure_partitions(db_session, today=date(2031, 4, 20), months_ahead=1) == []
+    partition = await db_session.execute(
+        text("SELECT tableoid::regclass::text FROM activity_state_logs WHERE pet_id = :pet_id"), {"pet_id": db_pet}
+    )
+    assert partition.scalar_one() == "activity_state_logs_p2031_05"
+
+
+@pytest.mark.asyncio
+async def test_expire_rolls_up_hourly_and_rebuild_keeps_daily_stats(db_session: AsyncSession, db_pet: int) -> None:
+    """Expired transitions survive as hourly rows (intervals closed by kept ones included)."""
+    await activity_state_log_crud.ensure_partitions(db_session, today=date(2024, 3, 1), months_ahead=0)
+    for active, at in [
+        (True, datetime(2024, 3, 1, 23, 30)),
+        (False, datetime(2024, 3, 2, 0, 45)),
+        (True, datetime(2024, 3, 31, 23, 50)),
+        (False, datetime(2024, 4, 1, 0, 10)),
+    ]:
+        await activity_state_log_crud.create(
+            db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=active, start_time=at)
+        )
+    daily = await _daily_active(db_session, db_pet)
+    assert daily == {date(2024, 3, 1): 30, date(2024, 3, 2): 45, date(2024, 3, 31): 10, date(2024, 4, 1): 10}
+
+    dropped = await activity_state_log_crud.expire(db_session, before=date(2024, 4, 1))
+    assert "activity_state_logs_p2024_03" in dropped
+    assert await _transitions(db_session, db_pet) == [(False, datetime(2024, 4, 1, 0, 10))]
+    hourly = await db_session.execute(
+        select(ActivityHourlyStats.hour, ActivityHourlyStats.active_seconds, ActivityHourlyStats.transitions)
+        .where(ActivityHourlyStats.pet_id == db_pet)
+        .order_by(ActivityHourlyStats.hour)
+    )
+    assert [tuple(row) for row in hourly.all()] == [
+        (datetime(2024, 3, 1, 23), 1800, 1),
+        (datetime(2024, 3, 2, 0), 2700, 1),
+        (datetime(2024, 3, 31, 23), 600, 1),
+        (datetime(2024, 4, 1, 0), 600, 0),
+    ]
+
+    await pet_daily_stats_crud.rebuild(db_session, pet_id=db_pet)
+    assert await _daily_active(db_session, db_pet) == daily
+    remaining = await db_session.execute(
+        select(func.count()).select_from(ActivityStateLog).where(ActivityStateLog.start_time < datetime(2024, 4, 1))
+    )
+    assert remaining.scalar_one() == 0
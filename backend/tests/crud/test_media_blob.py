@@ -0,0 +1,84 @@
+"""Tests for content-addressed media blobs: sharing and the orphan sweep."""
+
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.media_blob import media_blob_crud
+from app.crud.user import user_crud
+from app.models.media_blob import MediaBlob
+from app.models.media_file import MediaFile
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+SHA = "ab" * 32
+
+
+@pytest.mark.asyncio
+async def test_acquire_and_sweep(db_session: AsyncSession) -> None:
+    """The first acquire creates the blob; later ones share it; the sweep takes it once unreferenced."""
+    assert await media_blob_crud.acquire(db_session, sha256=SHA, storage_key="blobs/ab/first", size=10) == (
+        "blobs/ab/first",
+        True,
+    )
+    # Same content under another proposed key: the existing blob's key wins, nothing to write
+    assert await media_blob_crud.acquire(db_session, sha256=SHA, storage_key="blobs/ab/second", size=10) == (
+        "blobs/ab/first",
+        False,
+    )
+    # Acquired just now: kept for the grace period
+    assert await media_blob_crud.next_orphan(db_session, grace=timedelta(hours=1)) is None
+
+    await db_session.execute(
+        update(MediaBlob).where(MediaBlob.sha256 == SHA).values(updated_at=MediaBlob.updated_at - timedelta(hours=2))
+    )
+    orphan = await media_blob_crud.next_orphan(db_session, grace=timedelta(hours=1))
+    assert orphan is not None and orphan.storage_key == "blobs/ab/first"
+    await media_blob_crud.remove(db_session, orphan)
+    assert await db_session.get(MediaBlob, SHA) is None
+
+
+@pytest.mark.asyncio
+async def test_blob_of_cascade_deleted_files_is_swept(db_session: AsyncSession) -> None:
+    """Media files removed with their owner (ON DELETE CASCADE) leave their blob to the sweep."""
+    user = await user_crud.create(
+        db_session, obj_in=UserCreate(name="Gone", email="gone@blob.com", password="pass123456")
+    )
+    key, _ = await media_blob_crud.acquire(db_session, sha256=SHA, storage_key="blobs/ab/gone", size=10)
+    db_session.add(
+        MediaFile(
+            owner_id=user.id,
+            file_type="image",
+            mime_type="image/png",
+            storage_key=key,
+            storage_backend="local",
+            file_size_bytes=10,
+            content_sha256=SHA,
+        )
+    )
+    await db_session.flush()
+    await db_session.execute(
+        update(MediaBlob).where(MediaBlob.sha256 == SHA).values(updated_at=MediaBlob.updated_at - timedelta(hours=2))
+    )
+    assert await media_blob_crud.next_orphan(db_session, grace=timedelta(hours=1)) is None
+
+    await db_session.execute(delete(User).where(User.id == user.id))
+    orphan = await media_blob_crud.next_orphan(db_session, grace=timedelta(hours=1))
+    assert orphan is not None and orphan.sha256 == SHA
+
+
+@pytest.mark.asyncio
+async def test_adopted_file_expires_or_is_reused(db_session: AsyncSession) -> None:
+    """A blob file found without a row is adopted as already aged; an upload of it reuses the file."""
+    keys = ["blobs/ab/old", "blobs/ab/recent"]
+    assert await media_blob_crud.existing_keys(db_session, keys) == set()
+    assert await media_blob_crud.adopt(db_session, sha256=SHA, storage_key=keys[0], size=10, age=timedelta(hours=2))
+    assert not await media_blob_crud.adopt(db_session, sha256=SHA, storage_key=keys[1], size=10, age=timedelta(0))
+    assert await media_blob_crud.existing_keys(db_session, keys) == {keys[0]}
+
+    orphan = await media_blob_crud.next_orphan(db_session, grace=timedelta(hours=1))
+    assert orphan is not None and orphan.storage_key == keys[0]
+    reused = await media_blob_crud.acquire(db_session, sha256=SHA, storage_key="blobs/ab/new", size=10)
+    assert reused == (keys[0], False)
@@ -1,11 +1,18 @@
 """Tests for pet CRUD operations."""
 
+from datetime import datetime
+
 import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import InvalidRequestError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.pet import pet_crud
 from app.crud.user import user_crud
+from app.models.media_file import MediaFile
+from app.models.sleep_log import SleepLog
 from app.models.user import User
+from app.models.user_pet import user_pets
 from app.schemas.pet import PetCreate, PetUpdate
 from app.schemas.user import UserCreate
 
@@ -96,3 +103,92 @@ async def test_pet_delete_not_found(db_session: AsyncSession) -> None:
     """Delete unknown pet returns False."""
     deleted = await pet_crud.delete(db_session, id=99999)
     assert deleted is False
+
+
+@pytest.mark.asyncio
+async def test_pet_get_lean_profile_loads_no_collections(
+    db_session: AsyncSession, sample_pet_create: PetCreate
+) -> None:
+    """Default (lean) profile leaves collections unloaded; touching one raises instead of querying."""
+    created = await pet_crud.create(db_session, obj_in=sample_pet_create)
+    db_session.expunge_all()
+    pet = await pet_crud.get(db_session, id=created.id)
+    assert "sleep_logs" not in pet.__dict__
+    with pytest.raises(InvalidRequestError):
+        _ = pet.sleep_logs
+
+
+@pytest.mark.asyncio
+async def test_pet_get_linked_users_profile(
+    db_session: AsyncSession, sample_pet_create: PetCreate, db_user: User
+) -> None:
+    """linked_users profile eager-loads the users the pet is shared with."""
+    created = await pet_crud.create(db_session, obj_in=sample_pet_create)
+    await db_session.execute(user_pets.insert().values(user_id=db_user.id, pet_id=created.id))
+    db_session.expunge_all()
+    pet = await pet_crud.get(db_session, id=created.id, profile="linked_users")
+    assert [u.id for u in pet.linked_users] == [db_user.id]
+
+
+@pytest.mark.asyncio
+async def test_pet_delete_with_history(db_session: AsyncSession, sample_pet_create: PetCreate) -> None:
+    """Deleting a pet leaves its logs to the database's ON DELETE CASCADE (nothing is loaded)."""
+    created = await pet_crud.create(db_session, obj_in=sample_pet_create)
+    db_session.add(SleepLog(pet_id=created.id, started_at=datetime(2024, 1, 1), source="manual"))
+    await db_session.flush()
+    db_session.expunge_all()
+    assert await pet_crud.delete(db_session, id=created.id) is True
+    remaining = await db_session.scalar(select(func.count()).select_from(SleepLog).where(SleepLog.pet_id == created.id))
+    assert remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_pet_profile_media_pointer(db_session: AsyncSession, sample_pet_create: PetCreate, db_user: User) -> None:
+    """set_profile_media wins over the latest-image fallback; deleting the media clears the pointer."""
+    created = await pet_crud.create(db_session, obj_in=sample_pet_create)
+    media = [
+        MediaFile(
+            owner_id=db_user.id, pet_id=created.id, file_type="image", mime_type="image/png", storage_key=f"k/{i}.png"
+        )
+        for i in range(2)
+    ]
+    db_session.add_all(media)
+    await db_session.flush()
+    assert await pet_crud.get_profile_media_ids(db_session, pets=[created]) == {created.id: media[1].id}
+
+    await pet_crud.set_profile_media(db_session, pet_id=created.id, media_id=media[0].id)
+    pet = await pet_crud.get(db_session, id=created.id)
+    assert await pet_crud.get_profile_media_ids(db_session, pets=[pet]) == {created.id: media[0].id}
+
+    await db_session.delete(media[0])
+    await db_session.flush()
+    db_session.expunge_all()
+    pet = await pet_crud.get(db_session, id=created.id)
+    assert pet.profile_media_id is None
+    assert await pet_crud.get_profile_media_ids(db_session, pets=[pet]) == {created.id: media[1].id}
+
+
+@pytest.mark.asyncio
+async def test_pet_exists_is_memoized_per_session(
+    db_session: AsyncSession, sample_pet_create: PetCreate, count_queries
+) -> None:
+    """exists() selects only the id once per session; get_lean() reuses the identity map."""
+    created = await pet_crud.create(db_session, obj_in=sample_pet_create)
+    db_session.expunge_all()
+    db_session.info.clear()
+    with count_queries as counted:
+        assert await pet_crud.exists(db_session, created.id) is True
+        assert await pet_crud.exists(db_session, created.id) is True
+        assert await pet_crud.exists(db_session, 99999) is False
+        assert await pet_crud.exists(db_session, 99999) is False
+    assert counted.queries == 2
+    assert counted.rows == 0
+    assert all("pets.name" not in s for s in counted.statements)
+
+    with count_queries as counted:
+        pet = await pet_crud.get_lean(db_session, created.id)
+        assert await pet_crud.get_lean(db_session, created.id) is pet
+    assert counted.queries == 1
+
+    assert await pet_crud.delete(db_session, id=created.id) is True
+    assert await pet_crud.exists(db_session, created.id) is False
@@ -0,0 +1,148 @@
+"""Tests for the pet_daily_stats rollup (incremental maintenance vs rebuild from raw logs)."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.activity_state_log import activity_state_log_crud
+from app.crud.eating_log import eating_log_crud
+from app.crud.pet import pet_crud
+from app.crud.pet_daily_stats import pet_daily_stats_crud
+from app.crud.sleep_log import sleep_log_crud
+from app.crud.user import user_crud
+from app.schemas.habits import ActivityStateLogCreate, EatingLogCreate, SleepLogCreate
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+START = date(2024, 3, 1)
+END = date(2024, 3, 5)
+
+
+@pytest.fixture
+async def db_pet(db_session: AsyncSession) -> int:
+    """Create a user and pet, return pet_id."""
+    user = await user_crud.create(
+        db_session,
+        obj_in=UserCreate(name="Owner", email="owner@rollup.com", password="pass123456"),
+    )
+    pet = await pet_crud.create(
+        db_session,
+        obj_in=PetCreate(name="Buddy", species="dog", owner_id=user.id),
+    )
+    return pet.id
+
+
+async def _snapshot(db: AsyncSession, pet_id: int) -> dict[date, tuple[int, int, int]]:
+    rows = await pet_daily_stats_crud.get_range(db, pet_id=pet_id, start=START, end=END)
+    return {
+        r.day: (r.sleep_minutes, r.meals_count, r.active_minutes)
+        for r in rows
+        if (r.sleep_minutes, r.meals_count, r.active_minutes) != (0, 0, 0)
+    }
+
+
+@pytest.mark.asyncio
+async def test_sleep_and_eating_update_rollup(db_session: AsyncSession, db_pet: int) -> None:
+    """Creating sleep/eating logs adds to the day's totals."""
+    await sleep_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=SleepLogCreate(started_at=datetime(2024, 3, 1, 22), duration_minutes=90)
+    )
+    await sleep_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=SleepLogCreate(started_at=datetime(2024, 3, 1, 13), duration_minutes=30)
+    )
+    await eating_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=EatingLogCreate(occurred_at=datetime(2024, 3, 2, 8), meal_type="breakfast")
+    )
+    assert await _snapshot(db_session, db_pet) == {
+        date(2024, 3, 1): (120, 0, 0),
+        date(2024, 3, 2): (0, 1, 0),
+    }
+
+
+@pytest.mark.asyncio
+async def test_activity_transitions_update_rollup(db_session: AsyncSession, db_pet: int) -> None:
+    """Active intervals count once closed, split at midnight; late transitions split existing intervals."""
+    for active, at in [
+        (True, datetime(2024, 3, 1, 23, 30)),
+        (False, datetime(2024, 3, 2, 0, 45)),
+        (True, datetime(2024, 3, 2, 10)),
+    ]:
+        await activity_state_log_crud.create(
+            db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=active, start_time=at)
+        )
+    # Last interval is still open
+    assert await _snapshot(db_session, db_pet) == {
+        date(2024, 3, 1): (0, 0, 30),
+        date(2024, 3, 2): (0, 0, 45),
+    }
+    # Out-of-order rest inside the first active interval
+    await activity_state_log_crud.create(
+        db_session,
+        pet_id=db_pet,
+        obj_in=ActivityStateLogCreate(active=False, start_time=datetime(2024, 3, 1, 23, 50)),
+    )
+    await activity_state_log_crud.create(
+        db_session,
+        pet_id=db_pet,
+        obj_in=ActivityStateLogCreate(active=False, start_time=datetime(2024, 3, 2, 11)),
+    )
+    assert await _snapshot(db_session, db_pet) == {
+        date(2024, 3, 1): (0, 0, 20),
+        date(2024, 3, 2): (0, 0, 60),
+    }
+
+
+@pytest.mark.asyncio
+async def test_rebuild_matches_incremental(db_session: AsyncSession, db_pet: int) -> None:
+    """Rebuilding from raw logs reproduces the incrementally maintained rollup."""
+    transitions = [
+        (True, datetime(2024, 3, 1, 8, 0, 20)),
+        (False, datetime(2024, 3, 3, 2, 10, 40)),
+        (True, datetime(2024, 3, 1, 12, 0, 50)),
+        (False, datetime(2024, 3, 1, 9, 30, 10)),
+        (True, datetime(2024, 3, 3, 2, 10, 40)),
+        (False, datetime(2024, 3, 4, 6, 0)),
+        (True, datetime(2024, 3, 2, 23, 59, 59)),
+    ]
+    for active, at in transitions:
+        await activity_state_log_crud.create(
+            db_session, pet_id=db_pet, obj_in=ActivityStateLogCreate(active=active, start_time=at)
+        )
+    await sleep_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=SleepLogCreate(started_at=datetime(2024, 3, 2, 22), duration_minutes=480)
+    )
+    await eating_log_crud.create(
+        db_session, pet_id=db_pet, obj_in=EatingLogCreate(occurred_at=datetime(2024, 3, 4, 8), meal_type="breakfast")
+    )
+    incremental = await _snapshot(db_session, db_pet)
+    assert incremental
+
+    await pet_daily_stats_crud.rebuild(db_session, pet_id=db_pet)
+    db_session.expire_all()
+    assert await _snapshot(db_session, db_pet) == incremental
+
+
+@pytest.mark.asyncio
+async def test_bulk_import_over_many_days(db_session: AsyncSession, db_pet: int) -> None:
+    """A bulk import touching more pet-days than fit in one statement's bind parameters (32767 / 5)."""
+    days = 7000
+    first = datetime(2000, 1, 1, 22)
+    items = [
+        {
+            "pet_id": db_pet,
+            "started_at": first + timedelta(days=n),
+            "ended_at": None,
+            "duration_minutes": 60,
+            "notes": None,
+            "source": "manual",
+        }
+        for n in range(days)
+    ]
+    assert await sleep_log_crud.create_many(db_session, items=items) == days
+    await sleep_log_crud.create_many(db_session, items=items[:1])
+    rows = await pet_daily_stats_crud.get_range(
+        db_session, pet_id=db_pet, start=first.date(), end=first.date() + timedelta(days=days)
+    )
+    assert len(rows) == days
+    assert rows[0].sleep_minutes == 120 and rows[-1].sleep_minutes == 60
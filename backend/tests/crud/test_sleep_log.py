@@ -6,7 +6,7 @@ import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.pet import pet_crud
-from app.crud.sleep_log import sleep_log_crud
+from app.crud.sleep_log import _list_statement, sleep_log_crud
 from app.crud.user import user_crud
 from app.schemas.habits import SleepLogCreate
 from app.schemas.pet import PetCreate
@@ -78,3 +78,23 @@ async def test_sleep_log_get_multi_since_until(
         until=datetime(2030, 1, 1),
     )
     assert isinstance(logs, list)
+
+
+@pytest.mark.asyncio
+async def test_sleep_log_get_multi_returns_rows_without_orm_state(
+    db_session: AsyncSession, db_pet: int
+) -> None:
+    """The list read yields plain rows (no instances in the session) from a reused statement."""
+    for minutes in (30, 45):
+        obj_in = SleepLogCreate(started_at=datetime(2025, 1, 1, 22, minutes), duration_minutes=minutes)
+        await sleep_log_crud.create(db_session, pet_id=db_pet, obj_in=obj_in)
+    db_session.expunge_all()
+    logs = await sleep_log_crud.get_multi(db_session, pet_id=db_pet, since=datetime(2025, 1, 1))
+    assert [log.duration_minutes for log in logs] == [45, 30]
+    assert list(db_session.identity_map.values()) == []
+
+    page = await sleep_log_crud.get_multi(
+        db_session, pet_id=db_pet, since=datetime(2024, 1, 1), after=(logs[0].started_at, logs[0].id)
+    )
+    assert [log.id for log in page] == [logs[1].id]
+    assert _list_statement.cache_info().hits >= 1
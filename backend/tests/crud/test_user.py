@@ -1,10 +1,16 @@
 """Tests for user CRUD operations."""
 
+import asyncio
+
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.core.security import aget_password_hash, averify_password
+from app.crud.pet import pet_crud
 from app.crud.user import user_crud
 from app.models.user import User
+from app.schemas.pet import PetCreate
 from app.schemas.user import UserCreate, UserUpdate
 
 
@@ -98,8 +104,67 @@ async def test_user_delete(db_session: AsyncSession, sample_user_create: UserCre
     assert user is None
 
 
+@pytest.mark.asyncio
+async def test_user_delete_keeps_shared_pet(db_session: AsyncSession) -> None:
+    """Deleting a pet's owner leaves the pet, ownerless, to the users it is shared with."""
+    owner = await user_crud.create(
+        db_session, obj_in=UserCreate(name="Owner", email="owner@shared.com", password="pass123456")
+    )
+    friend = await user_crud.create(
+        db_session, obj_in=UserCreate(name="Friend", email="friend@shared.com", password="pass123456")
+    )
+    pet = await pet_crud.create(db_session, obj_in=PetCreate(name="Shared", species="cat", owner_id=owner.id))
+    pet_id, friend_id = pet.id, friend.id
+    await user_crud.link_pet(db_session, user_id=friend_id, pet_id=pet_id)
+
+    assert await user_crud.delete(db_session, id=owner.id) is True
+    db_session.expire_all()
+    kept = await pet_crud.get(db_session, pet_id)
+    assert kept is not None and kept.owner_id is None
+    _, pet_ids = await user_crud.get_with_pet_ids(db_session, id=friend_id)
+    assert pet_ids == [pet_id]
+
+
 @pytest.mark.asyncio
 async def test_user_delete_not_found(db_session: AsyncSession) -> None:
     """Delete unknown user returns False."""
     deleted = await user_crud.delete(db_session, id=99999)
     assert deleted is False
+
+
+@pytest.mark.asyncio
+async def test_user_check_password_rehashes_outdated_cost(
+    db_session: AsyncSession, sample_user_create: UserCreate, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A successful login replaces a hash made with another cost factor; a wrong password changes nothing."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+    created = await user_crud.create(db_session, obj_in=sample_user_create)
+    assert created.hashed_password.startswith("$2b$04$")
+
+    monkeypatch.setattr(settings, "bcrypt_rounds", 5)
+    assert await user_crud.check_password(db_session, user=created, password="wrong") is False
+    assert created.hashed_password.startswith("$2b$04$")
+    assert await user_crud.check_password(db_session, user=created, password=sample_user_create.password)
+    assert created.hashed_password.startswith("$2b$05$")
+    assert await user_crud.check_password(db_session, user=created, password=sample_user_create.password)
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_does_not_block_event_loop() -> None:
+    """Hashing runs on the bounded pool: the event loop keeps serving other tasks meanwhile."""
+    ticks = 0
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        nonlocal ticks
+        while not done.is_set():
+            ticks += 1
+            await asyncio.sleep(0.005)
+
+    task = asyncio.create_task(ticker())
+    hashed = await aget_password_hash("securepass123")
+    assert await averify_password("securepass123", hashed)
+    done.set()
+    await task
+    assert ticks >= 10
@@ -66,3 +66,53 @@ def test_local_storage_key_for_format(local_storage: LocalFileStorage) -> None:
     assert key.startswith("images/42/")
     assert key.endswith(".jpg")
     assert len(key) > 20
+
+
+@pytest.mark.asyncio
+async def test_local_storage_async_api(local_storage: LocalFileStorage) -> None:
+    """asave/aread/aopen_stream/adelete mirror the blocking calls; streams come in chunks."""
+    key = local_storage.key_for("video", 1, "clip.mp4")
+    data = bytes(range(256)) * 4096  # 1 MiB
+    assert await local_storage.asave(key, data, content_type="video/mp4") == key
+    assert await local_storage.aread(key) == data
+    chunks = [chunk async for chunk in await local_storage.aopen_stream(key, chunk_size=300_000)]
+    assert [len(c) for c in chunks] == [300_000, 300_000, 300_000, 148_576]
+    assert b"".join(chunks) == data
+    await local_storage.adelete(key)
+    with pytest.raises(FileNotFoundError):
+        await local_storage.aopen_stream(key)
+
+
+@pytest.mark.asyncio
+async def test_local_storage_writer_is_atomic(local_storage: LocalFileStorage, temp_dir: Path) -> None:
+    """A streamed file appears under its key only on commit; abort leaves nothing behind."""
+    key = local_storage.key_for("video", 1, "clip.mp4")
+    local_storage.save(key, b"old")
+    writer = await local_storage.aopen_writer(key, "video/mp4")
+    for _ in range(8):
+        await writer.write(b"x" * 100_000)
+    assert local_storage.read(key) == b"old"
+    await writer.commit()
+    assert local_storage.read(key) == b"x" * 800_000
+
+    writer = await local_storage.aopen_writer(key, "video/mp4")
+    await writer.write(b"y" * 300_000)
+    await writer.abort()
+    assert local_storage.read(key) == b"x" * 800_000
+    assert [p.name for p in temp_dir.rglob("*") if p.is_file()] == [Path(key).name]
+
+
+@pytest.mark.asyncio
+async def test_local_storage_lists_files_and_blob_keys(local_storage: LocalFileStorage) -> None:
+    """list_files matches key prefixes (not just directories); blob keys map back to their hash."""
+    sha256 = "cd" * 32
+    for key in (local_storage.blob_key(sha256), local_storage.staging_key(), "images/1/a.png", "blobsy/x"):
+        local_storage.save(key, b"12345")
+    listed = sorted([f.key async for f in local_storage.alist_files("blobs/", batch_size=1)])
+    assert len(listed) == 2 and listed[0] == local_storage.blob_key(sha256)
+    assert listed[1].startswith("blobs/incoming/")
+    assert [(f.key, f.size) for f in local_storage.list_files("images/1/a")] == [("images/1/a.png", 5)]
+
+    assert local_storage.blob_sha256(local_storage.blob_key(sha256)) == sha256
+    assert local_storage.blob_sha256(listed[1]) is None
+    assert local_storage.blob_sha256(f"blobs/ab/{sha256}") is None
@@ -0,0 +1,53 @@
+"""Connection pool instrumentation tests."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool import InstrumentedAsyncQueuePool, pool_stats
+from app.db.session import engine
+
+
+@pytest.fixture
+async def tiny_engine():
+    """Engine on the test database with a single pooled connection and no overflow."""
+    eng = create_async_engine(
+        engine.url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.2,
+    )
+    yield eng
+    await eng.dispose()
+
+
+@pytest.mark.asyncio
+async def test_pool_records_wait_and_timeouts(tiny_engine) -> None:
+    """A checkout blocked on the only connection is counted as wait time, or a timeout once it gives up."""
+    async with tiny_engine.connect() as held:
+        await held.execute(text("SELECT 1"))
+        stats = pool_stats(tiny_engine)
+        assert (stats["size"], stats["open"], stats["checked_out"], stats["overflow"]) == (1, 1, 1, 0)
+
+        with pytest.raises(PoolTimeoutError):
+            async with tiny_engine.connect():
+                pass
+        assert pool_stats(tiny_engine)["timeouts"] == 1
+
+        async def release_soon() -> None:
+            await asyncio.sleep(0.05)
+            await held.close()
+
+        releaser = asyncio.create_task(release_soon())
+        async with tiny_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        await releaser
+
+    stats = pool_stats(tiny_engine)
+    assert stats["checkouts"] == 3
+    assert stats["checked_out"] == 0
+    assert stats["wait_max_ms"] >= 40
@@ -12,3 +12,17 @@ async def test_health_returns_ok(client: AsyncClient) -> None:
     data = response.json()
     assert data["status"] == "ok"
     assert "version" in data
+
+
+@pytest.mark.asyncio
+async def test_health_pool_reports_pool_stats(client: AsyncClient) -> None:
+    """GET /api/health/pool reports occupancy and checkout wait stats."""
+    await client.get("/api/health/access")
+    response = await client.get("/api/health/pool")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["pool"] == "InstrumentedAsyncQueuePool"
+    assert data["checkouts"] >= 1
+    assert data["checked_out"] >= 0
+    for key in ("size", "open", "checked_in", "overflow", "timeouts", "wait_avg_ms", "wait_max_ms"):
+        assert key in data
@@ -0,0 +1,155 @@
+"""Live pet events: LISTEN/NOTIFY fan-out and the SSE stream."""
+
+import asyncio
+from datetime import datetime
+from typing import Any
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.live_events import RESYNC, LiveEvents, live_events
+from app.crud.activity_state_log import activity_state_log_crud
+from app.crud.pet import pet_crud
+from app.crud.sleep_log import sleep_log_crud
+from app.crud.user import user_crud
+from app.db.session import async_session_maker
+from app.main import app
+from app.models.pet import Pet
+from app.models.user import User
+from app.schemas.habits import SleepLogCreate
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate
+
+TIMEOUT = 5
+
+
+class SSEClient:
+    """Calls the ASGI app directly so the streamed body can be read chunk by chunk."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.chunks: asyncio.Queue[Any] = asyncio.Queue()
+        self._requested = False
+        self._disconnect = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "SSEClient":
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"test")],
+            "client": ("127.0.0.1", 12345),
+            "server": ("test", 80),
+        }
+        self._task = asyncio.create_task(app(scope, self._receive, self._send))
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._disconnect.set()
+        await asyncio.wait_for(self._task, TIMEOUT)
+
+    async def next(self) -> Any:
+        return await asyncio.wait_for(self.chunks.get(), TIMEOUT)
+
+    async def _receive(self) -> dict:
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self._disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def _send(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            await self.chunks.put(message["status"])
+        elif message.get("body"):
+            await self.chunks.put(message["body"])
+
+
+@pytest.mark.asyncio
+async def test_notifications_are_delivered_on_commit_only() -> None:
+    """Subscribers of a pet get events published in committed transactions, not rolled back ones."""
+    async with live_events.subscribe(987_654) as queue, live_events.subscribe(987_655) as other:
+        async with async_session_maker() as db:
+            await live_events.publish(db, 987_654, "sleep_log", {"id": 1})
+            await db.rollback()
+        async with async_session_maker() as db:
+            await live_events.publish(db, 987_654, "sleep_log", {"id": 2})
+            assert queue.empty()
+            await db.commit()
+        assert await asyncio.wait_for(queue.get(), TIMEOUT) == b'event: sleep_log\ndata: {"id":2}\n\n'
+        assert queue.empty()
+        assert other.empty()
+    assert live_events.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_told_to_resync() -> None:
+    """When a subscriber's queue is full it is dropped, its oldest event making room for resync."""
+
+    async def no_connection() -> Any:
+        raise AssertionError("not used")
+
+    events = LiveEvents(no_connection, queue_size=2)
+    queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=2)
+    events._subscribers[1].add(queue)
+    for i in range(3):
+        events._on_notify(None, 0, "pet_events", f'1 sleep_log {{"id":{i}}}')
+    assert events.subscriber_count() == 0
+    assert [queue.get_nowait(), queue.get_nowait()] == [b'event: sleep_log\ndata: {"id":1}\n\n', RESYNC]
+
+
+@pytest.mark.asyncio
+async def test_event_stream_pushes_committed_logs() -> None:
+    """GET /pets/{id}/events streams new logs once committed; bulk ingestion sends one summary event."""
+    async with async_session_maker() as db:
+        user = await user_crud.create(
+            db, obj_in=UserCreate(name="Owner", email="owner@live-events.com", password="pass123456")
+        )
+        pet = await pet_crud.create(db, obj_in=PetCreate(name="Buddy", species="dog", owner_id=user.id))
+        await db.commit()
+    try:
+        async with SSEClient(f"/api/v1/pets/{pet.id}/events") as stream:
+            assert await stream.next() == 200
+            assert await stream.next() == b": subscribed\n\n"
+            async with async_session_maker() as db:
+                log = await sleep_log_crud.create(
+                    db, pet_id=pet.id, obj_in=SleepLogCreate(started_at=datetime(2024, 6, 1, 22), duration_minutes=60)
+                )
+                await db.commit()
+            frame = await stream.next()
+            assert frame.startswith(b"event: sleep_log\ndata: {")
+            assert f'"id":{log.id}'.encode() in frame and b'"duration_minutes":60' in frame
+
+            async with async_session_maker() as db:
+                await activity_state_log_crud.create_many(
+                    db,
+                    items=[
+                        {"pet_id": pet.id, "active": active, "start_time": datetime(2024, 6, 1, hour)}
+                        for hour, active in [(8, True), (9, False), (10, True)]
+                    ],
+                )
+                await db.commit()
+            assert await stream.next() == (
+                b'event: logs_imported\ndata: {"log":"activity_state","count":3,'
+                b'"since":"2024-06-01T08:00:00","until":"2024-06-01T10:00:00"}\n\n'
+            )
+        assert live_events.subscriber_count() == 0
+    finally:
+        async with async_session_maker() as db:
+            await db.execute(delete(Pet).where(Pet.id == pet.id))
+            await db.execute(delete(User).where(User.id == user.id))
+            await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_event_stream_unknown_pet() -> None:
+    """Subscribing to a missing pet is a 404, not an empty stream."""
+    async with SSEClient("/api/v1/pets/999999999/events") as stream:
+        assert await stream.next() == 404
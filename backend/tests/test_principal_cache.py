@@ -0,0 +1,80 @@
+"""Verified-token -> principal cache tests."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.principal_cache import Principal, PrincipalCache, principal_cache
+from app.core.security import create_access_token
+from app.crud.pet import pet_crud
+from app.crud.user import user_crud
+from app.schemas.pet import PetCreate
+from app.schemas.user import UserCreate, UserUpdate
+
+
+def test_cache_respects_exp_ttl_and_size() -> None:
+    """Entries expire at min(exp, now + ttl); the least recently used entry is evicted first."""
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    p = Principal(user_id=1, email="a@x.com", pet_ids=(5,))
+    cache.set("expired", p, token_user_id=1, exp=time.time() - 1)
+    assert cache.get("expired") is None
+
+    cache.set("a", p, token_user_id=1, exp=None)
+    cache.set("b", p, token_user_id=1, exp=time.time() + 3600)
+    assert cache.get("a") is p  # a is now most recent
+    cache.set("c", p, token_user_id=1, exp=None)
+    assert cache.get("b") is None
+    assert cache.get("a") is p and cache.get("c") is p
+
+    cache.invalidate_pet(5)
+    assert len(cache) == 0
+    assert len(PrincipalCache(max_entries=2, ttl_seconds=0)) == 0
+
+
+def test_invalidation_repeated_after_commit() -> None:
+    """A principal cached from the old rows between a write and its commit is dropped at commit."""
+    cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+    db = SimpleNamespace(info={})
+    cache.invalidate_user(1, db)
+    cache.invalidate_pet(5, db)
+    cache.set("stale-user", Principal(user_id=1, email="a@x.com", pet_ids=()), token_user_id=1, exp=None)
+    cache.set("stale-pet", Principal(user_id=2, email="b@x.com", pet_ids=(5,)), token_user_id=2, exp=None)
+    cache.set("other", Principal(user_id=3, email="c@x.com", pet_ids=(6,)), token_user_id=3, exp=None)
+    cache.invalidate_committed(db)
+    assert cache.get("stale-user") is None and cache.get("stale-pet") is None
+    assert cache.get("other") is not None and db.info == {}
+
+
+@pytest.mark.asyncio
+async def test_authenticated_requests_skip_db_lookup(
+    session_client: AsyncClient, db_session: AsyncSession, count_queries
+) -> None:
+    """After the first request, identifying the caller costs no query; writes to the user invalidate it."""
+    user = await user_crud.create(
+        db_session, obj_in=UserCreate(name="Cached", email="cached@auth.com", password="pass123456")
+    )
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    principal_cache.clear()
+
+    with count_queries as counted:
+        resp = await session_client.get("/api/v1/users/me/upcoming-events", headers=headers)
+    assert resp.status_code == 200
+    assert counted.queries == 1, counted.statements  # token miss: user + linked pet ids in one query
+
+    with count_queries as counted:
+        resp = await session_client.get("/api/v1/users/me/upcoming-events", headers=headers)
+    assert resp.json() == {"events": []}
+    assert counted.queries == 0, counted.statements
+
+    # Linking a pet drops the cached principal so the new pet is visible at once
+    pet = await pet_crud.create(db_session, obj_in=PetCreate(name="New", species="dog"))
+    resp = await session_client.post(f"/api/v1/pets/{pet.id}/add-to-account", params={"user_id": user.id})
+    assert resp.status_code == 201
+    await session_client.get("/api/v1/users/me/upcoming-events", headers=headers)
+    assert principal_cache.get(headers["Authorization"].split()[1]).pet_ids == (pet.id,)
+
+    await user_crud.update(db_session, db_obj=user, obj_in=UserUpdate(display_name="Renamed"))
+    assert principal_cache.get(headers["Authorization"].split()[1]) is None
@@ -0,0 +1,49 @@
+"""Read-only session dependency (ReadDbSession) tests."""
+
+import pytest
+from fastapi.dependencies.utils import get_dependant
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core.dependencies import get_current_user_read, get_current_user_with_pets_read, get_db, get_read_db
+
+
+@pytest.mark.asyncio
+async def test_read_session_is_read_only() -> None:
+    """get_read_db runs in a READ ONLY transaction; writes are rejected by Postgres."""
+    gen = get_read_db()
+    session = await gen.__anext__()
+    try:
+        assert (await session.execute(text("SHOW transaction_read_only"))).scalar() == "on"
+        with pytest.raises(DBAPIError, match="read-only transaction"):
+            await session.execute(text("CREATE TEMP TABLE read_only_probe (x int)"))
+    finally:
+        await gen.aclose()
+
+
+@pytest.mark.asyncio
+async def test_read_session_does_not_leak_read_only(db_session) -> None:
+    """Connections returned to the pool by get_read_db are read-write again."""
+    gen = get_read_db()
+    await gen.__anext__()
+    await gen.aclose()
+    assert (await db_session.execute(text("SHOW transaction_read_only"))).scalar() == "off"
+
+
+@pytest.mark.asyncio
+async def test_get_endpoint_uses_read_session(client: AsyncClient) -> None:
+    """GET handlers on ReadDbSession serve normally (falling back to the primary without a replica)."""
+    response = await client.get("/api/v1/community/posts", params={"limit": 1})
+    assert response.status_code == 200
+
+
+def test_read_user_dependencies_only_use_the_read_session() -> None:
+    """ReadCurrentUser(WithPets) resolve the principal on the read session too: no primary session."""
+
+    def calls(dependant) -> set:
+        return {dependant.call} | {c for sub in dependant.dependencies for c in calls(sub)}
+
+    for dependency in (get_current_user_read, get_current_user_with_pets_read):
+        used = calls(get_dependant(path="/", call=dependency))
+        assert get_read_db in used and get_db not in used
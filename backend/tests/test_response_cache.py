@@ -0,0 +1,284 @@
+"""Response cache (dashboard stats/calendar) tests."""
+
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.response_cache import MemoryBackend, RedisBackend, ResponseCache, response_cache
+from app.core.security import create_access_token
+from app.crud.pet import pet_crud
+from app.crud.user import user_crud
+from app.schemas.pet import PetCreate, PetUpdate
+from app.schemas.stats import ActivityStatsResponse
+from app.schemas.user import UserCreate
+
+
+class FakeRedisServer:
+    """Local stand-in for a Redis-protocol server: the commands RedisBackend sends, over real RESP."""
+
+    def __init__(self) -> None:
+        self.data: dict[bytes, bytes | set[bytes]] = {}
+        self.commands: list[bytes] = []
+        self.delay = 0.0  # seconds before each reply
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"redis://:secret@127.0.0.1:{port}/2"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        queued: list[bytes] | None = None  # replies of a MULTI block, sent by EXEC
+        try:
+            while True:
+                count = int((await reader.readuntil(b"\r\n"))[1:-2])
+                args = []
+                for _ in range(count):
+                    size = int((await reader.readuntil(b"\r\n"))[1:-2])
+                    args.append((await reader.readexactly(size + 2))[:-2])
+                cmd = args[0].upper()
+                self.commands.append(cmd)
+                if cmd == b"MULTI":
+                    queued, reply = [], b"+OK\r\n"
+                elif cmd == b"EXEC":
+                    reply, queued = b"*%d\r\n%s" % (len(queued), b"".join(queued)), None
+                elif queued is not None:
+                    queued.append(self._execute(cmd, args[1:]))
+                    reply = b"+QUEUED\r\n"
+                else:
+                    reply = self._execute(cmd, args[1:])
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    def _execute(self, cmd: bytes, args: list[bytes]) -> bytes:
+        if cmd in (b"AUTH", b"CLIENT", b"SELECT", b"SET", b"EXPIRE", b"WATCH", b"UNWATCH"):
+            if cmd == b"SET":
+                self.data[args[0]] = args[1]
+            return b"+OK\r\n"
+        if cmd in (b"GET", b"MGET"):
+            values = [self.data.get(key) for key in args]
+            bulks = [b"$-1\r\n" if v is None else b"$%d\r\n%s\r\n" % (len(v), v) for v in values]
+            return bulks[0] if cmd == b"GET" else b"*%d\r\n%s" % (len(bulks), b"".join(bulks))
+        if cmd == b"INCRBY":
+            value = int(self.data.get(args[0], b"0")) + int(args[1])
+            self.data[args[0]] = str(value).encode()
+            return b":%d\r\n" % value
+        if cmd == b"SADD":
+            self.data.setdefault(args[0], set()).update(args[1:])
+            return b":1\r\n"
+        if cmd in (b"SMEMBERS", b"SCAN"):
+            if cmd == b"SMEMBERS":
+                members = sorted(self.data.get(args[0], set()))
+            else:
+                members = sorted(k for k in self.data if k.startswith(args[2].rstrip(b"*")))
+            body = b"".join(b"$%d\r\n%s\r\n" % (len(m), m) for m in members)
+            array = b"*%d\r\n%s" % (len(members), body)
+            return array if cmd == b"SMEMBERS" else b"*2\r\n$1\r\n0\r\n" + array
+        if cmd == b"DEL":
+            return b":%d\r\n" % sum(self.data.pop(k, None) is not None for k in args)
+        return b"-ERR unknown command\r\n"
+
+
+def _model(pet_id: int) -> ActivityStatsResponse:
+    return ActivityStatsResponse(pet_id=pet_id, days=[])
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_lru_ttl_and_tags() -> None:
+    """Least recently used entries are evicted first, expired ones dropped; invalidation is per tag."""
+    backend = MemoryBackend(max_entries=2)
+    await backend.set("a", b"A", tags=["pet:1"], ttl=60, since=0)
+    await backend.set("b", b"B", tags=["pet:2"], ttl=60, since=0)
+    assert await backend.get("a") == b"A"  # a is now most recent
+    await backend.set("c", b"C", tags=["pet:1", "vet:9"], ttl=60, since=0)
+    assert await backend.get("b") is None
+    assert len(backend) == 2
+
+    await backend.invalidate(["vet:9"])
+    assert await backend.get("c") is None and await backend.get("a") == b"A"
+
+    await backend.set("expired", b"X", tags=[], ttl=0, since=await backend.generation())
+    assert await backend.get("expired") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_against_local_server() -> None:
+    """RedisBackend caches, invalidates by tag and clears over the Redis protocol."""
+    server = FakeRedisServer()
+    cache = ResponseCache(RedisBackend(await server.start()), ttl_seconds=60)
+    builds = 0
+
+    async def build(pet_id: int):
+        nonlocal builds
+        builds += 1
+        return _model(pet_id), [f"pet:{pet_id}"]
+
+    try:
+        for _ in range(2):
+            for pet_id in (1, 2):
+                resp = await cache.get_or_build("stats", str(pet_id), lambda pet_id=pet_id: build(pet_id))
+                assert resp.body == _model(pet_id).model_dump_json().encode()
+        assert builds == 2
+        assert server.commands[0] == b"AUTH" and b"SELECT" in server.commands
+
+        await cache.invalidate(None, "pet:1")
+        await cache.get_or_build("stats", "1", lambda: build(1))
+        await cache.get_or_build("stats", "2", lambda: build(2))
+        assert builds == 3
+
+        await cache.clear()
+        assert set(server.data) == {b"respcache:gen", b"respcache:floor"}
+        assert cache.stats()["namespaces"]["stats"] == {"hits": 3, "misses": 3, "hit_ratio": 0.5}
+    finally:
+        await cache.close()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_command_does_not_leak_its_reply() -> None:
+    """A get cancelled before its reply arrives leaves nothing for the next command to read."""
+    server = FakeRedisServer()
+    backend = RedisBackend(await server.start())
+    server.data.update({b"respcache:k:a": b"A", b"respcache:k:b": b"B"})
+    try:
+        server.delay = 0.2
+        pending = asyncio.create_task(backend.get("a"))
+        await asyncio.sleep(0.05)
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+        server.delay = 0.0
+        assert await backend.get("b") == b"B"
+    finally:
+        await backend.close()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_backend_degrades_to_misses() -> None:
+    """A cache server outage costs a rebuild per request, not a failed request."""
+    server = FakeRedisServer()
+    url = await server.start()
+    await server.stop()
+    cache = ResponseCache(RedisBackend(url, timeout=0.2), ttl_seconds=60)
+    resp = await cache.get_or_build("stats", "1", lambda: _build_async(_model(1)))
+    assert resp.status_code == 200
+    assert cache.stats()["errors"] == 2  # get and generation (nothing is stored)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("kind", ["memory", "redis"])
+async def test_build_overtaken_by_an_invalidation_is_not_stored(kind: str) -> None:
+    """An entry whose tags were invalidated while it was being built is returned but not cached."""
+    server = FakeRedisServer()
+    backend = MemoryBackend(max_entries=10) if kind == "memory" else RedisBackend(await server.start())
+    cache = ResponseCache(backend, ttl_seconds=60)
+
+    async def build_racing(tag: str):
+        await cache.invalidate(None, tag)  # a write commits while this build reads the old rows
+        return _model(1), ["pet:1"]
+
+    try:
+        await cache.get_or_build("stats", "1", lambda: build_racing("pet:1"))
+        assert await backend.get("stats:1") is None
+        await cache.get_or_build("stats", "1", lambda: build_racing("pet:2"))  # another pet's write
+        assert await backend.get("stats:1") is not None
+
+        since = await backend.generation()
+        await cache.clear()
+        await backend.set("stats:2", b"{}", tags=["pet:2"], ttl=60, since=since)
+        assert await backend.get("stats:2") is None
+    finally:
+        await cache.close()
+        if kind == "redis":
+            await server.stop()
+
+
+async def _build_async(model: ActivityStatsResponse):
+    return model, ["pet:1"]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_reload_costs_no_queries_until_a_write(
+    session_client: AsyncClient, db_session: AsyncSession, count_queries
+) -> None:
+    """A repeated dashboard load is served from the cache; writes invalidate only the affected pet."""
+    user = await user_crud.create(
+        db_session, obj_in=UserCreate(name="Dash", email="dash@cache.com", password="pass123456")
+    )
+    headers = {"Authorization": f"Bearer {create_access_token(user.id)}"}
+    pets = []
+    for name in ("Rex", "Fido"):
+        pet = await pet_crud.create(db_session, obj_in=PetCreate(name=name, species="dog"))
+        await session_client.post(f"/api/v1/pets/{pet.id}/add-to-account", params={"user_id": user.id})
+        pets.append(pet.id)
+    rex, fido = pets
+    today = date.today()
+    calendar = {"start": str(today - timedelta(days=6)), "end": str(today)}
+
+    async def load_dashboard() -> list:
+        urls = [
+            *(f"/api/v1/pets/{pid}/stats/activity" for pid in pets),
+            f"/api/v1/pets/{rex}/calendar/events?start={calendar['start']}&end={calendar['end']}",
+            "/api/v1/users/me/upcoming-events",
+            f"/api/v1/users/me/calendar/events?start={calendar['start']}&end={calendar['end']}",
+        ]
+        responses = [await session_client.get(url, headers=headers) for url in urls]
+        assert all(r.status_code == 200 for r in responses), [r.text for r in responses]
+        return [r.json() for r in responses]
+
+    first = await load_dashboard()
+    assert first[0]["days"][0]["date"] == str(today)  # serialization aliases, as response_model would
+    with count_queries as counted:
+        assert await load_dashboard() == first
+    assert counted.queries == 0, counted.statements
+
+    # A sleep log for Rex changes Rex's stats and the user's calendar, but not Fido's stats
+    resp = await session_client.post(
+        f"/api/v1/pets/{rex}/sleep-logs",
+        json={"started_at": datetime.combine(today, datetime.min.time()).isoformat(), "duration_minutes": 90},
+    )
+    assert resp.status_code == 201
+    with count_queries as counted:
+        fido_stats = await session_client.get(f"/api/v1/pets/{fido}/stats/activity", headers=headers)
+    assert counted.queries == 0 and fido_stats.json() == first[1]
+    reloaded = await load_dashboard()
+    assert reloaded[0]["days"][0]["sleep_minutes"] == 90
+    assert reloaded[4]["daily_stats"][6]["sleep_minutes"] == 90  # pets sorted by id: Rex's last day
+
+    # Renaming Fido reaches the user's cached upcoming events too
+    visit = await session_client.post(
+        f"/api/v1/pets/{fido}/veterinary/visits",
+        json={"visit_date": str(today + timedelta(days=3)), "visit_reason": "Checkup"},
+    )
+    assert visit.status_code == 201
+    assert (await load_dashboard())[3]["events"][0]["pet_name"] == "Fido"
+    await pet_crud.update(db_session, db_obj=await pet_crud.get_lean(db_session, fido), obj_in=PetUpdate(name="Bolt"))
+    assert (await load_dashboard())[3]["events"][0]["pet_name"] == "Bolt"
+
+    stats = (await session_client.get("/api/health/cache")).json()
+    assert stats["backend"] == "memory"
+    assert stats["namespaces"]["pet_activity_stats"]["hits"] >= 3
+
+
+@pytest.mark.asyncio
+async def test_invalidation_is_repeated_after_commit(db_session: AsyncSession) -> None:
+    """Entries rebuilt between a write and its commit are dropped once the commit lands."""
+    pet = await pet_crud.create(db_session, obj_in=PetCreate(name="Late", species="cat"))
+    await pet_crud.update(db_session, db_obj=pet, obj_in=PetUpdate(name="Later"))
+    # A concurrent request re-caches the old committed state before this session commits
+    since = await response_cache.backend.generation()
+    await response_cache.backend.set(f"stats:{pet.id}", b"{}", tags=[f"pet:{pet.id}"], ttl=60, since=since)
+    await response_cache.invalidate_committed(db_session)
+    assert await response_cache.backend.get(f"stats:{pet.id}") is None
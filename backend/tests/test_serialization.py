@@ -0,0 +1,65 @@
+"""Single-pass serialization must produce what FastAPI's response_model path produces."""
+
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.v1.endpoints.pets import _pet_response, _sleep_log_rows
+from app.core.serialization import dumper, dumps, json_response
+from app.models.pet import Pet
+from app.models.sleep_log import SleepLog
+from app.schemas.habits import SleepLogResponse
+from app.schemas.pet import PetResponse
+from app.schemas.stats import DayActivityStats
+
+
+async def _fastapi_body(type_, content) -> bytes:
+    field = create_model_field(name="Response", type_=type_, mode="serialization")
+    return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+
+@pytest.mark.asyncio
+async def test_rows_match_response_model_output() -> None:
+    """Same JSON as validating against response_model: datetimes (naive, UTC, offset), floats, None."""
+    created = datetime(2026, 1, 1, 12, 30, 15, 123456)
+    pets = [
+        Pet(id=1, name="Rex", species="dog", weight=12.0, profile_media_id=7, created_at=created, updated_at=created),
+        Pet(id=2, name="Tom", species="cat", date_of_birth="2020-05-01", created_at=created, updated_at=created),
+    ]
+    logs = [
+        SleepLog(
+            id=1,
+            pet_id=1,
+            started_at=datetime(2026, 1, 1, 22, tzinfo=timezone.utc),
+            ended_at=datetime(2026, 1, 2, 6, tzinfo=timezone(timedelta(hours=2))),
+            duration_minutes=480,
+            source="device",
+            created_at=created,
+        )
+    ]
+
+    expected_pets = []
+    for pet in pets:
+        data = PetResponse.model_validate(pet).model_dump()
+        data["profile_photo_url"] = _pet_response(pet, pet.profile_media_id)["profile_photo_url"]
+        expected_pets.append(data)
+    assert dumps([_pet_response(pet, pet.profile_media_id) for pet in pets]) == await _fastapi_body(
+        list[PetResponse], expected_pets
+    )
+    assert dumps(_sleep_log_rows(logs)) == await _fastapi_body(list[SleepLogResponse], logs)
+
+
+@pytest.mark.asyncio
+async def test_serialization_alias_and_nested_models() -> None:
+    """Keys follow serialization aliases; pydantic models inside the content are dumped by alias."""
+    day = DayActivityStats(day=date(2026, 3, 1))
+    expected = await _fastapi_body(list[DayActivityStats], [day])
+    assert dumps(dumper(DayActivityStats)([day])) == expected
+    assert dumps([day]) == expected
+
+    resp = json_response({"days": [day]}, status_code=201, headers={"ETag": '"x"'})
+    assert resp.status_code == 201 and resp.headers["ETag"] == '"x"'
+    assert resp.media_type == "application/json" and b'"date":"2026-03-01"' in resp.body